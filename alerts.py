@@ -0,0 +1,164 @@
+import threading
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from db.db import DB, db_instance
+from db.ledger_events import TRANSACTIONS, get_ledger_events
+from db.managers.category_cache import CategorySnapshot, get_category_cache
+from db.models.enums import TransactionType
+from db.models.monthly_category_total import MonthlyCategoryTotal
+from db.rollups import RollupDeltas
+
+
+class BudgetAlert(NamedTuple):
+    """A category's monthly spend crossing a percentage of its limit"""
+    category_id: int
+    category: str
+    year: int
+    month: int
+    threshold: float  # percent of limit_amount
+    spent: float  # including subcategories
+    limit: float
+    direction: str  # 'over' when spend rose past the threshold, 'under' when it fell back
+
+
+class BudgetAlerts:
+    """Running per-category, per-month expense totals checked against limits on every write.
+
+    Subscribes to the ledger's LedgerEvents, so every committed transaction
+    write (single, bulk, update, delete) is applied as rollup deltas: each
+    delta walks its category's parent_id chain, making the cost of a write
+    O(tree depth) per touched bucket. A month is loaded from the rollup
+    table the first time a write touches it, remembering the ledger version
+    it was loaded at; later notifications of writes at or below that
+    version are already in the load and are skipped.
+    Category changes and rollup rebuilds drop the state, which is reloaded
+    lazily.
+
+    Alerts go to `callback` (on the writing thread) and to a bounded queue
+    read with drain().
+    """
+
+    def __init__(self,
+                 db: DB = None,
+                 thresholds: Sequence[float] = (80, 100),
+                 callback: Callable[[BudgetAlert], None] = None,
+                 max_pending: int = 1000):
+        if not thresholds or any(t <= 0 for t in thresholds):
+            raise ValueError("thresholds must be positive percentages")
+        self.db = db or db_instance
+        self.Session = self.db.Session
+        self.category_cache = get_category_cache(self.db)
+        self.thresholds = tuple(sorted(thresholds))
+        self.callback = callback
+        self._pending = deque(maxlen=max_pending)
+        self._spent = {}  # type: Dict[Tuple[int, int], Dict[int, float]]
+        self._loaded_at = {}  # type: Dict[Tuple[int, int], int]
+        self._lock = threading.RLock()
+        self.events = get_ledger_events(self.db)
+        self.events.subscribe(self._on_write)
+
+    def close(self) -> None:
+        """Stop following writes"""
+        self.events.unsubscribe(self._on_write)
+
+    def drain(self) -> List[BudgetAlert]:
+        """Return and clear the queued alerts, oldest first"""
+        with self._lock:
+            alerts = list(self._pending)
+            self._pending.clear()
+        return alerts
+
+    def status(self, year: int, month: int) -> Dict[str, Dict]:
+        """Spend against limit for every limited category in one month"""
+        with self._lock:
+            snapshot = self.category_cache.snapshot()
+            spent = self._month(year, month, snapshot)
+            return {
+                category.name: {
+                    'spent': spent.get(category.id, 0.0),
+                    'limit': category.limit_amount,
+                    'utilization': spent.get(category.id, 0.0) / category.limit_amount * 100,
+                }
+                for category in snapshot.by_id.values() if category.limit_amount > 0
+            }
+
+    def _on_write(self, kind: str, deltas: Optional[RollupDeltas], version: int) -> None:
+        if kind != TRANSACTIONS:
+            with self._lock:
+                self._spent.clear()
+                self._loaded_at.clear()
+            return
+
+        # Only expense amounts count against limits
+        by_month = {}
+        for (year, month, category_id, transaction_type), (amount, _) in deltas.items():
+            if transaction_type == TransactionType.EXPENSE and amount:
+                by_month.setdefault((year, month), []).append((category_id, amount))
+
+        alerts = []
+        with self._lock:
+            snapshot = self.category_cache.snapshot()
+            for (year, month), changes in by_month.items():
+                spent = self._spent.get((year, month))
+                if spent is None:
+                    # Loaded after the commit, so back this write out first
+                    spent = self._month(year, month, snapshot)
+                    for category_id, amount in changes:
+                        self._roll_up(spent, snapshot, category_id, -amount)
+                elif version <= self._loaded_at[(year, month)]:
+                    # Committed before the month was loaded, so already counted
+                    continue
+                for category_id, amount in changes:
+                    alerts.extend(self._roll_up(spent, snapshot, category_id, amount, year, month))
+            self._pending.extend(alerts)
+
+        if self.callback:
+            for alert in alerts:
+                self.callback(alert)
+
+    def _roll_up(self, spent: Dict[int, float], snapshot: CategorySnapshot, category_id: int,
+                 amount: float, year: int = None, month: int = None) -> List[BudgetAlert]:
+        """Add amount to a category and its ancestors, returning threshold crossings"""
+        alerts = []
+        node, seen = category_id, set()
+        while node in snapshot.by_id and node not in seen:
+            seen.add(node)
+            category = snapshot.by_id[node]
+            old = spent.get(node, 0.0)
+            new = spent[node] = old + amount
+            if year is not None and category.limit_amount > 0:
+                for threshold in self.thresholds:
+                    bound = category.limit_amount * threshold / 100
+                    if old <= bound < new or new <= bound < old:
+                        alerts.append(BudgetAlert(node, category.name, year, month, threshold, new,
+                                                  category.limit_amount, 'over' if new > old else 'under'))
+            node = category.parent_id
+        return alerts
+
+    def _month(self, year: int, month: int, snapshot: CategorySnapshot) -> Dict[int, float]:
+        """Rolled-up expense per category for one month, loaded from the rollup table once"""
+        spent = self._spent.get((year, month))
+        if spent is not None:
+            return spent
+
+        stmt = (select(MonthlyCategoryTotal.category_id, MonthlyCategoryTotal.total)
+                .where(MonthlyCategoryTotal.year == year,
+                       MonthlyCategoryTotal.month == month,
+                       MonthlyCategoryTotal.type == TransactionType.EXPENSE))
+        # Writes bump the version after committing, so every write at or below
+        # the version read here is in the rows
+        loaded_at = self.events.version
+        session = self.Session()
+        try:
+            rows = session.execute(stmt).all()
+        finally:
+            session.close()
+
+        self._loaded_at[(year, month)] = loaded_at
+        spent = self._spent[(year, month)] = {}
+        for category_id, total in rows:
+            self._roll_up(spent, snapshot, category_id, total)
+        return spent
@@ -0,0 +1,344 @@
+"""Vectorized reporting over transactions loaded column-wise into NumPy arrays.
+
+AnalyticsEngine answers the same report queries as the SQL path
+(CategoryManager.get_category_spending_summary and the TransactionManager
+period and monthly totals) with the same result shapes, plus pivots,
+rolling averages, percentiles and budget utilization that SQLite has no
+cheap way to express. NumPy is an optional dependency; importing this
+module works without it, constructing an AnalyticsEngine does not.
+"""
+from datetime import date
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import Integer, cast, func, select
+
+from db.db import DB, db_instance
+from db.managers.category_cache import CategorySnapshot, get_category_cache
+from db.managers.category_manager import CategoryManager
+from db.models.enums import TransactionType
+from db.models.rows import TYPE_CODES, TYPES_BY_CODE
+from db.models.transaction import Transaction
+from db import rollups
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Report engines accepted by BudgetAPI(report_engine=...)
+REPORT_ENGINES = ('sql', 'numpy')
+
+_EXPENSE = TYPE_CODES[TransactionType.EXPENSE]
+_INCOME = TYPE_CODES[TransactionType.INCOME]
+
+# julianday() of 1970-01-01, the datetime64 epoch
+_UNIX_EPOCH_JULIAN = 2440587.5
+
+
+def month_number(value: date) -> int:
+    """Months since 1970-01, the integer form of datetime64[M]"""
+    return (value.year - 1970) * 12 + value.month - 1
+
+
+def month_label(number: int) -> str:
+    year, month_index = divmod(int(number), 12)
+    return f"{year + 1970:04d}-{month_index + 1:02d}"
+
+
+class Ledger:
+    """Transactions as parallel NumPy columns.
+
+    amount is float64, date is datetime64[D], category_id is int64 with 0
+    for uncategorized rows, and type holds TYPE_CODES as int8.
+    """
+    __slots__ = ('amount', 'date', 'category_id', 'type')
+
+    def __init__(self, amount, dates, category_id, types):
+        self.amount = amount
+        self.date = dates
+        self.category_id = category_id
+        self.type = types
+
+    @classmethod
+    def load(cls, connection, start_date: date = None, end_date: date = None) -> 'Ledger':
+        """Load transactions dated in [start_date, end_date) with one query.
+
+        Dates and types are converted to integers in SQL, so every column
+        arrives as plain numbers and becomes an array with one np.array call.
+        """
+        stmt = select(
+            Transaction.amount,
+            cast(func.julianday(Transaction.date) - _UNIX_EPOCH_JULIAN, Integer),
+            func.coalesce(Transaction.category_id, 0),
+            cast(Transaction.type == TransactionType.EXPENSE, Integer),
+        ).where(Transaction.date.is_not(None))
+        if start_date:
+            stmt = stmt.where(Transaction.date >= start_date)
+        if end_date:
+            stmt = stmt.where(Transaction.date < end_date)
+
+        rows = connection.execute(stmt).all()
+        if not rows:
+            return cls(np.empty(0, np.float64), np.empty(0, 'datetime64[D]'),
+                       np.empty(0, np.int64), np.empty(0, np.int8))
+        # Transposing with zip is far cheaper than handing numpy the Row objects
+        amounts, days, category_ids, expense = zip(*rows)
+        return cls(np.array(amounts, dtype=np.float64),
+                   np.array(days, dtype=np.int64).astype('datetime64[D]'),
+                   np.array(category_ids, dtype=np.int64),
+                   np.where(np.array(expense, dtype=np.int8) == 1, _EXPENSE, _INCOME).astype(np.int8))
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def months(self):
+        """Month numbers (see month_number) of every row"""
+        return self.date.astype('datetime64[M]').astype(np.int64)
+
+    def select(self, mask) -> 'Ledger':
+        return Ledger(self.amount[mask], self.date[mask], self.category_id[mask], self.type[mask])
+
+
+class Pivot(NamedTuple):
+    """Month x category table; values[i, j] belongs to months[i], categories[j]"""
+    months: List[str]
+    categories: List[str]
+    values: 'np.ndarray'
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """{month: {category: value}} with plain floats"""
+        return {month: dict(zip(self.categories, map(float, row)))
+                for month, row in zip(self.months, self.values)}
+
+
+class AnalyticsEngine:
+    """NumPy implementation of the reporting queries.
+
+    Each report loads only the columns and date range it needs, then
+    aggregates with bincount over (month, category) indexes. Sums agree with
+    the SQL path up to floating-point summation order; keys, counts and
+    result shapes are identical.
+    """
+
+    def __init__(self, db: DB = None):
+        if np is None:
+            raise ImportError("AnalyticsEngine requires numpy, install it with `pip install numpy`")
+        self.db = db or db_instance
+        self.Session = self.db.Session
+        self.category_cache = get_category_cache(self.db)
+
+    def load(self, start_date: date = None, end_date: date = None) -> Ledger:
+        """Load the transactions dated in [start_date, end_date)"""
+        session = self.Session()
+        try:
+            return Ledger.load(session.connection(), start_date, end_date)
+        finally:
+            session.close()
+
+    def _category_index(self, snapshot: CategorySnapshot, category_ids) -> Tuple[List[int], 'np.ndarray']:
+        """Sorted category ids and each row's position among them (-1 if unknown)"""
+        ids = sorted(snapshot.by_id)
+        lookup = np.asarray(ids, dtype=np.int64)
+        positions = np.searchsorted(lookup, category_ids)
+        positions = np.minimum(positions, max(len(ids) - 1, 0))
+        known = (lookup[positions] == category_ids) if ids else np.zeros(len(category_ids), bool)
+        return ids, np.where(known, positions, -1)
+
+    # ===== SQL PATH EQUIVALENTS =====
+
+    def get_category_spending_summary(self, start_date: date = None, end_date: date = None) -> Dict[str, Dict]:
+        """Same result as CategoryManager.get_category_spending_summary"""
+        snapshot = self.category_cache.snapshot()
+        ledger = self.load(start_date, end_date)
+        ids, positions = self._category_index(snapshot, ledger.category_id)
+        known = positions >= 0
+        positions = positions[known]
+        expense = ledger.type[known] == _EXPENSE
+
+        size = len(ids)
+        spent = np.bincount(positions, weights=np.where(expense, ledger.amount[known], 0.0), minlength=size)
+        income = np.bincount(positions, weights=np.where(expense, 0.0, ledger.amount[known]), minlength=size)
+        counts = np.bincount(positions, minlength=size)
+
+        rows = []
+        for i, category_id in enumerate(ids):
+            category = snapshot.by_id[category_id]
+            rows.append((category_id, category.name, category.limit_amount, category.parent_id,
+                         float(spent[i]), float(income[i]), int(counts[i])))
+        return CategoryManager._summarize_spending(rows)
+
+    def get_period_totals(self, start_date: date = None, end_date: date = None) -> Dict:
+        """Same result as TransactionManager.get_period_totals"""
+        ledger = self.load(start_date, end_date)
+        if rollups.is_month_aligned(start_date) and rollups.is_month_aligned(end_date):
+            # The SQL path answers these from the rollup, which skips uncategorized rows
+            ledger = ledger.select(ledger.category_id != 0)
+
+        sums = np.bincount(ledger.type, weights=ledger.amount, minlength=2)
+        return {
+            'income': float(sums[_INCOME]),
+            'expense': float(sums[_EXPENSE]),
+            'count': len(ledger),
+        }
+
+    def get_monthly_totals(self, start_date: date, end_date: date, by_category: bool = False) -> List[Tuple]:
+        """Same rows as TransactionManager.get_monthly_totals (empty buckets omitted)"""
+        snapshot = self.category_cache.snapshot()
+        ledger = self._load_months(start_date, end_date)
+        ledger = ledger.select(ledger.category_id != 0)
+        months = ledger.months()
+
+        # One flat group key per (month, [category,] type)
+        first_month = months.min() if len(ledger) else 0
+        month_pos = months - first_month
+        if by_category:
+            ids, positions = self._category_index(snapshot, ledger.category_id)
+            known = positions >= 0
+            month_pos, positions, ledger = month_pos[known], positions[known], ledger.select(known)
+            keys = (month_pos * len(ids) + positions) * 2 + ledger.type
+        else:
+            keys = month_pos * 2 + ledger.type
+
+        groups, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=ledger.amount, minlength=len(groups))
+        counts = np.bincount(inverse, minlength=len(groups))
+
+        rows = []
+        for key, total, count in zip(groups.tolist(), totals.tolist(), counts.tolist()):
+            key, type_code = divmod(key, 2)
+            if by_category:
+                key, position = divmod(key, len(ids))
+            year, month_index = divmod(int(first_month + key) + 1970 * 12, 12)
+            row = (year, month_index + 1)
+            if by_category:
+                row += (snapshot.by_id[ids[position]].name,)
+            rows.append(row + (TYPES_BY_CODE[type_code], total, count))
+        return rows
+
+    def _load_months(self, start_date: date = None, end_date: date = None) -> Ledger:
+        """Load whole months the way rollups.filter_months selects them"""
+        month_start = date(start_date.year, start_date.month, 1) if start_date else None
+        month_end = date(end_date.year, end_date.month, 1) if end_date else None
+        return self.load(month_start, month_end)
+
+    # ===== VECTORIZED REPORTS =====
+
+    def pivot(self,
+              start_date: date = None,
+              end_date: date = None,
+              transaction_type: TransactionType = TransactionType.EXPENSE) -> Pivot:
+        """Month x category totals for whole months in [start_date, end_date).
+
+        Every month in the range gets a row, including months with no
+        transactions; categories are in id order, uncategorized rows excluded.
+        """
+        snapshot = self.category_cache.snapshot()
+        ledger = self._load_months(start_date, end_date)
+        ledger = ledger.select(ledger.type == TYPE_CODES[transaction_type])
+        months = ledger.months()
+
+        if start_date:
+            first = month_number(start_date)
+        else:
+            first = int(months.min()) if len(ledger) else month_number(date.today())
+        if end_date:
+            last = month_number(end_date) - 1
+        else:
+            last = int(months.max()) if len(ledger) else first
+        span = max(last - first + 1, 0)
+
+        ids, positions = self._category_index(snapshot, ledger.category_id)
+        keep = (positions >= 0) & (months >= first) & (months <= last)
+        flat = (months[keep] - first) * len(ids) + positions[keep]
+        values = np.bincount(flat, weights=ledger.amount[keep], minlength=span * len(ids))
+        return Pivot([month_label(first + i) for i in range(span)],
+                     [snapshot.by_id[category_id].name for category_id in ids],
+                     values.reshape(span, len(ids)))
+
+    def rolling_average(self,
+                        window: int = 3,
+                        start_date: date = None,
+                        end_date: date = None,
+                        transaction_type: TransactionType = TransactionType.EXPENSE) -> Pivot:
+        """Trailing window-month mean of each pivot column.
+
+        The first window - 1 months have no full window and are NaN.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        table = self.pivot(start_date, end_date, transaction_type)
+        values = table.values
+        cumulative = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), values]), axis=0)
+        averages = np.full(values.shape, np.nan)
+        if len(values) >= window:
+            averages[window - 1:] = (cumulative[window:] - cumulative[:-window]) / window
+        return Pivot(table.months, table.categories, averages)
+
+    def category_percentiles(self,
+                             percentiles: Sequence[float] = (50, 90, 99),
+                             start_date: date = None,
+                             end_date: date = None) -> Dict[str, Dict[str, float]]:
+        """Percentiles of individual expense amounts per category.
+
+        Uses linear interpolation (numpy's default method) for every category
+        at once over one sorted array. Categories without expenses are omitted.
+        """
+        for q in percentiles:
+            if not 0 <= q <= 100:
+                raise ValueError("percentiles must be between 0 and 100")
+
+        snapshot = self.category_cache.snapshot()
+        ledger = self.load(start_date, end_date)
+        ids, positions = self._category_index(snapshot, ledger.category_id)
+        keep = (positions >= 0) & (ledger.type == _EXPENSE)
+        positions, amounts = positions[keep], ledger.amount[keep]
+
+        # Sort by category, then amount, so each category is a sorted run
+        order = np.lexsort((amounts, positions))
+        positions, amounts = positions[order], amounts[order]
+        counts = np.bincount(positions, minlength=len(ids))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(ids) else counts
+        present = np.nonzero(counts)[0]
+
+        results = {snapshot.by_id[ids[i]].name: {} for i in present}
+        for q in percentiles:
+            rank = (counts[present] - 1) * (q / 100.0)
+            low = np.floor(rank).astype(np.int64)
+            high = np.minimum(low + 1, counts[present] - 1)
+            fraction = rank - low
+            low_values = amounts[starts[present] + low]
+            high_values = amounts[starts[present] + high]
+            values = low_values + (high_values - low_values) * fraction
+            label = f"p{q:g}"
+            for i, value in zip(present, values.tolist()):
+                results[snapshot.by_id[ids[i]].name][label] = value
+        return results
+
+    def budget_utilization(self, start_date: date = None, end_date: date = None) -> Dict[str, Dict]:
+        """Spending against limits for categories that have one.
+
+        spent includes subcategories, rolled up in one pass over the snapshot's
+        preorder; utilization is spent / limit * 100.
+        """
+        snapshot = self.category_cache.snapshot()
+        ledger = self.load(start_date, end_date)
+        ids, positions = self._category_index(snapshot, ledger.category_id)
+        keep = (positions >= 0) & (ledger.type == _EXPENSE)
+        own = np.bincount(positions[keep], weights=ledger.amount[keep], minlength=len(ids))
+
+        rolled = snapshot.roll_up({category_id: (own[i],) for i, category_id in enumerate(ids)}, 1)
+        spent = np.asarray([rolled[category_id][0] for category_id in ids], dtype=np.float64)
+
+        limits = np.asarray([snapshot.by_id[category_id].limit_amount for category_id in ids], dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utilization = np.where(limits > 0, spent / limits * 100, np.nan)
+
+        return {
+            snapshot.by_id[category_id].name: {
+                'spent': float(spent[i]),
+                'limit': float(limits[i]),
+                'utilization': float(utilization[i]),
+                'over_budget': bool(spent[i] > limits[i]),
+            }
+            for i, category_id in enumerate(ids) if limits[i] > 0
+        }
@@ -0,0 +1,266 @@
+from datetime import date
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+import exporter
+import importer
+from budget_api import (build_budget_summary, build_trends, parse_filters, parse_month,
+                        parse_transaction_args, parse_where, trend_window)
+from db.async_db import AsyncDB
+from db.managers.async_category_manager import AsyncCategoryManager
+from db.managers.async_transaction_manager import AsyncTransactionManager
+from db.models.transaction import Transaction
+from db.models.category import Category
+from db.models.rows import CategoryRow
+
+
+class AsyncBudgetAPI:
+    """asyncio counterpart of BudgetAPI.
+
+    Every BudgetAPI method is available as a coroutine with the same
+    arguments and results (iter_transactions is an async generator), so
+    independent calls can run together under asyncio.gather. Requires
+    aiosqlite; db defaults to a new AsyncDB for the same file as db_instance.
+    """
+
+    def __init__(self, db: AsyncDB = None):
+        self.db = db or AsyncDB()
+        self.category_manager = AsyncCategoryManager(self.db)
+        self.transaction_manager = AsyncTransactionManager(self.db)
+
+    async def close(self):
+        """Dispose of the engine's pooled connections.
+
+        aiosqlite connections run on their own threads, so close the API (or
+        use it as an async context manager) before the event loop exits.
+        """
+        await self.db.dispose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # ===== CATEGORY OPERATIONS =====
+
+    async def create_category(self, name: str, limit: float = 0, parent: str = None) -> Category:
+        """Create a new category"""
+        return await self.category_manager.add_category(name, limit, parent)
+
+    async def get_categories(self) -> List[Category]:
+        """Get all categories"""
+        return await self.category_manager.list_categories()
+
+    async def get_category(self, name: str = None, category_id: int = None) -> Optional[CategoryRow]:
+        """Get a category by name or ID, served from the category cache"""
+        if name:
+            return await self.category_manager.get_category_by_name(name)
+        elif category_id:
+            return await self.category_manager.get_category_by_id(category_id)
+        else:
+            raise ValueError("Must provide either name or category_id")
+
+    async def update_category(self, **kwargs) -> Category:
+        """Update a category"""
+        return await self.category_manager.update_category(**kwargs)
+
+    async def delete_category(self, category_id: int, force: bool = False) -> bool:
+        """Delete a category"""
+        return await self.category_manager.delete_category(category_id, force)
+
+    async def get_category_hierarchy(self, root: str = None) -> Dict:
+        """Get categories in hierarchical structure, optionally only the subtree below root"""
+        return await self.category_manager.get_category_hierarchy(root)
+
+    async def get_category_path(self, name: str) -> List[str]:
+        """Get the category names from the top-level ancestor down to name"""
+        return await self.category_manager.get_category_path(name)
+
+    async def get_subtree_totals(self, category: str, month: str = None) -> Dict:
+        """Get expense, income and transaction count for a category and all its subcategories"""
+        start_date, end_date = parse_month(month) if month else (None, None)
+        return await self.category_manager.get_subtree_totals(category, start_date, end_date)
+
+    async def get_category_cache_stats(self) -> Dict:
+        """Get hit/miss counters for the category cache"""
+        return self.category_manager.cache_stats()
+
+    # ===== TRANSACTION OPERATIONS =====
+
+    async def add_transaction(self,
+                              transaction_type: str,
+                              amount: float,
+                              category: str,
+                              vendor: str = None,
+                              note: str = None,
+                              transaction_date: str = None) -> Transaction:
+        """Add a new transaction using string parameters"""
+        tx_type, parsed_date = parse_transaction_args(transaction_type, transaction_date)
+        return await self.transaction_manager.add_transaction(
+            tx_type, amount, category, vendor, note, parsed_date
+        )
+
+    async def add_transactions_bulk(self,
+                                    rows: Iterable[Union[dict, tuple]],
+                                    chunk_size: int = 1000) -> Dict:
+        """Add many transactions at once; see BudgetAPI.add_transactions_bulk"""
+        return await self.transaction_manager.add_transactions_bulk(rows, chunk_size)
+
+    async def import_transactions(self,
+                                  path: str,
+                                  file_format: str = None,
+                                  columns: Dict[str, str] = None,
+                                  date_format: str = None,
+                                  default_category: str = None,
+                                  chunk_size: int = 5000,
+                                  on_progress: Callable[[Dict], None] = None) -> Dict:
+        """Stream a CSV, QIF or OFX file into the database in fixed-size chunks.
+
+        The file itself is read synchronously between chunk inserts.
+        """
+        raw_rows, date_format = importer.open_file(path, file_format, columns, date_format)
+        return await importer.import_rows_async(
+            self.transaction_manager, raw_rows, date_format,
+            default_category, chunk_size, on_progress
+        )
+
+    async def export_transactions(self,
+                                  path: str,
+                                  file_format: str = None,
+                                  compress: bool = None,
+                                  batch_size: int = 10000,
+                                  on_progress: Callable[[Dict], None] = None,
+                                  category: str = None,
+                                  start_date: str = None,
+                                  end_date: str = None,
+                                  month: str = None,
+                                  transaction_type: str = None,
+                                  vendor: str = None,
+                                  include_subcategories: bool = False) -> Dict:
+        """Stream transactions to a CSV, JSONL or columnar file; see BudgetAPI.export_transactions.
+
+        File writes are synchronous between batch fetches.
+        """
+        filters = await self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        return await exporter.export_file_async(
+            self.transaction_manager, await self.category_manager.snapshot(), path,
+            file_format, compress, batch_size, on_progress, **filters
+        )
+
+    async def get_transactions(self,
+                               limit: int = None,
+                               category: str = None,
+                               start_date: str = None,
+                               end_date: str = None,
+                               month: str = None,
+                               transaction_type: str = None,
+                               vendor: str = None,
+                               row_mode: str = 'orm',
+                               include_subcategories: bool = False):
+        """Get transactions newest first; all given filters are combined"""
+        filters = await self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        return await self.transaction_manager.list_transactions(limit, row_mode, **filters)
+
+    async def iter_transactions(self,
+                                batch_size: int = 1000,
+                                cursor: str = None,
+                                category: str = None,
+                                start_date: str = None,
+                                end_date: str = None,
+                                month: str = None,
+                                transaction_type: str = None,
+                                vendor: str = None,
+                                row_mode: str = 'orm',
+                                include_subcategories: bool = False) -> AsyncIterator:
+        """Stream transactions newest first; use with `async for`"""
+        filters = await self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        async for item in self.transaction_manager.iter_transactions(batch_size, cursor, row_mode, **filters):
+            yield item
+
+    async def get_transactions_page(self,
+                                    page_size: int = 100,
+                                    cursor: str = None,
+                                    category: str = None,
+                                    start_date: str = None,
+                                    end_date: str = None,
+                                    month: str = None,
+                                    transaction_type: str = None,
+                                    vendor: str = None,
+                                    row_mode: str = 'orm',
+                                    include_subcategories: bool = False) -> Dict:
+        """Get one page of transactions plus an opaque cursor for the next page"""
+        filters = await self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        transactions, next_cursor = await self.transaction_manager.get_transactions_page(
+            page_size, cursor, row_mode, **filters
+        )
+        return {'transactions': transactions, 'next_cursor': next_cursor}
+
+    async def _subtree_filter(self, filters: Dict, include_subcategories: bool) -> Dict:
+        """Replace the category filter with the ids of its whole subtree"""
+        if include_subcategories and filters.get('category') is not None:
+            filters['category_ids'] = await self.category_manager.get_subtree_ids(filters.pop('category'))
+        return filters
+
+    async def update_transaction(self, transaction_id: int, **kwargs) -> Transaction:
+        """Update a transaction"""
+        return await self.transaction_manager.update_transaction(transaction_id, **kwargs)
+
+    async def delete_transaction(self, transaction_id: int) -> bool:
+        """Delete a transaction"""
+        return await self.transaction_manager.delete_transaction(transaction_id)
+
+    async def update_transactions_where(self, filters: Dict, changes: Dict, dry_run: bool = False) -> int:
+        """Apply the same changes to every matching transaction; see BudgetAPI.update_transactions_where"""
+        filters, changes = parse_where(filters, changes)
+        return await self.transaction_manager.update_transactions_where(changes, dry_run=dry_run, **filters)
+
+    async def delete_transactions_where(self, filters: Dict, dry_run: bool = False) -> int:
+        """Delete every matching transaction; see BudgetAPI.delete_transactions_where"""
+        filters, _ = parse_where(filters)
+        return await self.transaction_manager.delete_transactions_where(dry_run=dry_run, **filters)
+
+    # ===== REPORTING & ANALYSIS =====
+
+    async def get_budget_summary(self, month: str = None) -> Dict:
+        """Get comprehensive budget summary"""
+        start_date, end_date = parse_month(month) if month else (None, None)
+        category_summary = await self.category_manager.get_category_spending_summary(
+            start_date=start_date, end_date=end_date
+        )
+        totals = await self.transaction_manager.get_period_totals(start_date, end_date)
+        return build_budget_summary(month, category_summary, totals)
+
+    async def get_spending_trends(self, months: int = 6, by_category: bool = False, as_of: str = None) -> Dict:
+        """Get spending trends over the N months up to as_of (YYYY-MM, default now), most recent first"""
+        month_keys, start_date, end_date = trend_window(months, as_of)
+        rows = await self.transaction_manager.get_monthly_totals(start_date, end_date, by_category)
+        return build_trends(month_keys, rows, by_category)
+
+    # ===== UTILITY METHODS =====
+
+    async def rebuild_rollups(self) -> int:
+        """Recompute the monthly rollup table from the transactions table"""
+        return await self.transaction_manager.rebuild_rollups()
+
+    async def validate_category_exists(self, category_name: str) -> bool:
+        """Check if a category exists"""
+        return await self.get_category(name=category_name) is not None
+
+    async def get_quick_stats(self) -> Dict:
+        """Get quick overview stats"""
+        categories = await self.get_categories()
+        month_start = date.today().replace(day=1)
+
+        return {
+            'total_categories': len(categories),
+            'total_transactions': await self.transaction_manager.count_transactions(),
+            'categories_with_limits': len([c for c in categories if c.limit_amount > 0]),
+            'recent_transaction_count': await self.transaction_manager.count_transactions(start_date=month_start),
+        }
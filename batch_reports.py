@@ -0,0 +1,101 @@
+"""Nightly reports across many ledger files, one ledger per worker process.
+
+Each worker opens its own DB for one ledger file, builds the budget summary
+and spending trends with BudgetAPI, disposes of the engine and sends back a
+plain dict. Results are yielded as workers finish, not in input order.
+
+    python -m batch_reports ledgers/*.db --month 2024-05 --workers 8 --output reports.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Union
+
+from budget_api import BudgetAPI
+from db.db import DB
+
+
+def build_ledger_report(path: Union[str, Path],
+                        month: str = None,
+                        trend_months: int = 6,
+                        by_category: bool = False,
+                        profile: str = None,
+                        report_engine: str = 'sql') -> Dict:
+    """Build the summary and trends for one ledger file in this process"""
+    path = Path(path)
+    if not path.is_file():
+        raise ValueError(f"Ledger file '{path}' not found")
+
+    started = time.perf_counter()
+    db = DB(path, profile=profile)
+    try:
+        api = BudgetAPI(report_engine=report_engine, db=db)
+        return {
+            'ledger': str(path),
+            'summary': api.get_budget_summary(month),
+            'trends': api.get_spending_trends(trend_months, by_category),
+            'elapsed': time.perf_counter() - started,
+        }
+    finally:
+        db.dispose()
+
+
+def run_batch_reports(paths: Iterable[Union[str, Path]],
+                      month: str = None,
+                      trend_months: int = 6,
+                      by_category: bool = False,
+                      workers: int = None,
+                      profile: str = None,
+                      report_engine: str = 'sql') -> Iterator[Dict]:
+    """Report on every ledger in a process pool, yielding results as they complete.
+
+    workers defaults to the CPU count. A ledger that fails yields
+    {'ledger': path, 'error': message} instead of stopping the batch.
+    """
+    paths = [str(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(build_ledger_report, path, month, trend_months, by_category, profile, report_engine): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {'ledger': futures[future], 'error': f"{type(e).__name__}: {e}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('ledgers', nargs='+', help="ledger database files")
+    parser.add_argument('--month', help="summary month as YYYY-MM (default: all time)")
+    parser.add_argument('--trend-months', type=int, default=6)
+    parser.add_argument('--by-category', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--profile', default=None)
+    parser.add_argument('--report-engine', default='sql')
+    parser.add_argument('--output', help="JSONL file to write (default: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    failed = 0
+    try:
+        for report in run_batch_reports(args.ledgers, args.month, args.trend_months, args.by_category,
+                                        args.workers, args.profile, args.report_engine):
+            failed += 'error' in report
+            out.write(json.dumps(report) + '\n')
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        print(f"{failed} of {len(args.ledgers)} ledgers failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Report latency for the SQL and NumPy report engines.
+
+Times get_budget_summary and get_spending_trends on both engines, checks
+that they agree, and times the NumPy-only reports (pivot, percentiles,
+utilization) against the same figures computed in Python over TransactionRows.
+
+    python -m benchmarks.bench_analytics --rows 100000 --repeat 5
+"""
+import argparse
+import math
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.bench_month_query import populate
+from budget_api import BudgetAPI
+from db.db import DB
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def assert_close(left, right, path: str = '') -> None:
+    if isinstance(left, dict):
+        assert left.keys() == right.keys(), path
+        for key in left:
+            assert_close(left[key], right[key], f"{path}/{key}")
+    elif isinstance(left, float):
+        assert math.isclose(left, right, rel_tol=1e-9, abs_tol=1e-6), (path, left, right)
+    else:
+        assert left == right, (path, left, right)
+
+
+def python_percentiles(api) -> dict:
+    """Per-category median and p90 from TransactionRows, no numpy"""
+    amounts = defaultdict(list)
+    for row in api.iter_transactions(row_mode='row', transaction_type='expense'):
+        amounts[row.category_id].append(row.amount)
+    results = {}
+    for category_id, values in amounts.items():
+        values.sort()
+        results[category_id] = {}
+        for q in (50, 90):
+            rank = (len(values) - 1) * q / 100
+            low = int(rank)
+            high = min(low + 1, len(values) - 1)
+            results[category_id][q] = values[low] + (values[high] - values[low]) * (rank - low)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(os.path.join(tmp, 'bench.db'))
+        db.ensure_schema()
+        populate(db.engine, args.rows)
+        sql_api = BudgetAPI(db=db)
+        numpy_api = BudgetAPI(report_engine='numpy', db=db)
+        sql_api.rebuild_rollups()
+
+        month = '2019-06'
+        assert_close(sql_api.get_budget_summary(month), numpy_api.get_budget_summary(month))
+        assert_close(sql_api.get_budget_summary(), numpy_api.get_budget_summary())
+
+        print(f"{'report':<34} {'sql ms':>9} {'numpy ms':>9}")
+        for label, call in [
+            ('get_budget_summary(month)', lambda api: api.get_budget_summary(month)),
+            ('get_budget_summary()', lambda api: api.get_budget_summary()),
+            ('get_spending_trends(120, by_cat)', lambda api: api.get_spending_trends(120, True)),
+        ]:
+            print(f"{label:<34} {median_ms(lambda: call(sql_api), args.repeat):>9.1f} "
+                  f"{median_ms(lambda: call(numpy_api), args.repeat):>9.1f}")
+
+        print(f"\n{'numpy-only report':<34} {'python ms':>9} {'numpy ms':>9}")
+        print(f"{'category percentiles':<34} {median_ms(lambda: python_percentiles(sql_api), args.repeat):>9.1f} "
+              f"{median_ms(lambda: numpy_api.get_category_percentiles(percentiles=(50, 90)), args.repeat):>9.1f}")
+        print(f"{'spending pivot':<34} {'':>9} {median_ms(numpy_api.get_spending_pivot, args.repeat):>9.1f}")
+        print(f"{'budget utilization':<34} {'':>9} {median_ms(numpy_api.get_budget_utilization, args.repeat):>9.1f}")
+        db.dispose()
+
+
+if __name__ == '__main__':
+    main()
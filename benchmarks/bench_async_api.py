@@ -0,0 +1,95 @@
+"""Concurrent API call throughput: AsyncBudgetAPI under asyncio.gather vs
+BudgetAPI calls run in worker threads with asyncio.to_thread.
+
+Each round issues --concurrency mixed read calls (month summaries, pages,
+counts) plus --writes single-transaction inserts.
+
+    python -m benchmarks.bench_async_api --rows 100000 --concurrency 64 --rounds 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from async_budget_api import AsyncBudgetAPI
+from benchmarks.bench_month_query import CATEGORIES, DAYS, START, populate
+from budget_api import BudgetAPI
+from db.async_db import AsyncDB
+from db.db import DB
+
+
+def make_calls(api, rng: random.Random, concurrency: int, writes: int) -> list:
+    """Build one round of call thunks against either API"""
+    calls = []
+    for i in range(concurrency):
+        day = START.toordinal() + rng.randrange(DAYS)
+        month = START.fromordinal(day).strftime('%Y-%m')
+        kind = i % 3
+        if kind == 0:
+            calls.append((api.get_budget_summary, (month,), {}))
+        elif kind == 1:
+            calls.append((api.get_transactions_page, (50,),
+                          {'category': f'category-{rng.randrange(CATEGORIES)}', 'row_mode': 'row'}))
+        else:
+            calls.append((api.get_transactions, (), {'month': month, 'row_mode': 'row'}))
+    for _ in range(writes):
+        calls.append((api.add_transaction, ('expense', rng.uniform(1, 100),
+                                            f'category-{rng.randrange(CATEGORIES)}'), {}))
+    return calls
+
+
+async def run_async(api, rounds: int, concurrency: int, writes: int) -> float:
+    rng = random.Random(7)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        calls = make_calls(api, rng, concurrency, writes)
+        await asyncio.gather(*(method(*args, **kwargs) for method, args, kwargs in calls))
+    return time.perf_counter() - started
+
+
+async def run_threaded(api, rounds: int, concurrency: int, writes: int) -> float:
+    rng = random.Random(7)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        calls = make_calls(api, rng, concurrency, writes)
+        await asyncio.gather(*(asyncio.to_thread(method, *args, **kwargs) for method, args, kwargs in calls))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--writes', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        db = DB(path)
+        db.ensure_schema()
+        populate(db.engine, args.rows)
+        sync_api = BudgetAPI(db=db)
+        sync_api.rebuild_rollups()
+        async_api = AsyncBudgetAPI(AsyncDB(path))
+
+        calls = args.rounds * (args.concurrency + args.writes)
+        threaded = asyncio.run(run_threaded(sync_api, args.rounds, args.concurrency, args.writes))
+
+        async def run_and_close():
+            try:
+                return await run_async(async_api, args.rounds, args.concurrency, args.writes)
+            finally:
+                await async_api.close()
+        native = asyncio.run(run_and_close())
+        db.dispose()
+
+    print(f"{'api':<22} {'seconds':>9} {'calls/s':>10}")
+    print(f"{'BudgetAPI + threads':<22} {threaded:>9.2f} {calls / threaded:>10,.0f}")
+    print(f"{'AsyncBudgetAPI':<22} {native:>9.2f} {calls / native:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
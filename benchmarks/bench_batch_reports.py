@@ -0,0 +1,46 @@
+"""Batch report throughput across ledger files as the worker count grows.
+
+    python -m benchmarks.bench_batch_reports --ledgers 64 --rows 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from batch_reports import run_batch_reports
+from benchmarks.bench_month_query import populate
+from budget_api import BudgetAPI
+from db.db import DB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ledgers', type=int, default=64)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument('--by-category', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.ledgers):
+            path = os.path.join(tmp, f'ledger-{i}.db')
+            db = DB(path)
+            db.ensure_schema()
+            populate(db.engine, args.rows, seed=i)
+            BudgetAPI(db=db).rebuild_rollups()
+            db.dispose()
+            paths.append(path)
+
+        print(f"{'workers':>7} {'seconds':>9} {'ledgers/s':>10} {'errors':>7}")
+        for workers in args.workers:
+            started = time.perf_counter()
+            reports = list(run_batch_reports(paths, month='2019-06', trend_months=120,
+                                             by_category=args.by_category, workers=workers))
+            elapsed = time.perf_counter() - started
+            errors = sum('error' in report for report in reports)
+            print(f"{workers:>7} {elapsed:>9.2f} {len(paths) / elapsed:>10.1f} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Concurrent read/write throughput for each DB engine profile.
+
+Reader threads run month aggregates while writer threads insert single
+transactions, each in its own commit, for a fixed duration.
+
+    python -m benchmarks.bench_engine_profiles --rows 100000 --readers 4 --writers 1
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.bench_month_query import CATEGORIES, DAYS, START, populate
+from db.db import DB, ENGINE_PROFILES
+from db.models.enums import TransactionType
+from db.models.transaction import Transaction
+
+
+def reader(db: DB, stop: threading.Event, counts: dict, seed: int) -> None:
+    rng = random.Random(seed)
+    while not stop.is_set():
+        start = START + timedelta(days=rng.randrange(DAYS - 31))
+        stmt = (select(func.count(), func.sum(Transaction.amount))
+                .where(Transaction.date >= start, Transaction.date < start + timedelta(days=31)))
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(stmt).one()
+            counts['reads'] += 1
+        except OperationalError:
+            counts['read_errors'] += 1
+
+
+def writer(db: DB, stop: threading.Event, counts: dict, seed: int) -> None:
+    rng = random.Random(seed)
+    while not stop.is_set():
+        row = {'type': TransactionType.EXPENSE, 'amount': rng.uniform(1, 100),
+               'category_id': rng.randint(1, CATEGORIES), 'vendor': None, 'note': None,
+               'date': date.today()}
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(insert(Transaction.__table__), row)
+            counts['writes'] += 1
+        except OperationalError:
+            counts['write_errors'] += 1
+
+
+def run(profile: str, rows: int, readers: int, writers: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(os.path.join(tmp, 'bench.db'), profile=profile)
+        db.ensure_schema()
+        populate(db.engine, rows)
+
+        # One counter dict per thread, summed afterwards
+        per_thread = [{'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+                      for _ in range(readers + writers)]
+        stop = threading.Event()
+        threads = [threading.Thread(target=reader, args=(db, stop, per_thread[i], i)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(db, stop, per_thread[readers + i], 100 + i))
+                    for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        db.dispose()
+    return {key: sum(counts[key] for counts in per_thread) for key in per_thread[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', default=list(ENGINE_PROFILES))
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=1)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10} {'read err':>9} {'write err':>10}")
+    for profile in args.profiles:
+        counts = run(profile, args.rows, args.readers, args.writers, args.seconds)
+        print(f"{profile:<10} {counts['reads'] / args.seconds:>10,.0f} {counts['writes'] / args.seconds:>10,.0f} "
+              f"{counts['read_errors']:>9} {counts['write_errors']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Export throughput, file size and peak memory per format on large ledgers.
+
+Each size is exported to every format with and without gzip, then compared
+with the old approach of get_transactions() followed by csv.writer. Peak
+memory is traced with tracemalloc in a second, slower pass.
+
+    python -m benchmarks.bench_export --sizes 1000000 3000000
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_month_query import populate
+from budget_api import BudgetAPI
+from db.db import DB
+
+TARGETS = ('csv', 'csv.gz', 'jsonl', 'jsonl.gz', 'bcol', 'bcol.gz')
+
+
+def export_via_get_transactions(api: BudgetAPI, path: str) -> None:
+    """The pre-exporter way: load every ORM object, then serialize"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        for t in api.get_transactions():
+            writer.writerow((t.id, t.date, t.type.value, t.amount, t.category_id, t.vendor, t.note))
+
+
+def traced_peak_mb(function) -> float:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--baseline-max', type=int, default=1_000_000,
+                        help='largest size to run the get_transactions baseline on')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db = DB(os.path.join(tmp, f'ledger-{size}.db'))
+            db.ensure_schema()
+            populate(db.engine, size)
+            api = BudgetAPI(db=db)
+
+            print(f"\n{size:,} rows")
+            print(f"{'format':>10} {'seconds':>8} {'rows/s':>10} {'MB':>8} {'peak MB':>8}")
+            for target in TARGETS:
+                path = os.path.join(tmp, f'export.{target}')
+                stats = api.export_transactions(path, batch_size=args.batch_size)
+                peak = '-' if args.no_memory else '%.1f' % traced_peak_mb(
+                    lambda: api.export_transactions(path, batch_size=args.batch_size))
+                print(f"{target:>10} {stats['elapsed']:>8.2f} {stats['rows_per_sec']:>10,.0f} "
+                      f"{stats['bytes'] / 1e6:>8.1f} {peak:>8}")
+                os.remove(path)
+
+            if size <= args.baseline_max:
+                path = os.path.join(tmp, 'baseline.csv')
+                started = time.perf_counter()
+                export_via_get_transactions(api, path)
+                elapsed = time.perf_counter() - started
+                peak = '-' if args.no_memory else '%.1f' % traced_peak_mb(
+                    lambda: export_via_get_transactions(api, path))
+                print(f"{'baseline':>10} {elapsed:>8.2f} {size / elapsed:>10,.0f} "
+                      f"{os.path.getsize(path) / 1e6:>8.1f} {peak:>8}")
+                os.remove(path)
+            db.dispose()
+
+
+if __name__ == '__main__':
+    main()
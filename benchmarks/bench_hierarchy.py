@@ -0,0 +1,83 @@
+"""Category tree operations on deep and wide trees with thousands of categories.
+
+Times building the snapshot index, the nested hierarchy, every category's
+path, one subtree lookup and the spending summary roll-up, next to the
+per-category parent_id walks they replaced.
+
+    python -m benchmarks.bench_hierarchy --sizes 1000 5000 20000
+"""
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from db.managers.category_cache import CategorySnapshot
+from db.managers.category_manager import CategoryManager
+
+
+def deep_tree(size: int) -> List[Tuple]:
+    """One chain: every category is the parent of the next"""
+    return [(i, f'category-{i}', 0, i - 1 if i > 1 else None) for i in range(1, size + 1)]
+
+
+def wide_tree(size: int, seed: int = 42) -> List[Tuple]:
+    """Random recursive tree: each category hangs under a random earlier one"""
+    rng = random.Random(seed)
+    return [(1, 'category-1', 0, None)] + [
+        (i, f'category-{i}', 0, rng.randint(max(1, i - 50), i - 1) if rng.random() < 0.5 else rng.randint(1, i - 1))
+        for i in range(2, size + 1)
+    ]
+
+
+def walk_paths(snapshot: CategorySnapshot) -> dict:
+    """The old approach: walk the parent_id chain of every category"""
+    paths = {}
+    for category_id, category in snapshot.by_id.items():
+        names, node, seen = [], category, set()
+        while node is not None and node.id not in seen:
+            seen.add(node.id)
+            names.append(node.name)
+            node = snapshot.by_id.get(node.parent_id)
+        paths[category_id] = ' > '.join(reversed(names))
+    return paths
+
+
+def walk_descendants(snapshot: CategorySnapshot, category_id: int) -> List[int]:
+    found, stack = [], [category_id]
+    while stack:
+        node = stack.pop()
+        found.append(node)
+        stack.extend(snapshot.children.get(node, ()))
+    return found
+
+
+def timed(function: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    function()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'shape':>5} {'size':>6} {'index':>8} {'hierarchy':>10} {'paths':>8} {'walked':>8} "
+          f"{'subtree':>8} {'walked':>8} {'summary':>8}   (ms)")
+    for shape, build in (('deep', deep_tree), ('wide', wide_tree)):
+        for size in args.sizes:
+            rows = build(size)
+            summary_rows = [row + (1.0, 0.0, 1) for row in rows]
+            snapshot = CategorySnapshot(rows)
+            print(f"{shape:>5} {size:>6} "
+                  f"{timed(lambda: CategorySnapshot(rows)):>8.1f} "
+                  f"{timed(snapshot.hierarchy):>10.1f} "
+                  f"{timed(snapshot.paths):>8.1f} "
+                  f"{timed(lambda: walk_paths(snapshot)):>8.1f} "
+                  f"{timed(lambda: snapshot.descendants(1)):>8.2f} "
+                  f"{timed(lambda: walk_descendants(snapshot, 1)):>8.2f} "
+                  f"{timed(lambda: CategoryManager._summarize_spending(summary_rows)):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
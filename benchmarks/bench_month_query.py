@@ -0,0 +1,112 @@
+"""Month/category query latency before and after the transactions indexes.
+
+"before" drops the indexes and filters with extract('year'/'month'), the way
+get_transactions_by_month used to; "after" keeps the indexes and uses the
+half-open date range.
+
+    python -m benchmarks.bench_month_query --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import and_, create_engine, extract, insert, select
+
+from db.models.base import Base
+from db.models.category import Category
+from db.models.enums import TransactionType
+from db.models.transaction import Transaction
+
+START = date(2015, 1, 1)
+DAYS = 365 * 10
+CATEGORIES = 50
+
+
+def populate(engine, rows: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    with engine.begin() as connection:
+        connection.execute(insert(Category.__table__),
+                           [{'name': f'category-{i}', 'limit_amount': 0} for i in range(CATEGORIES)])
+        chunk = []
+        for _ in range(rows):
+            chunk.append({
+                'type': TransactionType.EXPENSE if rng.random() < 0.9 else TransactionType.INCOME,
+                'amount': round(rng.uniform(1, 500), 2),
+                'category_id': rng.randint(1, CATEGORIES),
+                'vendor': None,
+                'note': None,
+                'date': START + timedelta(days=rng.randrange(DAYS)),
+            })
+            if len(chunk) == 10000:
+                connection.execute(insert(Transaction.__table__), chunk)
+                chunk = []
+        if chunk:
+            connection.execute(insert(Transaction.__table__), chunk)
+
+
+def time_query(engine, stmt, repeat: int) -> float:
+    """Median wall time in milliseconds"""
+    samples = []
+    with engine.connect() as connection:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            connection.execute(stmt).all()
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def queries(indexed: bool):
+    year, month = 2020, 6
+    if indexed:
+        by_month = and_(Transaction.date >= date(year, month, 1),
+                        Transaction.date < date(year, month + 1, 1))
+    else:
+        by_month = and_(extract('year', Transaction.date) == year,
+                        extract('month', Transaction.date) == month)
+    return {
+        'month': select(Transaction).where(by_month),
+        'category_month': select(Transaction).where(Transaction.category_id == 7, by_month),
+        'expense_month': select(Transaction).where(Transaction.type == TransactionType.EXPENSE, by_month),
+    }
+
+
+def run(rows: int, repeat: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        populate(engine, rows)
+
+        for index in Transaction.__table__.indexes:
+            index.drop(engine)
+        for name, stmt in queries(indexed=False).items():
+            results[(name, 'before')] = time_query(engine, stmt, repeat)
+
+        for index in Transaction.__table__.indexes:
+            index.create(engine)
+        for name, stmt in queries(indexed=True).items():
+            results[(name, 'after')] = time_query(engine, stmt, repeat)
+        engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'query':<16} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for rows in args.sizes:
+        results = run(rows, args.repeat)
+        for name in queries(indexed=True):
+            before, after = results[(name, 'before')], results[(name, 'after')]
+            print(f"{rows:>10} {name:<16} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Read throughput and peak memory of the TransactionManager row modes.
+
+Each mode reads every transaction through list_transactions and through
+iter_transactions; peak memory is measured with tracemalloc on a separate run.
+
+    python -m benchmarks.bench_row_modes --rows 1000000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_month_query import populate
+from db.db import DB
+from db.managers.transaction_manager import TransactionManager
+from db.models.rows import ROW_MODES
+
+
+def measure(fn):
+    """Time one untraced run, then take peak memory from a second traced run"""
+    gc.collect()
+    started = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(os.path.join(tmp, 'bench.db'))
+        db.ensure_schema()
+        populate(db.engine, args.rows)
+        manager = TransactionManager(db)
+
+        print(f"{'method':<8} {'mode':<8} {'rows/s':>12} {'seconds':>9} {'peak MiB':>9}")
+        for mode in ROW_MODES:
+            def listed():
+                return len(manager.list_transactions(row_mode=mode))
+
+            def streamed():
+                return sum(len(item) if mode == 'columns' else 1
+                           for item in manager.iter_transactions(args.batch_size, row_mode=mode))
+
+            for method, fn in (('list', listed), ('iter', streamed)):
+                count, elapsed, peak = measure(fn)
+                print(f"{method:<8} {mode:<8} {count / elapsed:>12,.0f} {elapsed:>9.2f} {peak / 2 ** 20:>9.1f}")
+        db.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""Reproducible BudgetAPI benchmark suite over synthetic ledgers, compared to a stored baseline.
+
+For each size a fresh seeded ledger is generated (see synthetic_ledger) and
+every case is timed: bulk insert throughput, get_transactions with each
+filter, get_budget_summary, get_spending_trends, category hierarchy
+building and subtree queries. Results are written as JSON; with a baseline file each case's
+median is compared against it, regressions beyond --tolerance are flagged
+and cases the baseline lacks are listed as missing. The ledger's last month
+is stored in the results; when comparing, --end defaults to the baseline's so
+both runs time the same data.
+
+    python -m benchmarks.bench_suite --sizes 10000 100000 1000000 --output results.json
+    python -m benchmarks.bench_suite --save-baseline        # refresh benchmarks/baseline.json
+    python -m benchmarks.bench_suite --fail-on-regression   # exit 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+import sqlalchemy
+
+from benchmarks.synthetic_ledger import build_ledger, ledger_end, open_target
+from budget_api import BudgetAPI
+from db.managers.category_cache import get_category_cache
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# get_transactions returns ORM objects, so every filter case reads one page
+# rather than hydrating a large share of the ledger
+PAGE = 1000
+
+
+def time_case(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Median and p95 wall time in milliseconds after one warm-up call"""
+    function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'median_ms': samples[len(samples) // 2],
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'repeat': repeat,
+    }
+
+
+def cases(api: BudgetAPI, ledger: Dict) -> Dict[str, Callable[[], object]]:
+    """Name -> zero-argument call, built around the generated ledger's dates and vendors"""
+    end = date.fromisoformat(ledger['end'])
+    last_month = (end - timedelta(days=40)).strftime('%Y-%m')
+    # Trends count back from the ledger's last month rather than today, so
+    # runs in later months still time the same window
+    final_month = (end - timedelta(days=1)).strftime('%Y-%m')
+    quarter_start = (end - timedelta(days=90)).isoformat()
+    cache = get_category_cache(api.db)
+
+    def cold_hierarchy():
+        cache.invalidate()
+        return api.get_category_hierarchy()
+
+    return {
+        'get_transactions[category]': lambda: api.get_transactions(limit=PAGE, category='Groceries'),
+        'get_transactions[date_range]': lambda: api.get_transactions(limit=PAGE, start_date=quarter_start,
+                                                                     end_date=end.isoformat()),
+        'get_transactions[month]': lambda: api.get_transactions(limit=PAGE, month=last_month),
+        'get_transactions[transaction_type]': lambda: api.get_transactions(limit=PAGE, transaction_type='income'),
+        'get_transactions[vendor]': lambda: api.get_transactions(limit=PAGE, vendor=ledger['top_vendor']),
+        'get_transactions[combined]': lambda: api.get_transactions(limit=PAGE, category='Groceries',
+                                                                   month=last_month, transaction_type='expense'),
+        'get_transactions[subtree]': lambda: api.get_transactions(limit=PAGE, category='Food',
+                                                                  include_subcategories=True),
+        'get_budget_summary[month]': lambda: api.get_budget_summary(last_month),
+        'get_budget_summary[all]': lambda: api.get_budget_summary(),
+        'get_spending_trends[12]': lambda: api.get_spending_trends(12, as_of=final_month),
+        'get_spending_trends[12,by_category]': lambda: api.get_spending_trends(12, by_category=True,
+                                                                               as_of=final_month),
+        'get_category_hierarchy[cold]': cold_hierarchy,
+        'get_category_hierarchy[warm]': api.get_category_hierarchy,
+        'get_subtree_totals[month]': lambda: api.get_subtree_totals('Food', last_month),
+    }
+
+
+def run_size(size: int, args) -> Dict[str, Dict]:
+    db = open_target(args.target)
+    try:
+        api = BudgetAPI(db=db)
+        ledger = build_ledger(api, size, args.years, args.seed, args.extra_categories, ledger_end(args.end))
+        results = {'insert': {'median_ms': ledger['insert_seconds'] * 1000,
+                              'rows_per_sec': ledger['insert_rows_per_sec'],
+                              'repeat': 1}}
+        for name, function in cases(api, ledger).items():
+            results[name] = time_case(function, args.repeat)
+        return results
+    finally:
+        db.dispose()
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """Per-case median ratios against the baseline; cases it has no timing for are 'missing'"""
+    rows = []
+    for size, size_results in results['results'].items():
+        for name, current in size_results.items():
+            previous = baseline.get('results', {}).get(size, {}).get(name)
+            if not previous or not previous['median_ms']:
+                rows.append({'size': size, 'case': name, 'baseline_ms': None,
+                             'current_ms': current['median_ms'], 'ratio': None, 'status': 'missing'})
+                continue
+            ratio = current['median_ms'] / previous['median_ms']
+            if ratio > 1 + tolerance:
+                status = 'regression'
+            elif ratio < 1 / (1 + tolerance):
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append({'size': size, 'case': name, 'baseline_ms': previous['median_ms'],
+                         'current_ms': current['median_ms'], 'ratio': ratio, 'status': status})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--extra-categories', type=int, default=0)
+    parser.add_argument('--end', help="last month with data, YYYY-MM (default: the baseline's, else current month)")
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--target', choices=('test', 'memory'), default='memory')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='write results to --baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown, 0.25 = 25%%')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.end is None:
+        args.end = (baseline or {}).get('meta', {}).get('end') or date.today().strftime('%Y-%m')
+
+    results = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'target': args.target,
+            'seed': args.seed,
+            'years': args.years,
+            'extra_categories': args.extra_categories,
+            'end': args.end,
+        },
+        'results': {},
+    }
+    for size in args.sizes:
+        results['results'][str(size)] = run_size(size, args)
+        print(f"\n{size:,} rows")
+        for name, result in results['results'][str(size)].items():
+            extra = f" {result['rows_per_sec']:>12,.0f} rows/s" if 'rows_per_sec' in result else \
+                f" p95 {result['p95_ms']:>9.2f} ms"
+            print(f"  {name:<38} {result['median_ms']:>10.2f} ms{extra}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline is not None:
+        comparison = compare(results, baseline, args.tolerance)
+        regressions = [row for row in comparison if row['status'] == 'regression']
+        missing = [row for row in comparison if row['status'] == 'missing']
+        print(f"\nAgainst {args.baseline} ({baseline['meta']['created']}), tolerance {args.tolerance:.0%}")
+        if baseline['meta'].get('end') != args.end:
+            print(f"  note: baseline ledger ends {baseline['meta'].get('end', 'at its creation month')}, "
+                  f"this run {args.end}")
+        for row in comparison:
+            if row['status'] == 'missing':
+                print(f"  {'missing':<11} {row['size']:>8} {row['case']:<38} "
+                      f"{'-':>9} -> {row['current_ms']:>9.2f} ms (not in baseline)")
+            elif row['status'] != 'ok':
+                print(f"  {row['status']:<11} {row['size']:>8} {row['case']:<38} "
+                      f"{row['baseline_ms']:>9.2f} -> {row['current_ms']:>9.2f} ms ({row['ratio']:.2f}x)")
+        compared = len(comparison) - len(missing)
+        print(f"  {compared - len(regressions)} of {compared} cases within tolerance or faster"
+              + (f", {len(missing)} missing from the baseline" if missing else ''))
+        if args.output:
+            results['comparison'] = comparison
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
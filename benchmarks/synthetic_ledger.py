@@ -0,0 +1,207 @@
+"""Seeded synthetic ledgers: a category tree, vendors and years of transactions.
+
+The same seed, size and end month always produce the same ledger. Data ends
+in the current month by default so trend reports have recent months to read;
+pass --end to pin it for runs that are compared with each other.
+
+    python -m benchmarks.synthetic_ledger --rows 100000 --years 5 --end 2025-06 --target test
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from budget_api import BudgetAPI, parse_month
+from db.db import DB
+from db.models.enums import DBFile
+
+# name -> subtree; leaves carry (typical amount, relative frequency)
+CATEGORY_TREE = {
+    'Housing': {
+        'Rent': (1400, 1), 'Maintenance': (120, 1),
+        'Utilities': {'Electricity': (80, 1), 'Water': (35, 1), 'Internet': (60, 1)},
+    },
+    'Food': {
+        'Groceries': (65, 30),
+        'Dining Out': {'Restaurants': (45, 10), 'Coffee': (5, 25), 'Takeout': (25, 10)},
+    },
+    'Transport': {'Fuel': (50, 8), 'Public Transit': (3, 20), 'Parking': (12, 6), 'Car Service': (300, 1)},
+    'Health': {'Pharmacy': (20, 3), 'Doctor': (90, 1), 'Gym': (40, 1)},
+    'Shopping': {'Clothing': (60, 4), 'Electronics': (250, 1), 'Home Goods': (40, 4)},
+    'Entertainment': {'Streaming': (15, 3), 'Movies': (14, 2), 'Games': (30, 1), 'Concerts': (80, 1)},
+    'Travel': {'Flights': (350, 1), 'Hotels': (150, 1)},
+}
+INCOME_CATEGORIES = {'Salary': (3200, 2), 'Freelance': (600, 1), 'Interest': (12, 1)}
+INCOME_SHARE = 0.06
+
+# Monthly limits for top-level categories
+LIMITS = {'Housing': 2000, 'Food': 900, 'Transport': 400, 'Health': 200,
+          'Shopping': 500, 'Entertainment': 150, 'Travel': 400}
+
+_VENDOR_PREFIXES = ('North', 'Blue', 'City', 'Prime', 'Green', 'Corner', 'Metro', 'Sun', 'Oak', 'River')
+_VENDOR_SUFFIXES = ('Mart', 'Co', 'Shop', 'Express', 'Hub', 'Market', 'Supply', 'Works', 'Depot', 'House')
+_NOTES = ('monthly', 'refund pending', 'shared', 'work', 'gift', 'split with roommate')
+
+# (name, limit, parent name) in parent-before-child order
+CategorySpec = Tuple[str, float, Optional[str]]
+
+
+def category_specs(rng: random.Random, extra: int = 0) -> Tuple[List[CategorySpec], Dict[str, Tuple[float, float]]]:
+    """The category tree plus `extra` generated subcategories, and (amount, weight) per spending category.
+
+    Extra categories attach under random existing expense categories, giving
+    deeper and wider trees for hierarchy benchmarks; their parents keep any
+    spending of their own.
+    """
+    specs = []
+    leaves = {}
+
+    def walk(tree: Dict, parent: Optional[str]) -> None:
+        for name, node in tree.items():
+            specs.append((name, LIMITS.get(name, 0), parent))
+            if isinstance(node, dict):
+                walk(node, name)
+            else:
+                leaves[name] = node
+
+    walk(CATEGORY_TREE, None)
+    specs.append(('Income', 0, None))
+    walk(INCOME_CATEGORIES, 'Income')
+
+    expense_names = [name for name, _, parent in specs if name not in INCOME_CATEGORIES and name != 'Income']
+    for i in range(extra):
+        parent = rng.choice(expense_names)
+        name = f'{parent} {i + 1}'
+        specs.append((name, 0, parent))
+        expense_names.append(name)
+        leaves[name] = (round(rng.lognormvariate(3.5, 1), 2), rng.choice((1, 2, 4)))
+    return specs, leaves
+
+
+def vendor_names(rng: random.Random, category: str) -> List[str]:
+    count = rng.randint(3, 12)
+    names = {f'{rng.choice(_VENDOR_PREFIXES)} {rng.choice(_VENDOR_SUFFIXES)}' for _ in range(count)}
+    return sorted(f'{name} {category}' if rng.random() < 0.3 else name for name in names)
+
+
+def transaction_rows(rng: random.Random,
+                     leaves: Dict[str, Tuple[float, float]],
+                     vendors: Dict[str, List[str]],
+                     rows: int,
+                     start: date,
+                     end: date) -> Iterator[tuple]:
+    """Yield add_transactions_bulk tuples dated uniformly in [start, end)"""
+    expense = [name for name in leaves if name not in INCOME_CATEGORIES]
+    expense_weights = [leaves[name][1] for name in expense]
+    income = list(INCOME_CATEGORIES)
+    income_weights = [INCOME_CATEGORIES[name][1] for name in income]
+    days = (end - start).days
+    ordinal = start.toordinal()
+
+    for _ in range(rows):
+        if rng.random() < INCOME_SHARE:
+            transaction_type = 'income'
+            category = rng.choices(income, income_weights)[0]
+            typical = INCOME_CATEGORIES[category][0]
+        else:
+            transaction_type = 'expense'
+            category = rng.choices(expense, expense_weights)[0]
+            typical = leaves[category][0]
+        names = vendors[category]
+        # Zipf-like: the first vendors of a category get most of its business
+        vendor = names[min(int(rng.paretovariate(1.2)) - 1, len(names) - 1)]
+        yield (transaction_type,
+               round(typical * rng.lognormvariate(0, 0.35), 2),
+               category,
+               vendor,
+               rng.choice(_NOTES) if rng.random() < 0.1 else None,
+               date.fromordinal(ordinal + rng.randrange(days)))
+
+
+def build_ledger(api: BudgetAPI,
+                 rows: int,
+                 years: int = 3,
+                 seed: int = 42,
+                 extra_categories: int = 0,
+                 end: date = None,
+                 chunk_size: int = 5000) -> Dict:
+    """Create the categories and insert `rows` transactions through BudgetAPI.
+
+    Transactions are dated in the `years` before end (exclusive, see
+    ledger_end), inserted with add_transactions_bulk chunk_size at a time,
+    and the insert time is reported.
+    """
+    rng = random.Random(seed)
+    end = end or ledger_end()
+    start = end.replace(year=end.year - years)
+
+    specs, leaves = category_specs(rng, extra_categories)
+    for name, limit, parent in specs:
+        api.create_category(name, limit, parent)
+
+    vendors = {name: vendor_names(rng, name) for name in leaves}
+    generated = transaction_rows(rng, leaves, vendors, rows, start, end)
+    inserted = 0
+    seconds = 0.0
+    while True:
+        chunk = [row for _, row in zip(range(chunk_size), generated)]
+        if not chunk:
+            break
+        started = time.perf_counter()
+        inserted += api.add_transactions_bulk(chunk, chunk_size)['inserted']
+        seconds += time.perf_counter() - started
+
+    return {
+        'categories': len(specs),
+        'rows': inserted,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'insert_seconds': seconds,
+        'insert_rows_per_sec': inserted / seconds if seconds else 0.0,
+        'top_vendor': vendors['Groceries'][0],
+    }
+
+
+def ledger_end(month: str = None) -> date:
+    """Exclusive end date of a ledger whose last month is month (YYYY-MM), default the current month"""
+    if month:
+        return parse_month(month)[1]
+    return (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def open_target(target: str) -> DB:
+    """A fresh DB for 'test' (budget_test.db, replaced) or 'memory' (in-memory profile)"""
+    if target == 'memory':
+        return DB(profile='memory')
+    if target != 'test':
+        raise ValueError("target must be 'test' or 'memory'")
+    for suffix in ('', '-wal', '-shm'):
+        path = f'{DBFile.TEST.value}{suffix}'
+        if os.path.exists(path):
+            os.remove(path)
+    return DB(DBFile.TEST)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--extra-categories', type=int, default=0)
+    parser.add_argument('--end', help='last month with data, YYYY-MM (default: current month)')
+    parser.add_argument('--target', choices=('test', 'memory'), default='test')
+    args = parser.parse_args()
+
+    end = ledger_end(args.end)
+    db = open_target(args.target)
+    summary = build_ledger(BudgetAPI(db=db), args.rows, args.years, args.seed, args.extra_categories, end)
+    print(f"{summary['rows']:,} transactions in {summary['categories']} categories, "
+          f"{summary['start']}..{summary['end']}, {summary['insert_rows_per_sec']:,.0f} rows/s "
+          f"into {db.db_file if args.target == 'test' else 'memory'}")
+    db.dispose()
+
+
+if __name__ == '__main__':
+    main()
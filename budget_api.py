@@ -1,31 +1,263 @@
 from datetime import date, datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+import exporter
+import importer
+from alerts import BudgetAlert, BudgetAlerts
+from analytics import REPORT_ENGINES, AnalyticsEngine
+from instrumentation import Metrics, install_listeners, instrumented
+from report_cache import ReportCache, cached_report
+from db.db import DB, db_instance
+from db.ledger_events import get_ledger_events
 from db.managers.category_manager import CategoryManager
-from db.managers.transaction_manager import TransactionManager
+from db.managers.transaction_manager import TransactionManager, month_bounds
 from db.models.enums import TransactionType
 from db.models.transaction import Transaction
 from db.models.category import Category
+from db.models.rows import CategoryRow
+
+
+# ===== ARGUMENT PARSING & REPORT SHAPING =====
+# Shared by BudgetAPI and AsyncBudgetAPI so both accept and return the same shapes.
+
+def parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD string"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError("Date must be in YYYY-MM-DD format")
+
+
+def parse_month(month: str) -> Tuple[date, date]:
+    """Parse "YYYY-MM" into its half-open [start, end) date range"""
+    try:
+        year, month_num = map(int, month.split('-'))
+        return month_bounds(year, month_num)
+    except ValueError:
+        raise ValueError("Month must be in YYYY-MM format")
+
+
+def parse_month_span(start_month: str = None, end_month: str = None) -> Tuple[Optional[date], Optional[date]]:
+    """Parse an inclusive "YYYY-MM" month span into a half-open date range"""
+    start_date = parse_month(start_month)[0] if start_month else None
+    end_date = parse_month(end_month)[1] if end_month else None
+    return start_date, end_date
+
+
+def parse_transaction_args(transaction_type: str, transaction_date: str = None) -> Tuple[TransactionType, Optional[date]]:
+    """Convert add_transaction's string type and optional date"""
+    # Anything other than 'income' is recorded as an expense
+    tx_type = TransactionType.INCOME if transaction_type.lower() == 'income' else TransactionType.EXPENSE
+    return tx_type, parse_date(transaction_date) if transaction_date else None
+
+
+def parse_filters(category: str = None,
+                  start_date: str = None,
+                  end_date: str = None,
+                  month: str = None,
+                  transaction_type: str = None,
+                  vendor: str = None) -> Dict:
+    """Convert string filter arguments into TransactionManager filters"""
+    filters = {'category': category, 'vendor': vendor}
+    
+    if month:
+        month_start, _ = parse_month(month)
+        filters['month'] = (month_start.year, month_start.month)
+    if start_date:
+        filters['start_date'] = parse_date(start_date)
+    if end_date:
+        filters['end_date'] = parse_date(end_date)
+    
+    if transaction_type:
+        try:
+            filters['transaction_type'] = TransactionType(transaction_type.lower())
+        except ValueError:
+            raise ValueError("Transaction type must be 'income' or 'expense'")
+    
+    return filters
+
+
+# get_transactions filter arguments accepted by the *_transactions_where methods
+WHERE_FILTER_KEYS = ('category', 'start_date', 'end_date', 'month', 'transaction_type', 'vendor')
+
+
+def parse_where(filters: Dict, changes: Dict = None) -> Tuple[Dict, Optional[Dict]]:
+    """Parse the filters and changes of update/delete_transactions_where.
+
+    filters use the parse_filters keys; changes may set transaction_type
+    ('income' or 'expense'), amount, category, vendor, note and date
+    (YYYY-MM-DD).
+    """
+    unknown = set(filters) - set(WHERE_FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown filters {', '.join(sorted(unknown))}, use {', '.join(WHERE_FILTER_KEYS)}")
+    parsed = {key: value for key, value in parse_filters(**filters).items() if value is not None}
+    if changes is None:
+        return parsed, None
+
+    changes = dict(changes)
+    if isinstance(changes.get('date'), str):
+        changes['date'] = parse_date(changes['date'])
+    if isinstance(changes.get('transaction_type'), str):
+        try:
+            changes['transaction_type'] = TransactionType(changes['transaction_type'].lower())
+        except ValueError:
+            raise ValueError("Transaction type must be 'income' or 'expense'")
+    return parsed, changes
+
+
+def build_budget_summary(month: Optional[str], category_summary: Dict, totals: Dict) -> Dict:
+    """Assemble get_budget_summary's result from the category summary and period totals"""
+    total_income = totals['income']
+    total_expenses = totals['expense']
+    
+    # Calculate budget health
+    categories_over_budget = [name for name, data in category_summary.items() if data['over_budget']]
+    total_budget_limits = sum(data['limit'] for data in category_summary.values() if data['limit'] > 0)
+    
+    return {
+        'period': month or 'all_time',
+        'total_income': total_income,
+        'total_expenses': total_expenses,
+        'net_amount': total_income - total_expenses,
+        'total_budget_limits': total_budget_limits,
+        'budget_utilization': (total_expenses / total_budget_limits * 100) if total_budget_limits > 0 else None,
+        'categories_over_budget': categories_over_budget,
+        'category_breakdown': category_summary,
+        'transaction_count': totals['count']
+    }
+
+
+def trend_window(months: int, as_of: str = None) -> Tuple[List[Tuple[int, int]], date, date]:
+    """Return (year, month index) keys for the N months up to as_of, newest first, and their date range
+
+    as_of is YYYY-MM and defaults to the current month.
+    """
+    if months < 1:
+        raise ValueError("months must be at least 1")
+    
+    # Count months as year * 12 + (month - 1) so spans of any length work
+    today = parse_month(as_of)[0] if as_of else date.today()
+    current = today.year * 12 + today.month - 1
+    month_keys = [divmod(current - i, 12) for i in range(months)]
+    
+    oldest_year, oldest_index = month_keys[-1]
+    _, end_date = month_bounds(today.year, today.month)
+    return month_keys, date(oldest_year, oldest_index + 1, 1), end_date
+
+
+def build_trends(month_keys: List[Tuple[int, int]], rows: Iterable[tuple], by_category: bool = False) -> Dict:
+    """Fold get_monthly_totals rows into get_spending_trends' per-month dicts"""
+    trends = {}
+    for year, month_index in month_keys:
+        entry = {'income': 0.0, 'expenses': 0.0, 'net': 0.0, 'transaction_count': 0}
+        if by_category:
+            entry['categories'] = {}
+        trends[f"{year:04d}-{month_index + 1:02d}"] = entry
+    
+    for row in rows:
+        if by_category:
+            year, month_num, category_name, tx_type, total, count = row
+        else:
+            year, month_num, tx_type, total, count = row
+        
+        entry = trends[f"{year:04d}-{month_num:02d}"]
+        field = 'income' if tx_type == TransactionType.INCOME else 'expenses'
+        entry[field] += total
+        entry['transaction_count'] += count
+        
+        if by_category:
+            series = entry['categories'].setdefault(category_name, {'income': 0.0, 'expenses': 0.0})
+            series[field] += total
+    
+    for entry in trends.values():
+        entry['net'] = entry['income'] - entry['expenses']
+    
+    return trends
+
+
+# Date periods read by the cached report methods, called with their arguments
+
+def _summary_period(month: str = None, *args, **kwargs) -> Tuple[Optional[date], Optional[date]]:
+    return parse_month(month) if month else (None, None)
+
+
+def _subtree_period(category: str, month: str = None, *args, **kwargs) -> Tuple[Optional[date], Optional[date]]:
+    return _summary_period(month)
+
+
+def _trends_period(months: int = 6, by_category: bool = False, as_of: str = None) -> Tuple[date, date]:
+    _, start_date, end_date = trend_window(months, as_of)
+    return start_date, end_date
+
+
+def _span_period(start_month: str = None, end_month: str = None, *args, **kwargs) -> Tuple[Optional[date], Optional[date]]:
+    return parse_month_span(start_month, end_month)
+
+
+def _rolling_period(months: int = 12, window: int = 3) -> Tuple[date, date]:
+    return _trends_period(months + window - 1)
+
+
+def _all_time(*args, **kwargs) -> Tuple[None, None]:
+    return None, None
 
 
 class BudgetAPI:
     """Unified API for all budget-related database operations"""
     
-    def __init__(self):
-        self.category_manager = CategoryManager()
-        self.transaction_manager = TransactionManager()
+    def __init__(self,
+                 instrument: bool = False,
+                 trace_path: str = None,
+                 report_engine: str = 'sql',
+                 db: DB = None,
+                 cache_reports: bool = False,
+                 cache_size: int = 256,
+                 cache_ttl: Optional[float] = 60.0,
+                 alert_thresholds: Sequence[float] = None,
+                 on_alert: Callable[[BudgetAlert], None] = None):
+        # Each DB is one ledger file; the default is the module-level db_instance
+        self.db = db or db_instance
+        self.category_manager = CategoryManager(self.db)
+        self.transaction_manager = TransactionManager(self.db)
+        
+        # Reports run as SQL aggregates by default; 'numpy' computes them from
+        # columnar arrays with the same results (see analytics.AnalyticsEngine)
+        if report_engine not in REPORT_ENGINES:
+            raise ValueError(f"report_engine must be one of {', '.join(REPORT_ENGINES)}")
+        self.report_engine = report_engine
+        self.analytics = AnalyticsEngine(self.db) if report_engine == 'numpy' else None
+        
+        # Opt-in per-call latency/SQL metrics, optionally traced to a JSONL file
+        self.metrics = None
+        if instrument or trace_path:
+            self.metrics = Metrics(trace_path)
+            install_listeners(self.db)
+        
+        # Opt-in memoization of report methods, invalidated by this ledger's writes
+        self.report_cache = None
+        if cache_reports:
+            self.report_cache = ReportCache(get_ledger_events(self.db), cache_size, cache_ttl)
+        
+        # Opt-in budget alerts, updated incrementally by every write to this ledger
+        self.alerts = None
+        if alert_thresholds or on_alert:
+            self.alerts = BudgetAlerts(self.db, alert_thresholds or (80, 100), on_alert)
     
     # ===== CATEGORY OPERATIONS =====
     
+    @instrumented
     def create_category(self, name: str, limit: float = 0, parent: str = None) -> Category:
         """Create a new category"""
         return self.category_manager.add_category(name, limit, parent)
     
+    @instrumented
     def get_categories(self) -> List[Category]:
         """Get all categories"""
         return self.category_manager.list_categories()
     
-    def get_category(self, name: str = None, category_id: int = None) -> Optional[Category]:
-        """Get a category by name or ID"""
+    @instrumented
+    def get_category(self, name: str = None, category_id: int = None) -> Optional[CategoryRow]:
+        """Get a category by name or ID, served from the category cache"""
         if name:
             return self.category_manager.get_category_by_name(name)
         elif category_id:
@@ -33,20 +265,41 @@ class BudgetAPI:
         else:
             raise ValueError("Must provide either name or category_id")
     
+    @instrumented
     def update_category(self, **kwargs) -> Category:
         """Update a category"""
         return self.category_manager.update_category( **kwargs)
     
+    @instrumented
     def delete_category(self, category_id: int, force: bool = False) -> bool:
         """Delete a category"""
         return self.category_manager.delete_category(category_id, force)
     
-    def get_category_hierarchy(self) -> Dict:
-        """Get categories in hierarchical structure"""
-        return self.category_manager.get_category_hierarchy()
+    @instrumented
+    def get_category_hierarchy(self, root: str = None) -> Dict:
+        """Get categories in hierarchical structure, optionally only the subtree below root"""
+        return self.category_manager.get_category_hierarchy(root)
+    
+    @instrumented
+    def get_category_path(self, name: str) -> List[str]:
+        """Get the category names from the top-level ancestor down to name"""
+        return self.category_manager.get_category_path(name)
+    
+    @instrumented
+    @cached_report(_subtree_period)
+    def get_subtree_totals(self, category: str, month: str = None) -> Dict:
+        """Get expense, income and transaction count for a category and all its subcategories"""
+        start_date, end_date = parse_month(month) if month else (None, None)
+        return self.category_manager.get_subtree_totals(category, start_date, end_date)
+    
+    @instrumented
+    def get_category_cache_stats(self) -> Dict:
+        """Get hit/miss counters for the category cache"""
+        return self.category_manager.cache_stats()
     
     # ===== TRANSACTION OPERATIONS =====
     
+    @instrumented
     def add_transaction(self, 
                        transaction_type: str,
                        amount: float,
@@ -55,143 +308,290 @@ class BudgetAPI:
                        note: str = None,
                        transaction_date: str = None) -> Transaction:
         """Add a new transaction using string parameters"""
-        # Convert string type to enum
-        tx_type = TransactionType.INCOME if transaction_type.lower() == 'income' else TransactionType.EXPENSE
-        
-        # Parse date if provided
-        parsed_date = None
-        if transaction_date:
-            try:
-                parsed_date = datetime.strptime(transaction_date, '%Y-%m-%d').date()
-            except ValueError:
-                raise ValueError("Date must be in YYYY-MM-DD format")
-        
+        tx_type, parsed_date = parse_transaction_args(transaction_type, transaction_date)
         return self.transaction_manager.add_transaction(
             tx_type, amount, category, vendor, note, parsed_date
         )
     
+    @instrumented
+    def add_transactions_bulk(self,
+                              rows: Iterable[Union[dict, tuple]],
+                              chunk_size: int = 1000) -> Dict:
+        """Add many transactions at once.
+
+        Rows are dicts with keys type, amount, category, vendor, note, date
+        (YYYY-MM-DD) or tuples in that order. Returns the inserted count and a
+        list of (row_index, error) pairs for rows that were skipped.
+        """
+        return self.transaction_manager.add_transactions_bulk(rows, chunk_size)
+    
+    @instrumented
+    def import_transactions(self,
+                            path: str,
+                            file_format: str = None,
+                            columns: Dict[str, str] = None,
+                            date_format: str = None,
+                            default_category: str = None,
+                            chunk_size: int = 5000,
+                            on_progress: Callable[[Dict], None] = None) -> Dict:
+        """Stream a CSV, QIF or OFX file into the database in fixed-size chunks"""
+        return importer.import_file(
+            self.transaction_manager, path, file_format, columns,
+            date_format, default_category, chunk_size, on_progress
+        )
+    
+    @instrumented
+    def export_transactions(self,
+                            path: str,
+                            file_format: str = None,
+                            compress: bool = None,
+                            batch_size: int = 10000,
+                            on_progress: Callable[[Dict], None] = None,
+                            category: str = None,
+                            start_date: str = None,
+                            end_date: str = None,
+                            month: str = None,
+                            transaction_type: str = None,
+                            vendor: str = None,
+                            include_subcategories: bool = False) -> Dict:
+        """Stream transactions with category name and path to a CSV, JSONL or columnar file.
+
+        The format defaults to the extension (.csv, .jsonl, .bcol) and a .gz
+        suffix turns on gzip. Filters are those of get_transactions. Returns
+        row count, file size and throughput.
+        """
+        filters = self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        return exporter.export_file(self.transaction_manager, path, file_format, compress,
+                                    batch_size, on_progress, **filters)
+    
+    @instrumented
     def get_transactions(self, 
                         limit: int = None,
                         category: str = None,
                         start_date: str = None,
                         end_date: str = None,
-                        month: str = None) -> List[Transaction]:
-        """Get transactions with various filters"""
-        
-        if month:
-            # Parse month format "YYYY-MM"
-            try:
-                year, month_num = map(int, month.split('-'))
-                return self.transaction_manager.get_transactions_by_month(year, month_num)
-            except ValueError:
-                raise ValueError("Month must be in YYYY-MM format")
+                        month: str = None,
+                        transaction_type: str = None,
+                        vendor: str = None,
+                        row_mode: str = 'orm',
+                        include_subcategories: bool = False):
+        """Get transactions newest first; all given filters are combined.
         
-        if category:
-            return self.transaction_manager.get_transactions_by_category(category)
-        
-        if start_date or end_date:
-            # Parse dates
-            start = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else date.min
-            end = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else date.max
-            return self.transaction_manager.get_transactions_by_date_range(start, end)
-        
-        return self.transaction_manager.list_transactions(limit)
+        row_mode 'row' returns lightweight TransactionRow tuples and 'columns'
+        a TransactionColumns batch instead of ORM Transaction objects. With
+        include_subcategories the category filter also matches every
+        subcategory below it, as one category_id IN (...) query.
+        """
+        filters = self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        return self.transaction_manager.list_transactions(limit, row_mode, **filters)
     
+    def iter_transactions(self,
+                          batch_size: int = 1000,
+                          cursor: str = None,
+                          category: str = None,
+                          start_date: str = None,
+                          end_date: str = None,
+                          month: str = None,
+                          transaction_type: str = None,
+                          vendor: str = None,
+                          row_mode: str = 'orm',
+                          include_subcategories: bool = False) -> Iterator:
+        """Stream transactions newest first without loading them all at once"""
+        filters = self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        return self.transaction_manager.iter_transactions(batch_size, cursor, row_mode, **filters)
+    
+    @instrumented
+    def get_transactions_page(self,
+                              page_size: int = 100,
+                              cursor: str = None,
+                              category: str = None,
+                              start_date: str = None,
+                              end_date: str = None,
+                              month: str = None,
+                              transaction_type: str = None,
+                              vendor: str = None,
+                              row_mode: str = 'orm',
+                              include_subcategories: bool = False) -> Dict:
+        """Get one page of transactions plus an opaque cursor for the next page"""
+        filters = self._subtree_filter(
+            parse_filters(category, start_date, end_date, month, transaction_type, vendor), include_subcategories
+        )
+        transactions, next_cursor = self.transaction_manager.get_transactions_page(
+            page_size, cursor, row_mode, **filters
+        )
+        return {'transactions': transactions, 'next_cursor': next_cursor}
+    
+    @instrumented
     def update_transaction(self, transaction_id: int, **kwargs) -> Transaction:
         """Update a transaction"""
         return self.transaction_manager.update_transaction(transaction_id, **kwargs)
     
+    @instrumented
     def delete_transaction(self, transaction_id: int) -> bool:
         """Delete a transaction"""
         return self.transaction_manager.delete_transaction(transaction_id)
     
+    @instrumented
+    def update_transactions_where(self, filters: Dict, changes: Dict, dry_run: bool = False) -> int:
+        """Apply the same changes to every transaction matching the filters, in one UPDATE.
+
+        filters take the get_transactions arguments, e.g. {'vendor': 'Shell',
+        'month': '2024-03'}; changes may set transaction_type, amount,
+        category, vendor, note and date. Returns the number of rows changed,
+        or with dry_run the number that would be.
+        """
+        filters, changes = parse_where(filters, changes)
+        return self.transaction_manager.update_transactions_where(changes, dry_run=dry_run, **filters)
+    
+    @instrumented
+    def delete_transactions_where(self, filters: Dict, dry_run: bool = False) -> int:
+        """Delete every transaction matching the get_transactions-style filters, in one DELETE.
+
+        Returns the number of rows deleted, or with dry_run the number that would be.
+        """
+        filters, _ = parse_where(filters)
+        return self.transaction_manager.delete_transactions_where(dry_run=dry_run, **filters)
+    
     # ===== REPORTING & ANALYSIS =====
     
+    @instrumented
+    @cached_report(_summary_period)
     def get_budget_summary(self, month: str = None) -> Dict:
         """Get comprehensive budget summary"""
-        # Parse month if provided
-        start_date, end_date = None, None
-        if month:
-            try:
-                year, month_num = map(int, month.split('-'))
-                start_date = date(year, month_num, 1)
-                # Get last day of month
-                if month_num == 12:
-                    end_date = date(year + 1, 1, 1)
-                else:
-                    end_date = date(year, month_num + 1, 1)
-            except ValueError:
-                raise ValueError("Month must be in YYYY-MM format")
-        
-        # Get category spending summary
-        category_summary = self.category_manager.get_category_spending_summary(
+        start_date, end_date = parse_month(month) if month else (None, None)
+        category_summary = self._reports(self.category_manager).get_category_spending_summary(
             start_date=start_date, end_date=end_date
         )
-        
-        # Get total income and expenses
-        transactions = self.get_transactions(
-            start_date=start_date.isoformat() if start_date else None,
-            end_date=end_date.isoformat() if end_date else None
-        )
-        
-        total_income = sum(t.amount for t in transactions if t.type == TransactionType.INCOME)
-        total_expenses = sum(t.amount for t in transactions if t.type == TransactionType.EXPENSE)
-        
-        # Calculate budget health
-        categories_over_budget = [name for name, data in category_summary.items() if data['over_budget']]
-        total_budget_limits = sum(data['limit'] for data in category_summary.values() if data['limit'] > 0)
-        
-        return {
-            'period': month or 'all_time',
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'net_amount': total_income - total_expenses,
-            'total_budget_limits': total_budget_limits,
-            'budget_utilization': (total_expenses / total_budget_limits * 100) if total_budget_limits > 0 else None,
-            'categories_over_budget': categories_over_budget,
-            'category_breakdown': category_summary,
-            'transaction_count': len(transactions)
-        }
+        totals = self._reports(self.transaction_manager).get_period_totals(start_date, end_date)
+        return build_budget_summary(month, category_summary, totals)
     
-    def get_spending_trends(self, months: int = 6) -> Dict:
-        """Get spending trends over the last N months"""
-        trends = {}
-        current_date = date.today()
-        
-        for i in range(months):
-            # Calculate month
-            month_date = date(current_date.year, current_date.month - i, 1) if current_date.month - i > 0 else date(current_date.year - 1, 12 - (i - current_date.month), 1)
-            month_str = month_date.strftime('%Y-%m')
-            
-            # Get transactions for this month
-            transactions = self.transaction_manager.get_transactions_by_month(month_date.year, month_date.month)
-            
-            total_expenses = sum(t.amount for t in transactions if t.type == TransactionType.EXPENSE)
-            total_income = sum(t.amount for t in transactions if t.type == TransactionType.INCOME)
-            
-            trends[month_str] = {
-                'income': total_income,
-                'expenses': total_expenses,
-                'net': total_income - total_expenses,
-                'transaction_count': len(transactions)
-            }
-        
-        return trends
+    @instrumented
+    @cached_report(_trends_period)
+    def get_spending_trends(self, months: int = 6, by_category: bool = False, as_of: str = None) -> Dict:
+        """Get spending trends over the last N months, most recent first.
+
+        All months come from a single grouped query. With by_category each
+        month also carries a 'categories' mapping of category name to its
+        income and expenses, for per-category chart series. as_of (YYYY-MM)
+        sets the newest month, by default the current one.
+        """
+        month_keys, start_date, end_date = trend_window(months, as_of)
+        rows = self._reports(self.transaction_manager).get_monthly_totals(start_date, end_date, by_category)
+        return build_trends(month_keys, rows, by_category)
+    
+    @instrumented
+    @cached_report(_span_period)
+    def get_spending_pivot(self, start_month: str = None, end_month: str = None,
+                           transaction_type: str = 'expense') -> Dict[str, Dict[str, float]]:
+        """Get {month: {category: total}} for months start_month..end_month inclusive (YYYY-MM)"""
+        start_date, end_date = parse_month_span(start_month, end_month)
+        tx_type, _ = parse_transaction_args(transaction_type)
+        return self._get_analytics().pivot(start_date, end_date, tx_type).to_dict()
+    
+    @instrumented
+    @cached_report(_rolling_period)
+    def get_rolling_spending(self, months: int = 12, window: int = 3) -> Dict[str, Dict[str, float]]:
+        """Get each category's trailing window-month average expense over the last N months.
+
+        Months without a full window inside the range are NaN.
+        """
+        _, start_date, end_date = trend_window(months + window - 1)
+        averages = self._get_analytics().rolling_average(window, start_date, end_date).to_dict()
+        return dict(list(averages.items())[window - 1:])
+    
+    @instrumented
+    @cached_report(_summary_period)
+    def get_category_percentiles(self, month: str = None,
+                                 percentiles: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, Dict[str, float]]:
+        """Get percentiles of individual expense amounts per category, keyed 'p50' etc."""
+        start_date, end_date = parse_month(month) if month else (None, None)
+        return self._get_analytics().category_percentiles(percentiles, start_date, end_date)
+    
+    @instrumented
+    @cached_report(_summary_period)
+    def get_budget_utilization(self, month: str = None) -> Dict[str, Dict]:
+        """Get spent (including subcategories) as a percentage of each category's limit"""
+        start_date, end_date = parse_month(month) if month else (None, None)
+        return self._get_analytics().budget_utilization(start_date, end_date)
+    
+    def _subtree_filter(self, filters: Dict, include_subcategories: bool) -> Dict:
+        """Replace the category filter with the ids of its whole subtree"""
+        if include_subcategories and filters.get('category') is not None:
+            filters['category_ids'] = self.category_manager.get_subtree_ids(filters.pop('category'))
+        return filters
+    
+    def _get_analytics(self) -> AnalyticsEngine:
+        """The analytics engine, created on first use when reports run on SQL"""
+        if self.analytics is None:
+            self.analytics = AnalyticsEngine(self.db)
+        return self.analytics
+    
+    def _reports(self, manager):
+        """Object answering the SQL-path report queries for the configured engine"""
+        return self.analytics if self.report_engine == 'numpy' else manager
     
     # ===== UTILITY METHODS =====
     
+    @instrumented
+    def rebuild_rollups(self) -> int:
+        """Recompute the monthly rollup table from the transactions table"""
+        return self.transaction_manager.rebuild_rollups()
+    
+    @instrumented
     def validate_category_exists(self, category_name: str) -> bool:
         """Check if a category exists"""
         return self.get_category(name=category_name) is not None
     
+    @instrumented
+    @cached_report(_all_time)
     def get_quick_stats(self) -> Dict:
         """Get quick overview stats"""
         categories = self.get_categories()
-        transactions = self.get_transactions(limit=1000)  # Last 1000 transactions
+        month_start = date.today().replace(day=1)
         
         return {
             'total_categories': len(categories),
-            'total_transactions': len(transactions),
+            'total_transactions': self.transaction_manager.count_transactions(),
             'categories_with_limits': len([c for c in categories if c.limit_amount > 0]),
-            'recent_transaction_count': len([t for t in transactions if t.date >= date.today().replace(day=1)]),  # This month
-        }
\ No newline at end of file
+            'recent_transaction_count': self.transaction_manager.count_transactions(start_date=month_start),  # This month
+        }
+    
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Get per-method latency, SQL statement, row and session histograms"""
+        if self.metrics is None:
+            raise ValueError("Instrumentation is not enabled, create BudgetAPI(instrument=True)")
+        return self.metrics.snapshot()
+    
+    def get_report_cache_stats(self) -> Dict:
+        """Get hit rate, entry count and approximate memory of the report cache"""
+        if self.report_cache is None:
+            raise ValueError("Report caching is not enabled, create BudgetAPI(cache_reports=True)")
+        return self.report_cache.stats()
+    
+    def clear_report_cache(self) -> None:
+        """Drop every cached report"""
+        if self.report_cache is not None:
+            self.report_cache.clear()
+    
+    def get_budget_alerts(self) -> List[BudgetAlert]:
+        """Get and clear the threshold crossings recorded since the last call"""
+        if self.alerts is None:
+            raise ValueError("Budget alerts are not enabled, create BudgetAPI(alert_thresholds=(80, 100))")
+        return self.alerts.drain()
+    
+    @instrumented
+    def get_budget_status(self, month: str = None) -> Dict[str, Dict]:
+        """Get spend, limit and utilization % per limited category from the alert state.
+
+        month defaults to the current month.
+        """
+        if self.alerts is None:
+            raise ValueError("Budget alerts are not enabled, create BudgetAPI(alert_thresholds=(80, 100))")
+        month_start = parse_month(month)[0] if month else date.today()
+        return self.alerts.status(month_start.year, month_start.month)
@@ -0,0 +1,85 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import Union
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from db.db import DB_PATH_ENV, DB_PROFILE_ENV, ENGINE_PROFILES
+from db.models.base import Base
+from db.models import category, transaction, monthly_category_total  # noqa: F401 - register tables on Base.metadata
+from db.models.enums import DBFile
+from db import rollups
+
+try:
+    import aiosqlite  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    aiosqlite = None
+
+
+class AsyncDB:
+    """Async counterpart of DB, backed by SQLAlchemy's asyncio extension and aiosqlite.
+
+    Accepts the same db_file/profile arguments and environment overrides as
+    DB. The in-memory profile is not supported because aiosqlite runs each
+    connection on its own thread.
+    """
+
+    def __init__(self, db_file: Union[DBFile, str, Path] = None, profile: str = None):
+        if aiosqlite is None:
+            raise ImportError("AsyncDB requires aiosqlite, install it with `pip install aiosqlite`")
+
+        if db_file is None:
+            db_file = os.environ.get(DB_PATH_ENV) or DBFile.MAIN
+        if isinstance(db_file, DBFile):
+            db_file = db_file.value
+        profile = profile or os.environ.get(DB_PROFILE_ENV) or 'tuned'
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB profile '{profile}', use one of {', '.join(ENGINE_PROFILES)}")
+        engine_profile = ENGINE_PROFILES[profile]
+        if engine_profile.in_memory:
+            raise ValueError("AsyncDB does not support the in-memory profile")
+
+        self.db_file = Path(db_file)
+        self.profile = profile
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_file}", echo=False,
+                                          pool_size=engine_profile.pool_size,
+                                          max_overflow=engine_profile.max_overflow)
+
+        @event.listens_for(self.engine.sync_engine, 'connect')
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in engine_profile.pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        self.session_factory = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        self._schema_ready = False
+        self._schema_lock = asyncio.Lock()
+
+    async def Session(self) -> AsyncSession:
+        """Open a new session, creating the schema on first use"""
+        if not self._schema_ready:
+            await self.ensure_schema()
+        return self.session_factory()
+
+    async def ensure_schema(self):
+        """Create missing tables and indexes, seeding rollups for older files"""
+        async with self._schema_lock:
+            if self._schema_ready:
+                return
+            async with self.engine.begin() as connection:
+                await connection.run_sync(self._sync_schema)
+            self._schema_ready = True
+
+    @staticmethod
+    def _sync_schema(connection):
+        has_rollups = inspect(connection).has_table(monthly_category_total.MonthlyCategoryTotal.__tablename__)
+        Base.metadata.create_all(connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        if not has_rollups:
+            rollups.rebuild(connection)
+
+    async def dispose(self):
+        await self.engine.dispose()
@@ -1,12 +1,144 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Union
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker, Session as saSession
+from sqlalchemy.pool import QueuePool
 from db.models.base import Base
+from db.models import category, transaction, monthly_category_total  # noqa: F401 - register tables on Base.metadata
 from db.models.enums import DBFile
+from db import rollups
+
+# Environment overrides for DB instances created without explicit arguments
+DB_PATH_ENV = "BUDGET_DB_PATH"
+DB_PROFILE_ENV = "BUDGET_DB_PROFILE"
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """SQLite connection settings applied to every pooled connection"""
+    pragmas: Dict[str, Union[str, int]] = field(default_factory=dict)
+    pool_size: int = 5
+    max_overflow: int = 10
+    in_memory: bool = False
+
+
+ENGINE_PROFILES = {
+    # SQLite defaults: rollback journal, readers block writers
+    'default': EngineProfile(),
+    # WAL lets readers run alongside the writer; NORMAL sync is durable in WAL
+    # except for the last commits on power loss
+    'tuned': EngineProfile(
+        pragmas={
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,  # KiB
+            'temp_store': 'MEMORY',
+            'busy_timeout': 5000,
+        },
+        pool_size=8,
+        max_overflow=16,
+    ),
+    # Private shared-cache in-memory database, gone when the DB is disposed.
+    # Shared cache locks per table, so it suits tests and single-writer tools
+    # rather than concurrent writers
+    'memory': EngineProfile(
+        pragmas={'temp_store': 'MEMORY', 'busy_timeout': 5000},
+        pool_size=8,
+        max_overflow=16,
+        in_memory=True,
+    ),
+}
+
 
 class DB:
-    def __init__(self, db_file: DBFile = DBFile.MAIN):
-        self.engine = create_engine(f"sqlite:///{db_file.value}", echo=False)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+    """Engine and session factory for one ledger database.
+
+    db_file defaults to $BUDGET_DB_PATH, then DBFile.MAIN; profile defaults to
+    $BUDGET_DB_PROFILE, then 'tuned'. The schema is created on the first
+    session rather than at construction, so importing this module touches no
+    files.
+    """
+
+    def __init__(self, db_file: Union[DBFile, str, Path] = None, profile: str = None):
+        if db_file is None:
+            db_file = os.environ.get(DB_PATH_ENV) or DBFile.MAIN
+        if isinstance(db_file, DBFile):
+            db_file = db_file.value
+        profile = profile or os.environ.get(DB_PROFILE_ENV) or 'tuned'
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB profile '{profile}', use one of {', '.join(ENGINE_PROFILES)}")
+
+        self.db_file = Path(db_file)
+        self.profile = profile
+        self.engine = self._create_engine(ENGINE_PROFILES[profile])
+        self.session_factory = sessionmaker(bind=self.engine)
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _create_engine(self, profile: EngineProfile):
+        if profile.in_memory:
+            # Every pooled connection must see the same database, so use a
+            # named shared-cache URI and keep one connection open as an anchor
+            url = f"sqlite:///file:budget_mem_{id(self)}?mode=memory&cache=shared&uri=true"
+        else:
+            url = f"sqlite:///{self.db_file}"
+        engine = create_engine(url, echo=False,
+                               poolclass=QueuePool,
+                               pool_size=profile.pool_size,
+                               max_overflow=profile.max_overflow,
+                               connect_args={'check_same_thread': False})
+
+        @event.listens_for(engine, 'connect')
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in profile.pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        if profile.in_memory:
+            self._memory_anchor = engine.raw_connection()
+        return engine
+
+    def Session(self) -> saSession:
+        """Open a new session, creating the schema on first use"""
+        if not self._schema_ready:
+            self.ensure_schema()
+        return self.session_factory()
+
+    def ensure_schema(self):
+        """Create missing tables and indexes, seeding rollups for older files"""
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            has_rollups = inspect(self.engine).has_table(monthly_category_total.MonthlyCategoryTotal.__tablename__)
+            Base.metadata.create_all(self.engine)
+            self.migrate()
+            if not has_rollups:
+                # Databases created before the rollup table existed need it seeded
+                with self.engine.begin() as connection:
+                    rollups.rebuild(connection)
+            self._schema_ready = True
+
+    def migrate(self):
+        """Bring an existing database file up to the current schema.
+
+        create_all only creates missing tables, so indexes added to existing
+        tables are created here.
+        """
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
+    def dispose(self):
+        """Close pooled connections (and drop an in-memory database)"""
+        anchor = getattr(self, '_memory_anchor', None)
+        if anchor is not None:
+            anchor.close()
+            self._memory_anchor = None
+        self.engine.dispose()
 
 db_instance = DB()  # Singleton instance
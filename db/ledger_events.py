@@ -0,0 +1,105 @@
+import logging
+import threading
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+from db.rollups import RollupDeltas
+
+# Event kinds passed to listeners
+TRANSACTIONS = 'transactions'  # deltas name every (year, month, category, type) bucket touched
+CATEGORIES = 'categories'  # names, limits or parents changed; deltas is None
+ALL = 'all'  # anything may have changed (e.g. rollups rebuilt); deltas is None
+
+Listener = Callable[[str, Optional[RollupDeltas], int], None]
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerEvents:
+    """Write-version counter and change feed for one ledger database.
+
+    Managers call the *_changed methods after each committed write. Every
+    write bumps `version`; transaction writes also record the version per
+    (year, month) they touched, so readers can ask whether anything in a date
+    range changed since a version they saw. Writes made by other processes
+    are not seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.reset_version = 0  # last CATEGORIES or ALL change
+        self.month_versions = {}  # type: Dict[Tuple[int, int], int]
+        self._listeners = []  # type: List[Listener]
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call listener(kind, deltas, version) after every committed write; its exceptions are logged.
+
+        version is the one the write was given. Writes may be notified out of
+        order when several threads write at once.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def transactions_changed(self, deltas: RollupDeltas) -> None:
+        if not deltas:
+            return
+        with self._lock:
+            self.version += 1
+            version = self.version
+            for year, month, _, _ in deltas:
+                self.month_versions[(year, month)] = version
+        self._notify(TRANSACTIONS, deltas, version)
+
+    def categories_changed(self) -> None:
+        self._notify(CATEGORIES, None, self._reset())
+
+    def all_changed(self) -> None:
+        self._notify(ALL, None, self._reset())
+
+    def _reset(self) -> int:
+        with self._lock:
+            self.version += 1
+            self.reset_version = self.version
+            return self.version
+
+    def _notify(self, kind: str, deltas: Optional[RollupDeltas], version: int) -> None:
+        # The write is already committed, so a failing listener must not
+        # surface as a failed write (or stop the listeners after it)
+        for listener in list(self._listeners):
+            try:
+                listener(kind, deltas, version)
+            except Exception:
+                logger.exception("Ledger event listener %r failed", listener)
+
+    def changed_since(self, version: int, start_date: date = None, end_date: date = None) -> bool:
+        """True if a write after `version` touched [start_date, end_date) or any category"""
+        if self.version == version:
+            return False
+        if self.reset_version > version:
+            return True
+        first = start_date.year * 12 + start_date.month if start_date else None
+        # Half-open: a month only counts if it starts before end_date
+        last = end_date.year * 12 + end_date.month - (end_date.day == 1) if end_date else None
+        for (year, month), month_version in list(self.month_versions.items()):
+            if month_version <= version:
+                continue
+            key = year * 12 + month
+            if (first is None or key >= first) and (last is None or key <= last):
+                return True
+        return False
+
+
+_events_lock = threading.Lock()
+
+
+def get_ledger_events(db) -> LedgerEvents:
+    """Return the event feed shared by all managers of a DB instance, creating it on first use"""
+    with _events_lock:
+        events = getattr(db, 'ledger_events', None)
+        if events is None:
+            events = db.ledger_events = LedgerEvents()
+        return events
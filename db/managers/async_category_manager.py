@@ -0,0 +1,177 @@
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from db.async_db import AsyncDB
+from db.managers.category_cache import CATEGORY_SELECT, CategorySnapshot, get_category_cache
+from db.managers.category_manager import CategoryManager
+from db.ledger_events import get_ledger_events
+from db.models.category import Category
+from db.models.rows import CategoryRow
+
+
+class AsyncCategoryManager:
+    """asyncio version of CategoryManager with the same method surface"""
+
+    def __init__(self, db: AsyncDB):
+        self.Session = db.Session
+        self.cache = get_category_cache(db)
+        self.events = get_ledger_events(db)
+
+    async def snapshot(self) -> CategorySnapshot:
+        """Return the cached category snapshot, loading it if stale"""
+        snapshot = self.cache.peek()
+        if snapshot is not None:
+            return snapshot
+        # A category write committing while the query awaits bumps the
+        # generation, and fill() then keeps these rows out of the cache
+        generation = self.cache.generation
+        session = await self.Session()
+        try:
+            rows = (await session.execute(CATEGORY_SELECT)).all()
+        finally:
+            await session.close()
+        return self.cache.fill(rows, generation)
+
+    async def add_category(self, name: str, limit_amount: float = 0, parent_name: str = None) -> Category:
+        parent_id = None
+        if parent_name:
+            parent_id = (await self.snapshot()).get_id(parent_name)
+            if parent_id is None:
+                raise ValueError(f"Parent category '{parent_name}' not found")
+
+        session = await self.Session()
+        try:
+            category = Category(name=name, limit_amount=limit_amount, parent_id=parent_id)
+            session.add(category)
+            await session.commit()
+            self.cache.invalidate()
+            self.events.categories_changed()
+            return category
+        except IntegrityError:
+            await session.rollback()
+            raise ValueError(f"Category '{name}' already exists")
+        finally:
+            await session.close()
+
+    async def update_category(self, **kwargs) -> Category:
+        category_id = kwargs.pop('category_id', None)
+        category_name = kwargs.pop('category_name', None)
+        if not category_id and not category_name:
+            raise ValueError("Must provide category_id or category_name")
+
+        allowed_fields = ["name", "parent", "limit_amount"]
+        for k in kwargs:
+            if k not in allowed_fields:
+                raise ValueError(f"Key of {k} not in allowed_fields, update name, parent, or limit_amount")
+        updates = {k: v for k, v in kwargs.items() if v is not None}
+        if not updates:
+            raise ValueError(f"no valid fields provided for update")
+
+        session = await self.Session()
+        try:
+            if category_id:
+                category = await session.get(Category, category_id)
+                if not category:
+                    raise ValueError(f"Category with id: {category_id} not found")
+            else:
+                category = (await session.execute(
+                    select(Category).where(Category.name == category_name)
+                )).scalar_one_or_none()
+                if not category:
+                    raise ValueError(f"Category with name: {category_name} not found")
+
+            for k, v in updates.items():
+                setattr(category, k, v)
+            await session.commit()
+            self.cache.invalidate()
+            self.events.categories_changed()
+            return category
+        except IntegrityError:
+            await session.rollback()
+            raise ValueError(f"Category name must be unique")
+        finally:
+            await session.close()
+
+    async def delete_category(self, category_id: int, force: bool = False) -> bool:
+        """Delete a category by ID; see CategoryManager.delete_category"""
+        snapshot = await self.snapshot()
+        category = snapshot.get(category_id)
+        if category is None:
+            return False
+
+        session = await self.Session()
+        try:
+            has_transactions = (await session.execute(
+                CategoryManager._has_transactions_select(category_id)
+            )).scalar()
+            has_children = bool(snapshot.children_of(category_id))
+            if (has_transactions or has_children) and not force:
+                raise ValueError(f"Category '{category.name}' has transactions or subcategories, use force=True")
+
+            for stmt in CategoryManager._delete_category_statements(category):
+                await session.execute(stmt)
+            await session.commit()
+            self.events.all_changed()
+            return True
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+            self.cache.invalidate()
+
+    async def get_category_by_name(self, name: str) -> Optional[CategoryRow]:
+        return (await self.snapshot()).get_by_name(name)
+
+    async def get_category_by_id(self, category_id: int) -> Optional[CategoryRow]:
+        return (await self.snapshot()).get(category_id)
+
+    async def get_category_hierarchy(self, root: str = None) -> Dict[str, Dict]:
+        snapshot = await self.snapshot()
+        return snapshot.hierarchy(CategoryManager._require_id(snapshot, root) if root else None)
+
+    async def get_subtree_ids(self, name: str) -> List[int]:
+        snapshot = await self.snapshot()
+        return snapshot.descendants(CategoryManager._require_id(snapshot, name))
+
+    async def get_category_path(self, name: str) -> List[str]:
+        snapshot = await self.snapshot()
+        category_id = CategoryManager._require_id(snapshot, name)
+        return [snapshot.by_id[node].name for node in snapshot.ancestors(category_id) + [category_id]]
+
+    async def get_subtree_totals(self, name: str, start_date: date = None, end_date: date = None) -> Dict:
+        """Get expense, income and count for a category including its descendants"""
+        snapshot = await self.snapshot()
+        category_ids = snapshot.descendants(CategoryManager._require_id(snapshot, name))
+        session = await self.Session()
+        try:
+            expense, income, count = (await session.execute(
+                CategoryManager._subtree_totals_select(category_ids, start_date, end_date)
+            )).one()
+        finally:
+            await session.close()
+        return CategoryManager._shape_subtree_totals(snapshot, name, category_ids, expense, income, count)
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+
+    async def list_categories(self) -> List[Category]:
+        session = await self.Session()
+        try:
+            return list((await session.execute(select(Category))).scalars())
+        finally:
+            await session.close()
+
+    async def get_category_spending_summary(self,
+                                            start_date: date = None,
+                                            end_date: date = None) -> Dict[str, Dict]:
+        """Get spending against limits for every category in one query"""
+        session = await self.Session()
+        try:
+            rows = (await session.execute(
+                CategoryManager._spending_summary_select(start_date, end_date)
+            )).all()
+        finally:
+            await session.close()
+        return CategoryManager._summarize_spending(rows)
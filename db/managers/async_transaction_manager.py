@@ -0,0 +1,330 @@
+from datetime import date
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.async_db import AsyncDB
+from db import rollups
+from db.managers.category_cache import get_category_cache
+from db.ledger_events import get_ledger_events
+from db.managers.async_category_manager import AsyncCategoryManager
+from db.managers.transaction_manager import TransactionManager, build_filters, encode_cursor
+from db.models.transaction import Transaction
+from db.models.enums import TransactionType
+from db.models.rows import TransactionColumns, TransactionRow
+
+
+class AsyncTransactionManager:
+    """asyncio version of TransactionManager with the same method surface.
+
+    Statements and result shaping are shared with TransactionManager; only
+    the session handling differs. Rollup maintenance and chunked inserts run
+    on the sync connection through run_sync.
+    """
+
+    def __init__(self, db: AsyncDB):
+        self.Session = db.Session
+        self.category_cache = get_category_cache(db)
+        self.events = get_ledger_events(db)
+        self._categories = AsyncCategoryManager(db)
+
+    async def add_transaction(self,
+                              transaction_type: TransactionType,
+                              amount: float,
+                              category_name: str,
+                              vendor: str = None,
+                              note: str = None,
+                              transaction_date: date = None) -> Transaction:
+        """Add a new transaction to the database"""
+        category_id = (await self._categories.snapshot()).get_id(category_name)
+        if category_id is None:
+            raise ValueError(f"Category '{category_name}' not found")
+
+        session = await self.Session()  # type: AsyncSession
+        try:
+            transaction = Transaction(
+                type=transaction_type,
+                amount=amount,
+                category_id=category_id,
+                vendor=vendor,
+                note=note,
+                date=transaction_date or date.today()
+            )
+            session.add(transaction)
+            deltas = {}
+            rollups.add_delta(deltas, transaction.date, category_id, transaction_type, amount, 1)
+            connection = await session.connection()
+            await connection.run_sync(rollups.apply_deltas, deltas)
+            await session.commit()
+            self.events.transactions_changed(deltas)
+            return transaction
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
+    async def add_transactions_bulk(self,
+                                    rows: Iterable[Union[dict, tuple]],
+                                    chunk_size: int = 1000) -> Dict:
+        """Insert many transactions inside a single database transaction.
+
+        See TransactionManager.add_transactions_bulk for the row format.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        category_ids = dict((await self._categories.snapshot()).by_name)
+        session = await self.Session()  # type: AsyncSession
+        inserted = 0
+        errors = []
+        deltas = {}
+        try:
+            today = date.today()
+            chunk = []
+            for index, row in enumerate(rows):
+                try:
+                    chunk.append(TransactionManager._build_bulk_row(row, category_ids, today))
+                except (ValueError, TypeError, KeyError) as e:
+                    errors.append((index, str(e)))
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    rollups.merge_deltas(deltas, await session.run_sync(TransactionManager._insert_chunk, chunk))
+                    inserted += len(chunk)
+                    chunk = []
+
+            if chunk:
+                rollups.merge_deltas(deltas, await session.run_sync(TransactionManager._insert_chunk, chunk))
+                inserted += len(chunk)
+
+            await session.commit()
+            self.events.transactions_changed(deltas)
+            return {'inserted': inserted, 'errors': errors}
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
+    async def list_transactions(self, limit: int = None, row_mode: str = 'orm', **filters):
+        """Get transactions newest first; see TransactionManager.list_transactions"""
+        stmt = TransactionManager._keyset_select(row_mode, None, filters)
+        if limit:
+            stmt = stmt.limit(limit)
+
+        session = await self.Session()
+        try:
+            return await self._fetch(session, stmt, row_mode)
+        finally:
+            await session.close()
+
+    async def count_transactions(self, **filters) -> int:
+        """Count transactions matching the filters without loading them"""
+        session = await self.Session()
+        try:
+            stmt = select(func.count(Transaction.id)).where(*build_filters(**filters))
+            return (await session.execute(stmt)).scalar()
+        finally:
+            await session.close()
+
+    async def iter_transactions(self,
+                                batch_size: int = 1000,
+                                cursor: str = None,
+                                row_mode: str = 'orm',
+                                **filters) -> AsyncIterator:
+        """Stream matching transactions newest first, batch_size rows per fetch"""
+        stmt = TransactionManager._keyset_select(row_mode, cursor, filters)
+        session = await self.Session()
+        try:
+            result = await session.stream(stmt, execution_options={'yield_per': batch_size})
+            if row_mode == 'orm':
+                async for transaction in result.scalars():
+                    yield transaction
+            else:
+                async for partition in result.partitions():
+                    if row_mode == 'row':
+                        for row in partition:
+                            yield TransactionRow._make(row)
+                    else:
+                        yield TransactionColumns.from_rows(partition)
+        finally:
+            await session.close()
+
+    async def get_transactions_page(self,
+                                    page_size: int = 100,
+                                    cursor: str = None,
+                                    row_mode: str = 'orm',
+                                    **filters) -> Tuple[list, Optional[str]]:
+        """Get one keyset page and the next cursor; see TransactionManager.get_transactions_page"""
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        stmt = TransactionManager._keyset_select(row_mode, cursor, filters).limit(page_size + 1)
+        session = await self.Session()
+        try:
+            rows = await self._fetch(session, stmt, 'orm' if row_mode == 'orm' else 'row')
+        finally:
+            await session.close()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+        if row_mode == 'columns':
+            rows = TransactionColumns.from_rows(rows)
+        return rows, next_cursor
+
+    @staticmethod
+    async def _fetch(session: AsyncSession, stmt, row_mode: str):
+        result = await session.execute(stmt)
+        if row_mode == 'orm':
+            return result.scalars().all()
+        if row_mode == 'row':
+            return list(map(TransactionRow._make, result))
+        return TransactionColumns.from_rows(result)
+
+    async def get_transactions_by_category(self, category_name: str, row_mode: str = 'orm'):
+        return await self.list_transactions(row_mode=row_mode, category=category_name)
+
+    async def get_transactions_by_date_range(self, start_date: date, end_date: date, row_mode: str = 'orm'):
+        return await self.list_transactions(row_mode=row_mode, start_date=start_date, end_date=end_date)
+
+    async def get_transactions_by_month(self, year: int, month: int, row_mode: str = 'orm'):
+        return await self.list_transactions(row_mode=row_mode, month=(year, month))
+
+    async def update_transaction(self, transaction_id: int, **kwargs) -> Transaction:
+        """Update a transaction with new values"""
+        session = await self.Session()
+        try:
+            transaction = await session.get(Transaction, transaction_id)
+            if not transaction:
+                raise ValueError(f"Transaction with id {transaction_id} not found")
+
+            deltas = {}
+            rollups.add_delta(deltas, transaction.date, transaction.category_id,
+                              transaction.type, -transaction.amount, -1)
+
+            allowed_fields = ['amount', 'vendor', 'note', 'date', 'category_id']
+            for key, value in kwargs.items():
+                if key in allowed_fields and value is not None:
+                    setattr(transaction, key, value)
+
+            rollups.add_delta(deltas, transaction.date, transaction.category_id,
+                              transaction.type, transaction.amount, 1)
+            await session.flush()
+            connection = await session.connection()
+            await connection.run_sync(rollups.apply_deltas, deltas)
+            await session.commit()
+            self.events.transactions_changed(deltas)
+            return transaction
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
+    async def delete_transaction(self, transaction_id: int) -> bool:
+        """Delete a transaction by ID"""
+        session = await self.Session()
+        try:
+            transaction = await session.get(Transaction, transaction_id)
+            if not transaction:
+                return False
+
+            deltas = {}
+            rollups.add_delta(deltas, transaction.date, transaction.category_id,
+                              transaction.type, -transaction.amount, -1)
+            await session.delete(transaction)
+            connection = await session.connection()
+            await connection.run_sync(rollups.apply_deltas, deltas)
+            await session.commit()
+            self.events.transactions_changed(deltas)
+            return True
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
+    async def update_transactions_where(self, changes: Dict, dry_run: bool = False, **filters) -> int:
+        """Apply the same changes to every matching transaction in one UPDATE"""
+        clauses = TransactionManager._where_clauses(filters)
+        values = TransactionManager._where_values(changes, await self._categories.snapshot())
+        session = await self.Session()
+        try:
+            connection = await session.connection()
+            if dry_run:
+                return await connection.run_sync(TransactionManager._count_where, clauses)
+            updated, deltas = await connection.run_sync(TransactionManager._update_where, clauses, values)
+            await session.commit()
+            self.events.transactions_changed(deltas)
+            return updated
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
+    async def delete_transactions_where(self, dry_run: bool = False, **filters) -> int:
+        """Delete every matching transaction in one DELETE"""
+        clauses = TransactionManager._where_clauses(filters)
+        session = await self.Session()
+        try:
+            connection = await session.connection()
+            if dry_run:
+                return await connection.run_sync(TransactionManager._count_where, clauses)
+            deleted, deltas = await connection.run_sync(TransactionManager._delete_where, clauses)
+            await session.commit()
+            self.events.transactions_changed(deltas)
+            return deleted
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
+    async def get_spending_summary_by_category(self, start_date: date = None, end_date: date = None) -> dict:
+        """Get expense totals per category name, dates inclusive"""
+        session = await self.Session()
+        try:
+            rows = (await session.execute(
+                TransactionManager._spending_summary_select(start_date, end_date)
+            )).all()
+            return {category_name: total for category_name, total in rows if total > 0}
+        finally:
+            await session.close()
+
+    async def get_period_totals(self, start_date: date = None, end_date: date = None) -> Dict:
+        """Get income, expense and transaction count for [start_date, end_date)"""
+        session = await self.Session()
+        try:
+            rows = (await session.execute(
+                TransactionManager._period_totals_select(start_date, end_date)
+            )).all()
+            return TransactionManager._shape_period_totals(rows)
+        finally:
+            await session.close()
+
+    async def get_monthly_totals(self, start_date: date, end_date: date, by_category: bool = False) -> List[Tuple]:
+        """Get per-month totals for the whole months in [start_date, end_date)"""
+        session = await self.Session()
+        try:
+            stmt = TransactionManager._monthly_totals_select(start_date, end_date, by_category)
+            return [tuple(row) for row in await session.execute(stmt)]
+        finally:
+            await session.close()
+
+    async def rebuild_rollups(self) -> int:
+        """Recompute the monthly_category_totals table from scratch"""
+        session = await self.Session()
+        try:
+            connection = await session.connection()
+            buckets = await connection.run_sync(rollups.rebuild)
+            await session.commit()
+            self.events.all_changed()
+            return buckets
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
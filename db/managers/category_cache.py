@@ -0,0 +1,257 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import select
+from db.models.category import Category
+from db.models.rows import CategoryRow
+
+# Columns loaded into the cache, in CategoryRow order
+CATEGORY_SELECT = select(Category.id, Category.name, Category.limit_amount, Category.parent_id)
+
+
+class CategorySnapshot:
+    """Immutable view of the categories table at one point in time.
+
+    Besides the name, id and parent -> children maps, the tree is indexed
+    once in preorder: every category's descendants sit in one contiguous
+    slice of `preorder` (a nested-set interval), so subtree lookups and
+    ancestor checks need no walking. Categories whose parent is missing are
+    treated as top level, and a parent_id cycle is cut where it is entered.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        self.by_name = {}  # type: Dict[str, int]
+        self.by_id = {}  # type: Dict[int, CategoryRow]
+        self.children = {}  # type: Dict[Optional[int], List[int]]
+        for category_id, name, limit_amount, parent_id in rows:
+            category = CategoryRow(category_id, name, limit_amount or 0, parent_id)
+            self.by_name[name] = category_id
+            self.by_id[category_id] = category
+            self.children.setdefault(parent_id, []).append(category_id)
+        self._index()
+
+    def _index(self) -> None:
+        """Build preorder, the parent within the indexed tree, depth and subtree spans"""
+        self.preorder = []  # type: List[int]
+        self.parent = {}  # type: Dict[int, Optional[int]]
+        self.depth = {}  # type: Dict[int, int]
+        roots = [category_id for category_id, category in self.by_id.items()
+                 if category.parent_id not in self.by_id]
+        # The second pass only finds categories on a parent_id cycle
+        for root in roots + list(self.by_id):
+            if root in self.depth:
+                continue
+            self.parent[root] = None
+            self.depth[root] = 0
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                self.preorder.append(node)
+                for child in reversed(self.children.get(node, ())):
+                    if child not in self.depth:
+                        self.parent[child] = node
+                        self.depth[child] = self.depth[node] + 1
+                        stack.append(child)
+
+        sizes = dict.fromkeys(self.preorder, 1)
+        for node in reversed(self.preorder):
+            parent = self.parent[node]
+            if parent is not None:
+                sizes[parent] += sizes[node]
+        self.span = {}  # type: Dict[int, tuple]
+        for position, node in enumerate(self.preorder):
+            self.span[node] = (position, position + sizes[node])
+
+    def get_id(self, name: str) -> Optional[int]:
+        return self.by_name.get(name)
+
+    def get(self, category_id: int) -> Optional[CategoryRow]:
+        return self.by_id.get(category_id)
+
+    def get_by_name(self, name: str) -> Optional[CategoryRow]:
+        category_id = self.by_name.get(name)
+        return self.by_id.get(category_id) if category_id is not None else None
+
+    def children_of(self, parent_id: Optional[int]) -> List[int]:
+        """Ids of the direct subcategories of parent_id (None for top level)"""
+        return list(self.children.get(parent_id, ()))
+
+    def descendants(self, category_id: int, include_self: bool = True) -> List[int]:
+        """Ids in the subtree under category_id, in preorder"""
+        start, end = self.span[category_id]
+        return self.preorder[start if include_self else start + 1:end]
+
+    def ancestors(self, category_id: int) -> List[int]:
+        """Ids from the top-level ancestor down to category_id's parent"""
+        chain = []
+        node = self.parent[category_id]
+        while node is not None:
+            chain.append(node)
+            node = self.parent[node]
+        chain.reverse()
+        return chain
+
+    def is_descendant(self, category_id: int, ancestor_id: int) -> bool:
+        """True if category_id is ancestor_id or sits anywhere below it"""
+        start, end = self.span[ancestor_id]
+        return start <= self.span[category_id][0] < end
+
+    def path(self, category_id: int, separator: str = ' > ') -> str:
+        """Names from the top-level ancestor down to category_id, joined by separator"""
+        return separator.join(self.by_id[node].name for node in self.ancestors(category_id) + [category_id])
+
+    def paths(self, separator: str = ' > ') -> Dict[int, str]:
+        """category id -> names from its top-level ancestor down, joined by separator"""
+        paths = {}
+        for node in self.preorder:
+            parent = self.parent[node]
+            name = self.by_id[node].name
+            paths[node] = name if parent is None else paths[parent] + separator + name
+        return paths
+
+    def roll_up(self, values: Dict[int, Sequence[float]], width: int) -> Dict[int, List[float]]:
+        """Subtree sums: each category's `width` values plus those of all its descendants.
+
+        One pass over the preorder in reverse adds every category into its
+        parent, so the cost is linear in the number of categories.
+        """
+        totals = {node: list(values.get(node, (0,) * width)) for node in self.preorder}
+        for node in reversed(self.preorder):
+            parent = self.parent[node]
+            if parent is not None:
+                parent_totals, node_totals = totals[parent], totals[node]
+                for i in range(width):
+                    parent_totals[i] += node_totals[i]
+        return totals
+
+    def hierarchy(self, parent_id: Optional[int] = None) -> Dict[str, Dict]:
+        """Nested dicts keyed by category name below parent_id.
+
+        Built in one pass over the preorder without recursion, so deep trees are fine.
+        """
+        if parent_id is None:
+            # Starts every indexed root at the top level, orphans and cut cycles included
+            members = self.preorder
+        elif parent_id in self.span:
+            members = self.descendants(parent_id, include_self=False)
+        else:
+            return {}
+
+        tree = {}
+        nodes = {}
+        for node in members:
+            category = self.by_id[node]
+            entry = nodes[node] = {
+                'id': category.id,
+                'limit_amount': category.limit_amount,
+                'subcategories': {},
+            }
+            parent = self.parent[node]
+            siblings = nodes[parent]['subcategories'] if parent in nodes else tree
+            siblings[category.name] = entry
+        return tree
+
+class CategoryCache:
+    """In-process snapshot of the categories table.
+
+    The whole table is loaded with one query on first use and kept as a
+    CategorySnapshot (name -> id, id -> CategoryRow and parent_id -> child ids
+    maps) until invalidate() is called. CategoryManager invalidates it after
+    every category write; writes made by other processes are not seen until then.
+    Each invalidate() bumps `generation`, so a load that started before a
+    write is returned to its caller but never installed.
+    """
+
+    def __init__(self, session_factory):
+        self.Session = session_factory
+        self._lock = threading.RLock()
+        self._snapshot = None  # type: Optional[CategorySnapshot]
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def snapshot(self) -> CategorySnapshot:
+        """Return the current snapshot, querying the table if it is stale"""
+        snapshot = self.peek()
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            generation = self.generation
+            session = self.Session()
+            try:
+                rows = session.execute(CATEGORY_SELECT).all()
+            finally:
+                session.close()
+            return self.fill(rows, generation)
+
+    def peek(self) -> Optional[CategorySnapshot]:
+        """Return the snapshot if it is loaded, without querying"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self.hits += 1
+        return snapshot
+
+    def fill(self, rows: Iterable[tuple], generation: int) -> CategorySnapshot:
+        """Install a snapshot built from CATEGORY_SELECT rows loaded by the caller.
+
+        generation is the value read before the rows were queried; if the
+        cache was invalidated since, the snapshot is returned but not stored.
+        """
+        snapshot = CategorySnapshot(rows)
+        with self._lock:
+            self.misses += 1
+            if generation == self.generation:
+                self._snapshot = snapshot
+        return snapshot
+
+    def get_id(self, name: str) -> Optional[int]:
+        """Resolve a category name to its id"""
+        return self.snapshot().get_id(name)
+
+    def get(self, category_id: int) -> Optional[CategoryRow]:
+        return self.snapshot().get(category_id)
+
+    def get_by_name(self, name: str) -> Optional[CategoryRow]:
+        return self.snapshot().get_by_name(name)
+
+    def name_map(self) -> Dict[str, int]:
+        """Copy of the name -> id map"""
+        return dict(self.snapshot().by_name)
+
+    def all(self) -> List[CategoryRow]:
+        return list(self.snapshot().by_id.values())
+
+    def children_of(self, parent_id: Optional[int]) -> List[int]:
+        """Ids of the direct subcategories of parent_id (None for top level)"""
+        return self.snapshot().children_of(parent_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        snapshot = self._snapshot
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'invalidations': self.invalidations,
+            'categories': len(snapshot.by_id) if snapshot is not None else 0,
+        }
+
+
+_caches_lock = threading.Lock()
+
+
+def get_category_cache(db) -> CategoryCache:
+    """Return the cache shared by all managers of a DB instance, creating it on first use"""
+    with _caches_lock:
+        cache = getattr(db, 'category_cache', None)
+        if cache is None:
+            cache = db.category_cache = CategoryCache(db.Session)
+        return cache
@@ -1,24 +1,38 @@
-from typing import List
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy import case, delete, func, select, update
 from sqlalchemy.exc import IntegrityError
-from db.db import db_instance
+from db.db import DB, db_instance
+from db import rollups
+from db.managers.category_cache import CategorySnapshot, get_category_cache
+from db.ledger_events import get_ledger_events
 from db.models.category import Category
+from db.models.enums import TransactionType
+from db.models.monthly_category_total import MonthlyCategoryTotal
+from db.models.rows import CategoryRow
+from db.models.transaction import Transaction
 from sqlalchemy.orm import Session as saSession
 
 class CategoryManager:
-    def __init__(self):
-        self.Session = db_instance.Session
+    def __init__(self, db: DB = None):
+        self.db = db or db_instance
+        self.Session = self.db.Session
+        self.cache = get_category_cache(self.db)
+        self.events = get_ledger_events(self.db)
 
     def add_category(self, name: str, limit_amount: float = 0, parent_name: str = None) -> Category:
         session = self.Session() # type: saSession
         try:
-            parent = None
+            parent_id = None
             if parent_name:
-                parent = session.query(Category).filter_by(name=parent_name).first()
-                if not parent:
+                parent_id = self.cache.get_id(parent_name)
+                if parent_id is None:
                     raise ValueError(f"Parent category '{parent_name}' not found")
-            category = Category(name=name, limit_amount=limit_amount, parent=parent)
+            category = Category(name=name, limit_amount=limit_amount, parent_id=parent_id)
             session.add(category)
             session.commit()
+            self.cache.invalidate()
+            self.events.categories_changed()
             return category
         except IntegrityError:
             session.rollback()
@@ -58,6 +72,8 @@ class CategoryManager:
                 raise ValueError(f"no valid fields provided for update")
             
             session.commit()
+            self.cache.invalidate()
+            self.events.categories_changed()
             return category
         except IntegrityError:
             session.rollback()
@@ -68,9 +84,212 @@ class CategoryManager:
         finally:
             session.close()
     
+    def delete_category(self, category_id: int, force: bool = False) -> bool:
+        """Delete a category by ID.
+
+        A category that still has transactions or subcategories is only deleted
+        with force=True, in which case its transactions are deleted and its
+        subcategories move up to its parent. Returns False if it does not exist.
+        """
+        category = self.cache.get(category_id)
+        if category is None:
+            return False
+
+        session = self.Session()
+        try:
+            has_transactions = session.execute(self._has_transactions_select(category_id)).scalar()
+            has_children = bool(self.cache.children_of(category_id))
+            if (has_transactions or has_children) and not force:
+                raise ValueError(f"Category '{category.name}' has transactions or subcategories, use force=True")
+
+            for stmt in self._delete_category_statements(category):
+                session.execute(stmt)
+            session.commit()
+            # Transactions and rollup rows went with the category
+            self.events.all_changed()
+            return True
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+            self.cache.invalidate()
+
+    @staticmethod
+    def _has_transactions_select(category_id: int):
+        return select(select(Transaction.id).where(Transaction.category_id == category_id).exists())
+
+    @staticmethod
+    def _delete_category_statements(category: CategoryRow) -> list:
+        """Re-parent children, then delete transactions, rollups and the category"""
+        return [
+            update(Category).where(Category.parent_id == category.id).values(parent_id=category.parent_id),
+            delete(Transaction).where(Transaction.category_id == category.id),
+            delete(MonthlyCategoryTotal).where(MonthlyCategoryTotal.category_id == category.id),
+            delete(Category).where(Category.id == category.id),
+        ]
+
+    def get_category_by_name(self, name: str) -> Optional[CategoryRow]:
+        return self.cache.get_by_name(name)
+
+    def get_category_by_id(self, category_id: int) -> Optional[CategoryRow]:
+        return self.cache.get(category_id)
+
+    def get_category_hierarchy(self, root: str = None) -> Dict[str, Dict]:
+        """Get categories as nested dicts keyed by name, optionally only those below root"""
+        snapshot = self.cache.snapshot()
+        return snapshot.hierarchy(self._require_id(snapshot, root) if root else None)
+
+    def get_subtree_ids(self, name: str) -> List[int]:
+        """Ids of a category and all its descendants"""
+        snapshot = self.cache.snapshot()
+        return snapshot.descendants(self._require_id(snapshot, name))
+
+    def get_category_path(self, name: str) -> List[str]:
+        """Names from the top-level ancestor down to the category"""
+        snapshot = self.cache.snapshot()
+        category_id = self._require_id(snapshot, name)
+        return [snapshot.by_id[node].name for node in snapshot.ancestors(category_id) + [category_id]]
+
+    @staticmethod
+    def _require_id(snapshot: CategorySnapshot, name: str) -> int:
+        category_id = snapshot.get_id(name)
+        if category_id is None:
+            raise ValueError(f"Category '{name}' not found")
+        return category_id
+
+    def get_subtree_totals(self, name: str, start_date: date = None, end_date: date = None) -> Dict:
+        """Get expense, income and count for a category including its descendants.
+
+        One aggregate over category_id IN (subtree), read from the rollup
+        table when [start_date, end_date) is month aligned.
+        """
+        snapshot = self.cache.snapshot()
+        category_ids = snapshot.descendants(self._require_id(snapshot, name))
+        session = self.Session()
+        try:
+            expense, income, count = session.execute(
+                self._subtree_totals_select(category_ids, start_date, end_date)
+            ).one()
+        finally:
+            session.close()
+        return self._shape_subtree_totals(snapshot, name, category_ids, expense, income, count)
+
+    @staticmethod
+    def _subtree_totals_select(category_ids: List[int], start_date: date = None, end_date: date = None):
+        if rollups.is_month_aligned(start_date) and rollups.is_month_aligned(end_date):
+            source = MonthlyCategoryTotal
+            amount, count = MonthlyCategoryTotal.total, func.sum(MonthlyCategoryTotal.count)
+        else:
+            source = Transaction
+            amount, count = Transaction.amount, func.count(Transaction.id)
+        stmt = select(
+            func.coalesce(func.sum(case((source.type == TransactionType.EXPENSE, amount), else_=0)), 0),
+            func.coalesce(func.sum(case((source.type == TransactionType.INCOME, amount), else_=0)), 0),
+            func.coalesce(count, 0),
+        ).where(source.category_id.in_(category_ids))
+        if source is MonthlyCategoryTotal:
+            return rollups.filter_months(stmt, start_date, end_date)
+        if start_date:
+            stmt = stmt.where(Transaction.date >= start_date)
+        if end_date:
+            stmt = stmt.where(Transaction.date < end_date)
+        return stmt
+
+    @staticmethod
+    def _shape_subtree_totals(snapshot: CategorySnapshot, name: str, category_ids: List[int],
+                              expense: float, income: float, count: int) -> Dict:
+        return {
+            'category': name,
+            'path': snapshot.path(category_ids[0]),
+            'categories': len(category_ids),
+            'expense': float(expense),
+            'income': float(income),
+            'transaction_count': count,
+        }
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+
     def list_categories(self) -> List[Category]:
         session = self.Session()
         categories = session.query(Category).all()
         session.close()
         return categories
 
+    def get_category_spending_summary(self,
+                                      start_date: date = None,
+                                      end_date: date = None) -> Dict[str, Dict]:
+        """Get spending against limits for every category.
+
+        Runs a single GROUP BY category_id, type aggregation joined onto the
+        categories table for [start_date, end_date), read from the monthly
+        rollup table when both bounds fall on month boundaries. Each
+        category's totals are then rolled up into its ancestors so a parent's
+        `spent` includes its subcategories; `own_spent` holds the category's
+        direct spending only.
+        """
+        session = self.Session()
+        try:
+            rows = session.execute(self._spending_summary_select(start_date, end_date)).all()
+        finally:
+            session.close()
+        return self._summarize_spending(rows)
+
+    @staticmethod
+    def _spending_summary_select(start_date: date = None, end_date: date = None):
+        if rollups.is_month_aligned(start_date) and rollups.is_month_aligned(end_date):
+            # Whole months can be answered from the rollup table
+            totals = select(
+                MonthlyCategoryTotal.category_id.label('category_id'),
+                func.sum(case((MonthlyCategoryTotal.type == TransactionType.EXPENSE, MonthlyCategoryTotal.total), else_=0)).label('expense'),
+                func.sum(case((MonthlyCategoryTotal.type == TransactionType.INCOME, MonthlyCategoryTotal.total), else_=0)).label('income'),
+                func.sum(MonthlyCategoryTotal.count).label('count'),
+            )
+            totals = rollups.filter_months(totals, start_date, end_date)
+            totals = totals.group_by(MonthlyCategoryTotal.category_id, MonthlyCategoryTotal.type).subquery()
+        else:
+            totals = select(
+                Transaction.category_id.label('category_id'),
+                func.sum(case((Transaction.type == TransactionType.EXPENSE, Transaction.amount), else_=0)).label('expense'),
+                func.sum(case((Transaction.type == TransactionType.INCOME, Transaction.amount), else_=0)).label('income'),
+                func.count(Transaction.id).label('count'),
+            )
+            if start_date:
+                totals = totals.where(Transaction.date >= start_date)
+            if end_date:
+                totals = totals.where(Transaction.date < end_date)
+            totals = totals.group_by(Transaction.category_id, Transaction.type).subquery()
+
+        return (select(Category.id, Category.name, Category.limit_amount, Category.parent_id,
+                       func.coalesce(func.sum(totals.c.expense), 0),
+                       func.coalesce(func.sum(totals.c.income), 0),
+                       func.coalesce(func.sum(totals.c.count), 0))
+                .outerjoin(totals, totals.c.category_id == Category.id)
+                .group_by(Category.id))
+
+    @staticmethod
+    def _summarize_spending(rows) -> Dict[str, Dict]:
+        """Roll per-category totals up the parent_id tree into the summary dict"""
+        rows = list(rows)
+        tree = CategorySnapshot(row[:4] for row in rows)
+        own = {row[0]: (float(row[4]), float(row[5]), row[6]) for row in rows}
+        rolled = tree.roll_up(own, 3)
+
+        summary = {}
+        for category_id, name, limit_amount, parent_id, _, _, _ in rows:
+            limit_amount = limit_amount or 0
+            expense = own[category_id][0]
+            spent, income, count = rolled[category_id]
+            summary[name] = {
+                'id': category_id,
+                'parent_id': parent_id,
+                'spent': spent,
+                'own_spent': expense,
+                'income': income,
+                'transaction_count': count,
+                'limit': limit_amount,
+                'remaining': limit_amount - spent if limit_amount > 0 else None,
+                'over_budget': limit_amount > 0 and spent > limit_amount,
+            }
+        return summary
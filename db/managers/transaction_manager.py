@@ -1,16 +1,90 @@
+import base64
+import json
 from sqlalchemy.orm import Session as saSession
-from sqlalchemy import and_, extract
+from sqlalchemy import and_, delete, func, insert, or_, select, update
 from datetime import date
-from typing import List
-from db.db import db_instance
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from db.db import DB, db_instance
+from db import rollups
+from db.managers.category_cache import get_category_cache
+from db.ledger_events import get_ledger_events
+from db.models.monthly_category_total import MonthlyCategoryTotal
 from db.models.transaction import Transaction
 from db.models.category import Category
 from db.models.enums import TransactionType
+from db.models.rows import ROW_MODES, TransactionColumns, TransactionRow
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """Return the half-open [first day, first day of next month) range"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def build_filters(category: str = None,
+                  start_date: date = None,
+                  end_date: date = None,
+                  month: Tuple[int, int] = None,
+                  transaction_type: TransactionType = None,
+                  vendor: str = None,
+                  category_ids: Iterable[int] = None) -> list:
+    """Translate the transaction filter vocabulary into WHERE clauses.
+
+    Filters combine with AND. end_date is inclusive, month is a (year, month)
+    pair, and category matches by name through a scalar subquery so the
+    clauses also work in UPDATE and DELETE statements. category_ids matches
+    any of the given ids, e.g. a category's whole subtree.
+    """
+    clauses = []
+    if category is not None:
+        category_id = select(Category.id).where(Category.name == category).scalar_subquery()
+        clauses.append(Transaction.category_id == category_id)
+    if category_ids is not None:
+        clauses.append(Transaction.category_id.in_(list(category_ids)))
+    if start_date is not None:
+        clauses.append(Transaction.date >= start_date)
+    if end_date is not None:
+        clauses.append(Transaction.date <= end_date)
+    if month is not None:
+        month_start, month_end = month_bounds(*month)
+        clauses.append(Transaction.date >= month_start)
+        clauses.append(Transaction.date < month_end)
+    if transaction_type is not None:
+        clauses.append(Transaction.type == transaction_type)
+    if vendor is not None:
+        clauses.append(Transaction.vendor == vendor)
+    return clauses
+
+
+def encode_cursor(transaction_date: date, transaction_id: int) -> str:
+    """Build an opaque continuation token for a (date, id) keyset position"""
+    raw = json.dumps([transaction_date.isoformat(), transaction_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Inverse of encode_cursor"""
+    try:
+        raw_date, transaction_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return date.fromisoformat(raw_date), int(transaction_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+# Field order for tuple rows passed to add_transactions_bulk
+BULK_FIELDS = ('type', 'amount', 'category', 'vendor', 'note', 'date')
+
+# Keys accepted in update_transactions_where changes
+WHERE_UPDATE_FIELDS = ('transaction_type', 'amount', 'category', 'vendor', 'note', 'date')
 
 
 class TransactionManager:
-    def __init__(self):
-        self.Session = db_instance.Session
+    def __init__(self, db: DB = None):
+        self.db = db or db_instance
+        self.Session = self.db.Session
+        self.category_cache = get_category_cache(self.db)
+        self.events = get_ledger_events(self.db)
 
     def add_transaction(self, 
                        transaction_type: TransactionType,
@@ -22,23 +96,27 @@ class TransactionManager:
         """Add a new transaction to the database"""
         session = self.Session()  # type: saSession
         try:
-            # Find the category
-            category = session.query(Category).filter_by(name=category_name).first()
-            if not category:
+            # Resolve the category from the cache, no query on the hot path
+            category_id = self.category_cache.get_id(category_name)
+            if category_id is None:
                 raise ValueError(f"Category '{category_name}' not found")
             
             # Create transaction directly
             transaction = Transaction(
                 type=transaction_type,
                 amount=amount,
-                category_id=category.id,
+                category_id=category_id,
                 vendor=vendor,
                 note=note,
                 date=transaction_date or date.today()
             )
             
             session.add(transaction)
+            deltas = {}
+            rollups.add_delta(deltas, transaction.date, category_id, transaction_type, amount, 1)
+            rollups.apply_deltas(session.connection(), deltas)
             session.commit()
+            self.events.transactions_changed(deltas)
             return transaction
             
         except Exception as e:
@@ -47,64 +125,236 @@ class TransactionManager:
         finally:
             session.close()
 
+    def add_transactions_bulk(self,
+                              rows: Iterable[Union[dict, tuple]],
+                              chunk_size: int = 1000) -> Dict:
+        """Insert many transactions inside a single database transaction.
 
-    def list_transactions(self, limit: int = None) -> List[Transaction]:
-        """Get all transactions, optionally limited"""
-        session = self.Session()
-        query = session.query(Transaction).order_by(Transaction.date.desc())
-        
+        Rows are dicts keyed by BULK_FIELDS or tuples in that order. Category
+        names are resolved from the category cache, rows are inserted in chunks
+        of `chunk_size` with executemany, and invalid rows are reported as
+        (row_index, message) pairs instead of aborting the batch.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        session = self.Session()  # type: saSession
+        inserted = 0
+        errors = []
+        deltas = {}
+        try:
+            category_ids = self.category_cache.name_map()
+            today = date.today()
+
+            chunk = []
+            for index, row in enumerate(rows):
+                try:
+                    chunk.append(self._build_bulk_row(row, category_ids, today))
+                except (ValueError, TypeError, KeyError) as e:
+                    errors.append((index, str(e)))
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    rollups.merge_deltas(deltas, self._insert_chunk(session, chunk))
+                    inserted += len(chunk)
+                    chunk = []
+
+            if chunk:
+                rollups.merge_deltas(deltas, self._insert_chunk(session, chunk))
+                inserted += len(chunk)
+
+            session.commit()
+            self.events.transactions_changed(deltas)
+            return {'inserted': inserted, 'errors': errors}
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    def _insert_chunk(session: saSession, chunk: List[dict]) -> rollups.RollupDeltas:
+        """Insert prepared rows and fold them into the monthly rollups, returning the deltas"""
+        deltas = {}
+        for row in chunk:
+            rollups.add_delta(deltas, row['date'], row['category_id'], row['type'], row['amount'], 1)
+        connection = session.connection()
+        connection.execute(insert(Transaction.__table__), chunk)
+        rollups.apply_deltas(connection, deltas)
+        return deltas
+
+    @staticmethod
+    def _build_bulk_row(row: Union[dict, tuple], category_ids: Dict[str, int], today: date) -> dict:
+        """Validate one bulk row and convert it to column values for insert()"""
+        if not isinstance(row, dict):
+            if len(row) > len(BULK_FIELDS):
+                raise ValueError(f"Expected at most {len(BULK_FIELDS)} fields, got {len(row)}")
+            row = dict(zip(BULK_FIELDS, row))
+
+        category_name = row['category']
+        category_id = category_ids.get(category_name)
+        if category_id is None:
+            raise ValueError(f"Category '{category_name}' not found")
+
+        transaction_type = row['type']
+        if not isinstance(transaction_type, TransactionType):
+            try:
+                transaction_type = TransactionType(str(transaction_type).lower())
+            except ValueError:
+                raise ValueError(f"Invalid transaction type '{transaction_type}'")
+
+        transaction_date = row.get('date')
+        if transaction_date is None:
+            transaction_date = today
+        elif isinstance(transaction_date, str):
+            try:
+                transaction_date = date.fromisoformat(transaction_date)
+            except ValueError:
+                raise ValueError("Date must be in YYYY-MM-DD format")
+        elif not isinstance(transaction_date, date):
+            raise TypeError(f"Invalid date {transaction_date!r}")
+
+        return {
+            'type': transaction_type,
+            'amount': float(row['amount']),
+            'category_id': category_id,
+            'vendor': row.get('vendor'),
+            'note': row.get('note'),
+            'date': transaction_date,
+        }
+
+
+    def list_transactions(self, limit: int = None, row_mode: str = 'orm', **filters):
+        """Get transactions newest first, optionally filtered (see build_filters) and limited.
+
+        row_mode 'orm' returns Transaction objects, 'row' returns TransactionRow
+        tuples and 'columns' returns one TransactionColumns batch; the latter
+        two skip ORM hydration entirely.
+        """
+        stmt = self._keyset_select(row_mode, None, filters)
         if limit:
-            query = query.limit(limit)
-            
-        transactions = query.all()
-        session.close()
-        return transactions
+            stmt = stmt.limit(limit)
 
-    def get_transactions_by_category(self, category_name: str) -> List[Transaction]:
-        """Get all transactions for a specific category"""
         session = self.Session()
         try:
-            transactions = (session.query(Transaction)
-                          .join(Category)
-                          .filter(Category.name == category_name)
-                          .order_by(Transaction.date.desc())
-                          .all())
-            return transactions
+            return self._fetch(session, stmt, row_mode)
         finally:
             session.close()
 
-    def get_transactions_by_date_range(self, 
-                                     start_date: date, 
-                                     end_date: date) -> List[Transaction]:
-        """Get transactions within a date range"""
+    def count_transactions(self, **filters) -> int:
+        """Count transactions matching the filters without loading them"""
         session = self.Session()
         try:
-            transactions = (session.query(Transaction)
-                          .filter(and_(
-                              Transaction.date >= start_date,
-                              Transaction.date <= end_date
-                          ))
-                          .order_by(Transaction.date.desc())
-                          .all())
-            return transactions
+            return session.query(func.count(Transaction.id)).filter(*build_filters(**filters)).scalar()
         finally:
             session.close()
 
-    def get_transactions_by_month(self, year: int, month: int) -> List[Transaction]:
-        """Get transactions for a specific month"""
+    def iter_transactions(self,
+                          batch_size: int = 1000,
+                          cursor: str = None,
+                          row_mode: str = 'orm',
+                          **filters) -> Iterator:
+        """Stream matching transactions newest first.
+
+        Rows are fetched batch_size at a time with yield_per, so memory stays
+        bounded however much history matches. Pass a cursor from
+        get_transactions_page to resume after that position. In 'columns'
+        row_mode each item is a TransactionColumns batch of up to batch_size rows.
+        """
+        stmt = self._keyset_select(row_mode, cursor, filters)
         session = self.Session()
         try:
-            transactions = (session.query(Transaction)
-                          .filter(and_(
-                              extract('year', Transaction.date) == year,
-                              extract('month', Transaction.date) == month
-                          ))
-                          .order_by(Transaction.date.desc())
-                          .all())
-            return transactions
+            result = session.execute(stmt, execution_options={'yield_per': batch_size})
+            if row_mode == 'orm':
+                yield from result.scalars()
+            elif row_mode == 'row':
+                for partition in result.partitions():
+                    yield from map(TransactionRow._make, partition)
+            else:
+                for partition in result.partitions():
+                    yield TransactionColumns.from_rows(partition)
         finally:
             session.close()
 
+    def get_transactions_page(self,
+                              page_size: int = 100,
+                              cursor: str = None,
+                              row_mode: str = 'orm',
+                              **filters) -> Tuple[list, Optional[str]]:
+        """Get one keyset page of transactions and the cursor for the next page.
+
+        Pages are ordered by (date, id) descending and seek past the cursor
+        position instead of using OFFSET, so every page costs the same. The
+        returned cursor is None once the last page has been read.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        stmt = self._keyset_select(row_mode, cursor, filters).limit(page_size + 1)
+        session = self.Session()
+        try:
+            rows = self._fetch(session, stmt, 'orm' if row_mode == 'orm' else 'row')
+        finally:
+            session.close()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+        if row_mode == 'columns':
+            rows = TransactionColumns.from_rows(rows)
+        return rows, next_cursor
+
+    @staticmethod
+    def _keyset_select(row_mode: str, cursor: Optional[str], filters: Dict):
+        """Filtered select ordered by (date, id) desc, starting after the cursor.
+
+        Rows with a NULL date have no (date, id) position to seek past, so
+        the keyset reads leave them out rather than losing them mid-stream.
+        """
+        if row_mode not in ROW_MODES:
+            raise ValueError(f"row_mode must be one of {', '.join(ROW_MODES)}")
+
+        if row_mode == 'orm':
+            stmt = select(Transaction)
+        else:
+            table = Transaction.__table__
+            stmt = select(*(table.c[name] for name in TransactionRow._fields))
+
+        stmt = stmt.where(Transaction.date.isnot(None), *build_filters(**filters))
+        if cursor:
+            after_date, after_id = decode_cursor(cursor)
+            stmt = stmt.where(or_(
+                Transaction.date < after_date,
+                and_(Transaction.date == after_date, Transaction.id < after_id)
+            ))
+        return stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    @staticmethod
+    def _fetch(session: saSession, stmt, row_mode: str):
+        """Execute a _keyset_select statement and shape the result for row_mode"""
+        if row_mode == 'orm':
+            return session.execute(stmt).scalars().all()
+        if row_mode == 'row':
+            return list(map(TransactionRow._make, session.execute(stmt)))
+        # Stream into the packed arrays rather than buffering every row first
+        return TransactionColumns.from_rows(session.execute(stmt, execution_options={'yield_per': 5000}))
+
+    def get_transactions_by_category(self, category_name: str, row_mode: str = 'orm'):
+        """Get all transactions for a specific category"""
+        return self.list_transactions(row_mode=row_mode, category=category_name)
+
+    def get_transactions_by_date_range(self, 
+                                     start_date: date, 
+                                     end_date: date,
+                                     row_mode: str = 'orm'):
+        """Get transactions within a date range"""
+        return self.list_transactions(row_mode=row_mode, start_date=start_date, end_date=end_date)
+
+    def get_transactions_by_month(self, year: int, month: int, row_mode: str = 'orm'):
+        """Get transactions for a specific month"""
+        return self.list_transactions(row_mode=row_mode, month=(year, month))
+
     def update_transaction(self, 
                           transaction_id: int,
                           **kwargs) -> Transaction:
@@ -115,13 +365,23 @@ class TransactionManager:
             if not transaction:
                 raise ValueError(f"Transaction with id {transaction_id} not found")
             
+            # Move the old values out of their rollup bucket, then the new ones in
+            deltas = {}
+            rollups.add_delta(deltas, transaction.date, transaction.category_id,
+                              transaction.type, -transaction.amount, -1)
+
             # Update allowed fields
             allowed_fields = ['amount', 'vendor', 'note', 'date', 'category_id']
             for key, value in kwargs.items():
                 if key in allowed_fields and value is not None:
                     setattr(transaction, key, value)
             
+            rollups.add_delta(deltas, transaction.date, transaction.category_id,
+                              transaction.type, transaction.amount, 1)
+            session.flush()
+            rollups.apply_deltas(session.connection(), deltas)
             session.commit()
+            self.events.transactions_changed(deltas)
             return transaction
         except Exception as e:
             session.rollback()
@@ -137,8 +397,13 @@ class TransactionManager:
             if not transaction:
                 return False
             
+            deltas = {}
+            rollups.add_delta(deltas, transaction.date, transaction.category_id,
+                              transaction.type, -transaction.amount, -1)
             session.delete(transaction)
+            rollups.apply_deltas(session.connection(), deltas)
             session.commit()
+            self.events.transactions_changed(deltas)
             return True
         except Exception as e:
             session.rollback()
@@ -146,40 +411,236 @@ class TransactionManager:
         finally:
             session.close()
 
+    def update_transactions_where(self, changes: Dict, dry_run: bool = False, **filters) -> int:
+        """Apply the same changes to every transaction matching the filters.
+
+        Runs as one UPDATE over the build_filters clauses; changes may set
+        WHERE_UPDATE_FIELDS, with category given by name. Returns the number
+        of rows updated, or with dry_run the number that would be.
+        """
+        clauses = self._where_clauses(filters)
+        values = self._where_values(changes, self.category_cache)
+        session = self.Session()
+        try:
+            connection = session.connection()
+            if dry_run:
+                return self._count_where(connection, clauses)
+            updated, deltas = self._update_where(connection, clauses, values)
+            session.commit()
+            self.events.transactions_changed(deltas)
+            return updated
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def delete_transactions_where(self, dry_run: bool = False, **filters) -> int:
+        """Delete every transaction matching the filters with one DELETE.
+
+        Returns the number of rows deleted, or with dry_run the number that
+        would be.
+        """
+        clauses = self._where_clauses(filters)
+        session = self.Session()
+        try:
+            connection = session.connection()
+            if dry_run:
+                return self._count_where(connection, clauses)
+            deleted, deltas = self._delete_where(connection, clauses)
+            session.commit()
+            self.events.transactions_changed(deltas)
+            return deleted
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    def _update_where(connection, clauses: list, values: Dict) -> Tuple[int, rollups.RollupDeltas]:
+        """UPDATE matching rows and move their rollup buckets; returns (rows, deltas).
+
+        Matching rows are grouped by their old bucket before the UPDATE, and
+        since every row gets the same new values each old group lands in
+        exactly one new bucket.
+        """
+        deltas = {}
+        if values.keys() & {'type', 'amount', 'category_id', 'date'}:
+            new_date = values.get('date')
+            for year, month, category_id, transaction_type, total, count in connection.execute(
+                    rollups.bucket_select(*clauses)):
+                if year is None:
+                    continue
+                rollups.add_bucket_delta(deltas, year, month, category_id, transaction_type, -total, -count)
+                rollups.add_bucket_delta(deltas,
+                                         new_date.year if new_date else year,
+                                         new_date.month if new_date else month,
+                                         values.get('category_id', category_id),
+                                         values.get('type', transaction_type),
+                                         values['amount'] * count if 'amount' in values else total,
+                                         count)
+
+        updated = connection.execute(update(Transaction.__table__).where(*clauses).values(**values)).rowcount
+        rollups.apply_deltas(connection, deltas)
+        return updated, deltas
+
+    @staticmethod
+    def _delete_where(connection, clauses: list) -> Tuple[int, rollups.RollupDeltas]:
+        """DELETE matching rows and subtract their rollup buckets; returns (rows, deltas)"""
+        deltas = {}
+        for year, month, category_id, transaction_type, total, count in connection.execute(
+                rollups.bucket_select(*clauses)):
+            if year is not None:
+                rollups.add_bucket_delta(deltas, year, month, category_id, transaction_type, -total, -count)
+
+        deleted = connection.execute(delete(Transaction.__table__).where(*clauses)).rowcount
+        rollups.apply_deltas(connection, deltas)
+        return deleted, deltas
+
+    @staticmethod
+    def _where_clauses(filters: Dict) -> list:
+        clauses = build_filters(**filters)
+        if not clauses:
+            raise ValueError("At least one filter is required")
+        return clauses
+
+    @staticmethod
+    def _where_values(changes: Dict, categories) -> Dict:
+        """Validate update_transactions_where changes and map them to column values.
+
+        categories is anything with get_id(name), a CategoryCache or CategorySnapshot.
+        """
+        if not changes:
+            raise ValueError("no valid fields provided for update")
+        values = {}
+        for key, value in changes.items():
+            if key not in WHERE_UPDATE_FIELDS:
+                raise ValueError(f"Key of {key} not in allowed fields, update {', '.join(WHERE_UPDATE_FIELDS)}")
+            if value is None and key not in ('vendor', 'note'):
+                raise ValueError(f"{key} cannot be set to None")
+            if key == 'category':
+                category_id = categories.get_id(value)
+                if category_id is None:
+                    raise ValueError(f"Category '{value}' not found")
+                values['category_id'] = category_id
+            elif key == 'transaction_type':
+                if not isinstance(value, TransactionType):
+                    raise ValueError(f"Invalid transaction type '{value}'")
+                values['type'] = value
+            elif key == 'amount':
+                values['amount'] = float(value)
+            elif key == 'date':
+                if not isinstance(value, date):
+                    raise ValueError(f"Invalid date {value!r}")
+                values['date'] = value
+            else:
+                values[key] = value
+        return values
+
+    @staticmethod
+    def _count_where(connection, clauses: list) -> int:
+        return connection.execute(select(func.count(Transaction.id)).where(*clauses)).scalar()
+
     def get_spending_summary_by_category(self, 
                                        start_date: date = None, 
                                        end_date: date = None) -> dict:
-        """Get spending summary grouped by category"""
+        """Get expense totals per category name, dates inclusive"""
         session = self.Session()
         try:
-            query = (session.query(Category.name, 
-                                 session.query(Transaction.amount)
-                                 .filter(Transaction.category_id == Category.id)
-                                 .filter(Transaction.type == TransactionType.EXPENSE))
-                    .outerjoin(Transaction))
-            
-            if start_date:
-                query = query.filter(Transaction.date >= start_date)
-            if end_date:
-                query = query.filter(Transaction.date <= end_date)
-            
-            # This is a simplified version - you might want to use SQL aggregation
-            summary = {}
-            for category_name, in session.query(Category.name).all():
-                expense_total = (session.query(Transaction.amount)
-                               .join(Category)
-                               .filter(Category.name == category_name)
-                               .filter(Transaction.type == TransactionType.EXPENSE))
-                
-                if start_date:
-                    expense_total = expense_total.filter(Transaction.date >= start_date)
-                if end_date:
-                    expense_total = expense_total.filter(Transaction.date <= end_date)
-                
-                total = sum(t.amount for t in expense_total.all())
-                if total > 0:
-                    summary[category_name] = total
-            
-            return summary
+            rows = session.execute(self._spending_summary_select(start_date, end_date)).all()
+            return {category_name: total for category_name, total in rows if total > 0}
+        finally:
+            session.close()
+
+    @staticmethod
+    def _spending_summary_select(start_date: date = None, end_date: date = None):
+        stmt = (select(Category.name, func.sum(Transaction.amount))
+                .join(Transaction, Transaction.category_id == Category.id)
+                .where(Transaction.type == TransactionType.EXPENSE))
+        if start_date:
+            stmt = stmt.where(Transaction.date >= start_date)
+        if end_date:
+            stmt = stmt.where(Transaction.date <= end_date)
+        return stmt.group_by(Category.id)
+
+    def get_period_totals(self, start_date: date = None, end_date: date = None) -> Dict:
+        """Get income, expense and transaction count for [start_date, end_date).
+
+        Month-aligned periods (or no bounds) are answered from the
+        monthly_category_totals rollup; anything else aggregates the raw rows.
+        """
+        session = self.Session()
+        try:
+            rows = session.execute(self._period_totals_select(start_date, end_date)).all()
+            return self._shape_period_totals(rows)
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    @staticmethod
+    def _period_totals_select(start_date: date = None, end_date: date = None):
+        if rollups.is_month_aligned(start_date) and rollups.is_month_aligned(end_date):
+            stmt = select(MonthlyCategoryTotal.type,
+                          func.sum(MonthlyCategoryTotal.total),
+                          func.sum(MonthlyCategoryTotal.count))
+            stmt = rollups.filter_months(stmt, start_date, end_date)
+            return stmt.group_by(MonthlyCategoryTotal.type)
+
+        stmt = select(Transaction.type, func.sum(Transaction.amount), func.count(Transaction.id))
+        if start_date:
+            stmt = stmt.where(Transaction.date >= start_date)
+        if end_date:
+            stmt = stmt.where(Transaction.date < end_date)
+        return stmt.group_by(Transaction.type)
+
+    @staticmethod
+    def _shape_period_totals(rows) -> Dict:
+        totals = {'income': 0.0, 'expense': 0.0, 'count': 0}
+        for transaction_type, total, count in rows:
+            totals[transaction_type.value] += total or 0.0
+            totals['count'] += count or 0
+        return totals
+
+    def get_monthly_totals(self,
+                           start_date: date,
+                           end_date: date,
+                           by_category: bool = False) -> List[Tuple]:
+        """Get per-month totals for the whole months in [start_date, end_date).
+
+        Returns (year, month, type, total, count) rows from one GROUP BY over
+        the rollup table, or (year, month, category_name, type, total, count)
+        rows when by_category is set.
+        """
+        session = self.Session()
+        try:
+            stmt = self._monthly_totals_select(start_date, end_date, by_category)
+            return [tuple(row) for row in session.execute(stmt)]
+        finally:
+            session.close()
+
+    @staticmethod
+    def _monthly_totals_select(start_date: date, end_date: date, by_category: bool = False):
+        columns = [MonthlyCategoryTotal.year, MonthlyCategoryTotal.month]
+        if by_category:
+            columns.append(Category.name)
+        columns.append(MonthlyCategoryTotal.type)
+
+        stmt = select(*columns, func.sum(MonthlyCategoryTotal.total), func.sum(MonthlyCategoryTotal.count))
+        if by_category:
+            stmt = stmt.join(Category, Category.id == MonthlyCategoryTotal.category_id)
+        stmt = rollups.filter_months(stmt, start_date, end_date)
+        return stmt.group_by(*columns)
+
+    def rebuild_rollups(self) -> int:
+        """Recompute the monthly_category_totals table from scratch"""
+        session = self.Session()
+        try:
+            buckets = rollups.rebuild(session.connection())
+            session.commit()
+            self.events.all_changed()
+            return buckets
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
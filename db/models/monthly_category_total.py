@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Float, Enum, ForeignKey
+from db.models.base import Base
+from db.models.enums import TransactionType
+
+
+class MonthlyCategoryTotal(Base):
+    """Per-month, per-category running totals maintained on every write"""
+    __tablename__ = "monthly_category_totals"
+    
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    type = Column(Enum(TransactionType), primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,83 @@
+from array import array
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional
+from db.models.enums import TransactionType
+
+# Read modes accepted by TransactionManager list/iter/page methods
+ROW_MODES = ('orm', 'row', 'columns')
+
+# Integer codes for TransactionColumns.type
+TYPE_CODES = {TransactionType.INCOME: 0, TransactionType.EXPENSE: 1}
+TYPES_BY_CODE = {code: transaction_type for transaction_type, code in TYPE_CODES.items()}
+
+
+class TransactionRow(NamedTuple):
+    """Plain tuple view of a transaction, built without ORM hydration"""
+    id: int
+    type: TransactionType
+    amount: float
+    category_id: Optional[int]
+    vendor: Optional[str]
+    note: Optional[str]
+    date: date
+
+
+class CategoryRow(NamedTuple):
+    """Plain tuple view of a category, as held by the category cache"""
+    id: int
+    name: str
+    limit_amount: float
+    parent_id: Optional[int]
+
+
+class TransactionColumns:
+    """Column-oriented batch of transactions.
+
+    Numeric columns are packed arrays: amount is array('d'), date holds
+    proleptic ordinals (date.toordinal(), 0 for a missing date, as in the
+    columnar export), type holds TYPE_CODES and a missing category_id is
+    stored as 0.
+    """
+    __slots__ = ('id', 'type', 'amount', 'category_id', 'vendor', 'note', 'date')
+
+    def __init__(self):
+        self.id = array('q')
+        self.type = array('b')
+        self.amount = array('d')
+        self.category_id = array('q')
+        self.vendor = []  # type: List[Optional[str]]
+        self.note = []  # type: List[Optional[str]]
+        self.date = array('l')
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> 'TransactionColumns':
+        """Build from tuples in TransactionRow field order"""
+        columns = cls()
+        for row in rows:
+            columns.append(row)
+        return columns
+
+    def append(self, row: tuple) -> None:
+        transaction_id, transaction_type, amount, category_id, vendor, note, transaction_date = row
+        self.id.append(transaction_id)
+        self.type.append(TYPE_CODES[transaction_type])
+        self.amount.append(amount)
+        self.category_id.append(category_id or 0)
+        self.vendor.append(vendor)
+        self.note.append(note)
+        self.date.append(transaction_date.toordinal() if transaction_date is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def row(self, index: int) -> TransactionRow:
+        """Rebuild one row as a TransactionRow"""
+        return TransactionRow(
+            self.id[index],
+            TYPES_BY_CODE[self.type[index]],
+            self.amount[index],
+            self.category_id[index] or None,
+            self.vendor[index],
+            self.note[index],
+            date.fromordinal(self.date[index]) if self.date[index] else None,
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import date
 from db.models.base import Base
@@ -7,6 +7,11 @@ from db.models.enums import TransactionType
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_date", "date"),
+        Index("ix_transactions_category_date", "category_id", "date"),
+        Index("ix_transactions_type_date", "type", "date"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     type = Column(Enum(TransactionType), nullable=False)
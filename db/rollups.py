@@ -0,0 +1,113 @@
+from datetime import date
+from typing import Dict, Tuple
+from sqlalchemy import Integer, cast, delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from db.models.enums import TransactionType
+from db.models.monthly_category_total import MonthlyCategoryTotal
+from db.models.transaction import Transaction
+
+# (year, month, category_id, type) -> [amount delta, count delta]
+RollupDeltas = Dict[Tuple[int, int, int, TransactionType], list]
+
+_table = MonthlyCategoryTotal.__table__
+
+
+def add_delta(deltas: RollupDeltas,
+              transaction_date: date,
+              category_id: int,
+              transaction_type: TransactionType,
+              amount: float,
+              count: int) -> None:
+    """Accumulate a change to one monthly bucket"""
+    add_bucket_delta(deltas, transaction_date.year, transaction_date.month,
+                     category_id, transaction_type, amount, count)
+
+
+def add_bucket_delta(deltas: RollupDeltas,
+                     year: int,
+                     month: int,
+                     category_id: int,
+                     transaction_type: TransactionType,
+                     amount: float,
+                     count: int) -> None:
+    """add_delta for a bucket given as (year, month) rather than a date"""
+    if category_id is None:
+        return
+    key = (year, month, category_id, transaction_type)
+    bucket = deltas.get(key)
+    if bucket is None:
+        deltas[key] = [amount, count]
+    else:
+        bucket[0] += amount
+        bucket[1] += count
+
+
+def merge_deltas(deltas: RollupDeltas, other: RollupDeltas) -> None:
+    """Fold the buckets of `other` into `deltas`"""
+    for key, (amount, count) in other.items():
+        bucket = deltas.get(key)
+        if bucket is None:
+            deltas[key] = [amount, count]
+        else:
+            bucket[0] += amount
+            bucket[1] += count
+
+
+def apply_deltas(connection: Connection, deltas: RollupDeltas) -> None:
+    """Upsert accumulated deltas into monthly_category_totals.
+
+    Run on the same connection as the transaction write so both land in one
+    DB transaction.
+    """
+    params = [
+        {'year': year, 'month': month, 'category_id': category_id, 'type': transaction_type,
+         'total': amount, 'count': count}
+        for (year, month, category_id, transaction_type), (amount, count) in deltas.items()
+        if amount or count
+    ]
+    if not params:
+        return
+    stmt = sqlite_insert(_table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_table.c.year, _table.c.month, _table.c.category_id, _table.c.type],
+        set_={'total': _table.c.total + stmt.excluded.total,
+              'count': _table.c.count + stmt.excluded.count},
+    )
+    connection.execute(stmt, params)
+
+
+def bucket_select(*clauses):
+    """(year, month, category_id, type, total, count) per bucket over transactions matching clauses"""
+    year = cast(func.strftime('%Y', Transaction.date), Integer)
+    month = cast(func.strftime('%m', Transaction.date), Integer)
+    return (select(year, month, Transaction.category_id, Transaction.type,
+                   func.sum(Transaction.amount), func.count(Transaction.id))
+            .where(*clauses)
+            .group_by(year, month, Transaction.category_id, Transaction.type))
+
+
+def rebuild(connection: Connection) -> int:
+    """Recompute every bucket from the transactions table, returns bucket count"""
+    source = bucket_select(Transaction.category_id.is_not(None))
+
+    connection.execute(delete(_table))
+    connection.execute(insert(_table).from_select(
+        ['year', 'month', 'category_id', 'type', 'total', 'count'], source
+    ))
+    return connection.execute(select(func.count()).select_from(_table)).scalar()
+
+
+def is_month_aligned(bound: date) -> bool:
+    """True when a period bound falls on a month boundary (or is open)"""
+    return bound is None or bound.day == 1
+
+
+def filter_months(query, start_date: date = None, end_date: date = None):
+    """Restrict a rollup query to months in [start_date, end_date)"""
+    month_key = MonthlyCategoryTotal.year * 12 + MonthlyCategoryTotal.month
+    if start_date:
+        query = query.where(month_key >= start_date.year * 12 + start_date.month)
+    if end_date:
+        query = query.where(month_key < end_date.year * 12 + end_date.month)
+    return query
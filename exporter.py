@@ -0,0 +1,303 @@
+import csv
+import gzip
+import io
+import json
+import struct
+import sys
+import time
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.engine import Connection
+
+from db.managers.category_cache import CategorySnapshot
+from db.managers.transaction_manager import TransactionManager, build_filters
+from db.models.enums import TransactionType
+from db.models.rows import TYPE_CODES, TYPES_BY_CODE
+from db.models.transaction import Transaction
+
+# Exported columns, in file order
+EXPORT_COLUMNS = ('id', 'date', 'type', 'amount', 'category', 'category_path', 'vendor', 'note')
+
+# Separator between ancestor names in category_path
+PATH_SEPARATOR = ' > '
+
+COLUMNAR_MAGIC = b'BGTCOL1\n'
+
+# Raw rows as stored: (id, date text, type name, amount, category_id, vendor, note).
+# Dates and types skip their result processors; writers only need the text.
+_EXPORT_SELECT = select(
+    Transaction.id,
+    type_coerce(Transaction.date, String),
+    type_coerce(Transaction.type, String),
+    Transaction.amount,
+    Transaction.category_id,
+    Transaction.vendor,
+    Transaction.note,
+)
+
+_TYPES_BY_NAME = {transaction_type.name: transaction_type for transaction_type in TransactionType}
+_NO_CATEGORY = (None, None)
+
+
+def category_labels(snapshot: CategorySnapshot) -> Dict[int, Tuple[str, str]]:
+    """category id -> (name, path of names from its top-level ancestor down)"""
+    return {category_id: (snapshot.by_id[category_id].name, path)
+            for category_id, path in snapshot.paths(PATH_SEPARATOR).items()}
+
+
+# ===== WRITERS =====
+# Writers take an open file, an iterator of raw row batches and the category
+# labels, and write one batch at a time so memory stays at one batch.
+
+def _labelled(batch: List[tuple], labels: Dict[int, Tuple[str, str]]) -> Iterator[tuple]:
+    """Raw rows in EXPORT_COLUMNS order"""
+    for transaction_id, day, type_name, amount, category_id, vendor, note in batch:
+        name, path = labels.get(category_id, _NO_CATEGORY)
+        yield transaction_id, day, _TYPES_BY_NAME[type_name].value, amount, name, path, vendor, note
+
+
+def write_csv(f: TextIO, batches: Iterable[List[tuple]], labels: Dict[int, Tuple[str, str]]) -> None:
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(_labelled(batch, labels))
+
+
+def write_jsonl(f: TextIO, batches: Iterable[List[tuple]], labels: Dict[int, Tuple[str, str]]) -> None:
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    for batch in batches:
+        f.write(''.join(encode(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in _labelled(batch, labels)))
+
+
+def write_columnar(f: BinaryIO, batches: Iterable[List[tuple]], labels: Dict[int, Tuple[str, str]]) -> None:
+    """Write the binary columnar format read back by read_columnar.
+
+    Layout, little-endian throughout:
+      magic, u32 header length, JSON header (columns, category labels)
+      per batch: b'RG', u32 row count, then per column a u32 byte length and
+        its values: id i64, date i32 ordinal (0 = none), type u8 TYPE_CODES,
+        amount f64, category_id i32 (-1 = none), and vendor/note as n validity
+        bytes, n + 1 u32 offsets and the UTF-8 data
+      b'EN', u64 total rows
+    Categories are stored once in the header, so rows carry only their id.
+    """
+    header = json.dumps({
+        'columns': ['id', 'date', 'type', 'amount', 'category_id', 'vendor', 'note'],
+        'categories': {str(category_id): list(label) for category_id, label in labels.items()},
+    }).encode()
+    f.write(COLUMNAR_MAGIC + struct.pack('<I', len(header)) + header)
+
+    ordinals = {}
+    type_codes = {name: TYPE_CODES[transaction_type] for name, transaction_type in _TYPES_BY_NAME.items()}
+    total = 0
+    for batch in batches:
+        ids, days, types, amounts, category_ids, vendors, notes = zip(*batch)
+        for day in set(days).difference(ordinals):
+            ordinals[day] = date.fromisoformat(day).toordinal() if day else 0
+        columns = [
+            _pack(array('q', ids)),
+            _pack(array('i', [ordinals[day] for day in days])),
+            bytes(type_codes[name] for name in types),
+            _pack(array('d', amounts)),
+            _pack(array('i', [-1 if category_id is None else category_id for category_id in category_ids])),
+            _pack_strings(vendors),
+            _pack_strings(notes),
+        ]
+        f.write(b'RG' + struct.pack('<I', len(batch)))
+        for column in columns:
+            f.write(struct.pack('<I', len(column)))
+            f.write(column)
+        total += len(batch)
+    f.write(b'EN' + struct.pack('<Q', total))
+
+
+def _pack(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_strings(values: Tuple[Optional[str], ...]) -> bytes:
+    encoded = [value.encode() if value is not None else b'' for value in values]
+    offsets = array('I', [0])
+    position = 0
+    for value in encoded:
+        position += len(value)
+        offsets.append(position)
+    return bytes(value is not None for value in values) + _pack(offsets) + b''.join(encoded)
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'columnar': write_columnar,
+}
+
+# File extension -> format, for formats not named after their extension
+_EXTENSIONS = {'bcol': 'columnar', 'json': 'jsonl'}
+
+
+# ===== READER =====
+
+def read_columnar(path) -> Iterator[Dict[str, list]]:
+    """Yield each batch of a columnar export as {column: values} in EXPORT_COLUMNS.
+
+    Dates come back as ISO strings and types as their values, matching the
+    CSV and JSONL exports. Gzipped files are detected by their .gz suffix.
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"'{path}' is not a columnar export")
+        header = json.loads(f.read(struct.unpack('<I', f.read(4))[0]))
+        labels = {int(category_id): tuple(label) for category_id, label in header['categories'].items()}
+        days = {0: None}
+
+        while True:
+            marker = f.read(2)
+            if marker == b'EN':
+                return
+            if marker != b'RG':
+                raise ValueError(f"'{path}' is truncated or corrupt")
+            count = struct.unpack('<I', f.read(4))[0]
+            ids, ordinals, types, amounts, category_ids, vendors, notes = (
+                f.read(struct.unpack('<I', f.read(4))[0]) for _ in range(7)
+            )
+            ordinals = _unpack('i', ordinals)
+            for ordinal in set(ordinals).difference(days):
+                days[ordinal] = date.fromordinal(ordinal).isoformat()
+            category_labels = [labels.get(category_id, _NO_CATEGORY) for category_id in _unpack('i', category_ids)]
+            yield {
+                'id': _unpack('q', ids).tolist(),
+                'date': [days[ordinal] for ordinal in ordinals],
+                'type': [TYPES_BY_CODE[code].value for code in types],
+                'amount': _unpack('d', amounts).tolist(),
+                'category': [name for name, _ in category_labels],
+                'category_path': [category_path for _, category_path in category_labels],
+                'vendor': _unpack_strings(vendors, count),
+                'note': _unpack_strings(notes, count),
+            }
+
+
+def _unpack(typecode: str, data: bytes) -> array:
+    values = array(typecode, data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _unpack_strings(data: bytes, count: int) -> List[Optional[str]]:
+    offsets = _unpack('I', data[count:count + 4 * (count + 1)])
+    text = data[count + 4 * (count + 1):]
+    return [text[offsets[i]:offsets[i + 1]].decode() if data[i] else None for i in range(count)]
+
+
+# ===== PIPELINE =====
+
+def iter_batches(connection: Connection, batch_size: int = 10000, **filters) -> Iterator[List[tuple]]:
+    """Stream raw rows matching the TransactionManager filters, oldest first.
+
+    yield_per keeps only one batch of rows in memory at a time.
+    """
+    stmt = _EXPORT_SELECT.where(*build_filters(**filters)).order_by(Transaction.date, Transaction.id)
+    result = connection.execution_options(yield_per=batch_size).execute(stmt)
+    yield from result.partitions()
+
+
+def resolve_format(path, file_format: str = None, compress: bool = None) -> Tuple[str, bool]:
+    """Export format and gzip flag, defaulting to the file extension (e.g. .csv.gz)"""
+    suffixes = [suffix.lstrip('.').lower() for suffix in Path(path).suffixes]
+    if compress is None:
+        compress = bool(suffixes) and suffixes[-1] == 'gz'
+    if file_format is None:
+        extensions = [suffix for suffix in suffixes if suffix != 'gz']
+        file_format = extensions[-1] if extensions else ''
+    file_format = _EXTENSIONS.get(file_format.lower(), file_format.lower())
+    if file_format not in WRITERS:
+        raise ValueError(f"Unsupported export format '{file_format}', use one of {', '.join(WRITERS)}")
+    return file_format, compress
+
+
+def export_rows(connection: Connection,
+                snapshot: CategorySnapshot,
+                path,
+                file_format: str = None,
+                compress: bool = None,
+                batch_size: int = 10000,
+                on_progress: Callable[[Dict], None] = None,
+                **filters) -> Dict:
+    """Write matching transactions to a CSV, JSONL or columnar file.
+
+    Rows go from the cursor to the file one batch at a time, each joined in
+    memory with its category name and path from the snapshot. on_progress
+    receives the running stats after every batch.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    file_format, compress = resolve_format(path, file_format, compress)
+    writer = WRITERS[file_format]
+    labels = category_labels(snapshot)
+    started = time.perf_counter()
+    stats = {'rows': 0, 'bytes': 0, 'elapsed': 0.0, 'rows_per_sec': 0.0}
+
+    def counted(batches: Iterator[List[tuple]]) -> Iterator[List[tuple]]:
+        for batch in batches:
+            yield batch
+            stats['rows'] += len(batch)
+            stats['elapsed'] = time.perf_counter() - started
+            stats['rows_per_sec'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] else 0.0
+            if on_progress:
+                on_progress(dict(stats))
+
+    raw = gzip.open(path, 'wb', compresslevel=6) if compress else open(path, 'wb', buffering=1 << 20)
+    with raw:
+        if file_format == 'columnar':
+            writer(raw, counted(iter_batches(connection, batch_size, **filters)), labels)
+        else:
+            with io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                writer(f, counted(iter_batches(connection, batch_size, **filters)), labels)
+
+    stats['bytes'] = Path(path).stat().st_size
+    stats['elapsed'] = time.perf_counter() - started
+    stats['rows_per_sec'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    return stats
+
+
+def export_file(transaction_manager: TransactionManager,
+                path,
+                file_format: str = None,
+                compress: bool = None,
+                batch_size: int = 10000,
+                on_progress: Callable[[Dict], None] = None,
+                **filters) -> Dict:
+    """Export transactions matching the filters; the format defaults to the file extension"""
+    session = transaction_manager.Session()
+    try:
+        return export_rows(session.connection(), transaction_manager.category_cache.snapshot(),
+                           path, file_format, compress, batch_size, on_progress, **filters)
+    finally:
+        session.close()
+
+
+async def export_file_async(transaction_manager,
+                            snapshot: CategorySnapshot,
+                            path,
+                            file_format: str = None,
+                            compress: bool = None,
+                            batch_size: int = 10000,
+                            on_progress: Callable[[Dict], None] = None,
+                            **filters) -> Dict:
+    """export_file for an AsyncTransactionManager; the export runs on its sync connection"""
+    session = await transaction_manager.Session()
+    try:
+        connection = await session.connection()
+        return await connection.run_sync(
+            lambda sync_connection: export_rows(sync_connection, snapshot, path, file_format,
+                                                compress, batch_size, on_progress, **filters)
+        )
+    finally:
+        await session.close()
@@ -0,0 +1,271 @@
+import csv
+import re
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from db.managers.transaction_manager import TransactionManager
+from db.models.enums import TransactionType
+
+# Transaction field -> CSV column header
+DEFAULT_COLUMNS = {
+    'type': 'type',
+    'amount': 'amount',
+    'category': 'category',
+    'vendor': 'vendor',
+    'note': 'note',
+    'date': 'date',
+}
+
+# Rejected rows kept in the final stats; 'rejected' still counts them all
+MAX_STORED_ERRORS = 1000
+
+_AMOUNT_JUNK = re.compile(r"[^0-9.\-]")
+_OFX_TAG = re.compile(r"<(/?)(\w+)>([^<\r\n]*)")
+
+
+# ===== FILE READERS =====
+# Readers are generators yielding raw rows keyed by transaction field with
+# string values; nothing is parsed until a whole chunk is collected.
+
+def read_csv_rows(path, columns: Dict[str, str] = None,
+                  delimiter: str = ',', encoding: str = 'utf-8') -> Iterator[Dict[str, str]]:
+    """Yield CSV rows mapped onto transaction fields"""
+    columns = columns or DEFAULT_COLUMNS
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        missing = [c for c in columns.values() if c not in (reader.fieldnames or [])]
+        for field in ('amount', 'date'):
+            if columns.get(field) in missing or field not in columns:
+                raise ValueError(f"CSV file has no column for required field '{field}'")
+        mapping = [(field, column) for field, column in columns.items() if column not in missing]
+        for record in reader:
+            yield {field: record[column] for field, column in mapping}
+
+
+def read_qif_rows(path, encoding: str = 'utf-8') -> Iterator[Dict[str, str]]:
+    """Yield QIF bank records (D date, T amount, P payee, M memo, L category)"""
+    codes = {'D': 'date', 'T': 'amount', 'P': 'vendor', 'M': 'note', 'L': 'category'}
+    record = {}
+    with open(path, encoding=encoding) as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('!'):
+                continue
+            if line == '^':
+                if record:
+                    yield record
+                record = {}
+                continue
+            field = codes.get(line[0])
+            if field:
+                record[field] = line[1:].strip()
+    if record:
+        yield record
+
+
+def read_ofx_rows(path, encoding: str = 'latin-1') -> Iterator[Dict[str, str]]:
+    """Yield OFX <STMTTRN> records; OFX carries no category column.
+
+    Tags are scanned in order, so records may span lines or share one.
+    """
+    codes = {'DTPOSTED': 'date', 'TRNAMT': 'amount', 'NAME': 'vendor', 'MEMO': 'note'}
+    record = None
+    with open(path, encoding=encoding) as f:
+        for line in f:
+            for closing, tag, value in _OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == 'STMTTRN':
+                    if closing and record is not None:
+                        yield record
+                    record = None if closing else {}
+                elif record is not None and not closing and tag in codes:
+                    value = value.strip()
+                    record[codes[tag]] = value[:8] if tag == 'DTPOSTED' else value
+
+
+READERS = {
+    'csv': read_csv_rows,
+    'qif': read_qif_rows,
+    'ofx': read_ofx_rows,
+}
+
+
+# ===== BATCH PARSING =====
+
+def parse_amount(value: str) -> float:
+    """Parse an amount such as '1,234.50', '$-12', or '(12.00)'"""
+    value = value.strip()
+    negative = value.startswith('(') and value.endswith(')')
+    amount = float(_AMOUNT_JUNK.sub('', value))
+    return -amount if negative else amount
+
+
+def parse_chunk(raw_rows: List[Dict[str, str]],
+                date_format: str = '%Y-%m-%d',
+                default_category: str = None) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+    """Parse a chunk of raw rows into add_transactions_bulk dicts.
+
+    Dates are parsed once per distinct value in the chunk, which is where most
+    of the per-row cost goes in bank exports. When a row has no type, the sign
+    of the amount decides it (negative is an expense). Returns the parsed rows
+    and (chunk_index, error) pairs for rejected rows.
+    """
+    parsed_dates = {}
+    for value in {row.get('date') for row in raw_rows}:
+        if not value:
+            continue
+        try:
+            parsed_dates[value] = datetime.strptime(value.strip(), date_format).date()
+        except ValueError:
+            pass
+
+    parsed = []
+    errors = []
+    for index, row in enumerate(raw_rows):
+        try:
+            raw_date = row.get('date')
+            transaction_date = parsed_dates.get(raw_date)
+            if transaction_date is None:
+                raise ValueError(f"Date '{raw_date}' does not match format {date_format}")
+
+            amount = parse_amount(row.get('amount') or '')
+            transaction_type = row.get('type')
+            if not transaction_type:
+                transaction_type = TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+
+            parsed.append({
+                'type': transaction_type,
+                'amount': abs(amount),
+                'category': row.get('category') or default_category,
+                'vendor': row.get('vendor') or None,
+                'note': row.get('note') or None,
+                'date': transaction_date,
+            })
+        except ValueError as e:
+            errors.append((index, str(e)))
+    return parsed, errors
+
+
+# ===== PIPELINE =====
+
+def iter_chunks(rows: Iterable, chunk_size: int) -> Iterator[List]:
+    """Yield lists of at most chunk_size items"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_rows(transaction_manager: TransactionManager,
+                raw_rows: Iterable[Dict[str, str]],
+                date_format: str = '%Y-%m-%d',
+                default_category: str = None,
+                chunk_size: int = 5000,
+                on_progress: Callable[[Dict], None] = None) -> Dict:
+    """Stream raw rows into the database one fixed-size chunk at a time.
+
+    Only one chunk is held in memory, and each chunk is committed by its own
+    add_transactions_bulk call. on_progress receives the running stats after
+    every chunk, with that chunk's errors only. Rejected rows are reported
+    with their 0-based source row index; the final stats keep the first
+    MAX_STORED_ERRORS and count the rest in 'errors_dropped'.
+    """
+    started = time.perf_counter()
+    stats = _new_stats()
+    for chunk in iter_chunks(raw_rows, chunk_size):
+        parsed, parse_errors = parse_chunk(chunk, date_format, default_category)
+        result = transaction_manager.add_transactions_bulk(parsed, chunk_size)
+        _record_chunk(stats, started, chunk, parse_errors, result, on_progress)
+    return stats
+
+
+async def import_rows_async(transaction_manager,
+                            raw_rows: Iterable[Dict[str, str]],
+                            date_format: str = '%Y-%m-%d',
+                            default_category: str = None,
+                            chunk_size: int = 5000,
+                            on_progress: Callable[[Dict], None] = None) -> Dict:
+    """import_rows for an AsyncTransactionManager"""
+    started = time.perf_counter()
+    stats = _new_stats()
+    for chunk in iter_chunks(raw_rows, chunk_size):
+        parsed, parse_errors = parse_chunk(chunk, date_format, default_category)
+        result = await transaction_manager.add_transactions_bulk(parsed, chunk_size)
+        _record_chunk(stats, started, chunk, parse_errors, result, on_progress)
+    return stats
+
+
+def _new_stats() -> Dict:
+    return {'rows': 0, 'inserted': 0, 'rejected': 0, 'errors': [], 'errors_dropped': 0,
+            'elapsed': 0.0, 'rows_per_sec': 0.0}
+
+
+def _record_chunk(stats: Dict,
+                  started: float,
+                  chunk: List[Dict[str, str]],
+                  parse_errors: List[Tuple[int, str]],
+                  result: Dict,
+                  on_progress: Callable[[Dict], None] = None) -> None:
+    """Fold one chunk's parse and insert errors into the running stats"""
+    offset = stats['rows']
+
+    # Map positions in the parsed rows back to positions in the source chunk
+    failed = {index for index, _ in parse_errors}
+    source_index = [i for i in range(len(chunk)) if i not in failed]
+
+    errors = [(offset + i, message) for i, message in parse_errors]
+    errors += [(offset + source_index[i], message) for i, message in result['errors']]
+    errors.sort()
+
+    stats['rows'] += len(chunk)
+    stats['inserted'] += result['inserted']
+    stats['rejected'] += len(errors)
+    kept = errors[:max(0, MAX_STORED_ERRORS - len(stats['errors']))]
+    stats['errors'].extend(kept)
+    stats['errors_dropped'] += len(errors) - len(kept)
+    stats['elapsed'] = time.perf_counter() - started
+    stats['rows_per_sec'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] else 0.0
+
+    if on_progress:
+        on_progress(dict(stats, errors=errors))
+
+
+def open_file(path,
+              file_format: str = None,
+              columns: Dict[str, str] = None,
+              date_format: str = None) -> Tuple[Iterator[Dict[str, str]], str]:
+    """Return the raw row reader and date format for a CSV, QIF or OFX file.
+
+    The format defaults to the file extension.
+    """
+    file_format = (file_format or Path(path).suffix.lstrip('.')).lower()
+    if file_format not in READERS:
+        raise ValueError(f"Unsupported import format '{file_format}', use one of {', '.join(READERS)}")
+
+    if file_format == 'csv':
+        raw_rows = read_csv_rows(path, columns)
+    else:
+        raw_rows = READERS[file_format](path)
+
+    if date_format is None:
+        date_format = {'qif': '%m/%d/%Y', 'ofx': '%Y%m%d'}.get(file_format, '%Y-%m-%d')
+    return raw_rows, date_format
+
+
+def import_file(transaction_manager: TransactionManager,
+                path,
+                file_format: str = None,
+                columns: Dict[str, str] = None,
+                date_format: str = None,
+                default_category: str = None,
+                chunk_size: int = 5000,
+                on_progress: Callable[[Dict], None] = None) -> Dict:
+    """Import a CSV, QIF or OFX file; the format defaults to the file extension"""
+    raw_rows, date_format = open_file(path, file_format, columns, date_format)
+    return import_rows(transaction_manager, raw_rows, date_format,
+                       default_category, chunk_size, on_progress)
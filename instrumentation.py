@@ -0,0 +1,243 @@
+import bisect
+import contextvars
+import functools
+import json
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+
+# Upper bucket bounds; the last bucket is open-ended
+LATENCY_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+COUNT_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 1000, 10000, 100000)
+
+# The API call currently running in this thread/task, if it is being recorded
+_current_call = contextvars.ContextVar('budget_api_call', default=None)
+
+# Engines and session factories that already carry the listeners below
+_instrumented_engines = weakref.WeakSet()
+_instrumented_session_factories = weakref.WeakSet()
+
+
+class Histogram:
+    """Fixed-bucket histogram with exact count, sum, min and max"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (max for the open bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([*map(str, self.bounds), 'inf'], self.buckets)),
+        }
+
+
+class CallRecord:
+    """Counters for one BudgetAPI call, filled in by the engine/session listeners"""
+    __slots__ = ('method', 'started', 'wall_ms', 'statements', 'sql_ms',
+                 'rows_hydrated', 'rows_returned', 'sessions', 'session_ms', 'error',
+                 '_statement_started', '_session_started')
+
+    def __init__(self, method: str):
+        self.method = method
+        self.started = time.time()
+        self.wall_ms = 0.0
+        self.statements = 0
+        self.sql_ms = 0.0
+        self.rows_hydrated = 0
+        self.rows_returned = None
+        self.sessions = 0
+        self.session_ms = []  # type: List[float]
+        self.error = None
+        self._statement_started = None
+        self._session_started = {}
+
+    def as_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'started': self.started,
+            'wall_ms': self.wall_ms,
+            'statements': self.statements,
+            'sql_ms': self.sql_ms,
+            'rows_hydrated': self.rows_hydrated,
+            'rows_returned': self.rows_returned,
+            'sessions': self.sessions,
+            'session_ms': self.session_ms,
+            'error': self.error,
+        }
+
+
+# ===== SQLALCHEMY LISTENERS =====
+# Listeners are installed once per engine/sessionmaker and only record while an
+# instrumented call is active, so un-instrumented callers pay a single lookup.
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    call = _current_call.get()
+    if call is not None:
+        call._statement_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    call = _current_call.get()
+    if call is not None:
+        call.statements += 1
+        if call._statement_started is not None:
+            call.sql_ms += (time.perf_counter() - call._statement_started) * 1000
+            call._statement_started = None
+
+
+def _loaded_as_persistent(session, instance):
+    call = _current_call.get()
+    if call is not None:
+        call.rows_hydrated += 1
+
+
+def _after_transaction_create(session, transaction):
+    call = _current_call.get()
+    if call is not None and transaction.parent is None:
+        call.sessions += 1
+        call._session_started[id(transaction)] = time.perf_counter()
+
+
+def _after_transaction_end(session, transaction):
+    call = _current_call.get()
+    if call is not None and transaction.parent is None:
+        started = call._session_started.pop(id(transaction), None)
+        if started is not None:
+            call.session_ms.append((time.perf_counter() - started) * 1000)
+
+
+def install_listeners(db) -> None:
+    """Attach the recording listeners to a DB's engine and session factory"""
+    if db.engine not in _instrumented_engines:
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+        _instrumented_engines.add(db.engine)
+    if db.session_factory not in _instrumented_session_factories:
+        event.listen(db.session_factory, 'loaded_as_persistent', _loaded_as_persistent)
+        event.listen(db.session_factory, 'after_transaction_create', _after_transaction_create)
+        event.listen(db.session_factory, 'after_transaction_end', _after_transaction_end)
+        _instrumented_session_factories.add(db.session_factory)
+
+
+# ===== METRICS =====
+
+class Metrics:
+    """Per-method latency, statement, row and session histograms.
+
+    With trace_path set, every recorded call is also appended to that file
+    as one JSON line.
+    """
+
+    def __init__(self, trace_path: str = None):
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        self._methods = {}  # type: Dict[str, Dict[str, Histogram]]
+        self._errors = {}  # type: Dict[str, int]
+
+    def record(self, call: CallRecord) -> None:
+        with self._lock:
+            histograms = self._methods.get(call.method)
+            if histograms is None:
+                histograms = self._methods[call.method] = {
+                    'wall_ms': Histogram(LATENCY_BOUNDS_MS),
+                    'sql_ms': Histogram(LATENCY_BOUNDS_MS),
+                    'statements': Histogram(COUNT_BOUNDS),
+                    'rows_hydrated': Histogram(COUNT_BOUNDS),
+                    'rows_returned': Histogram(COUNT_BOUNDS),
+                    'session_ms': Histogram(LATENCY_BOUNDS_MS),
+                }
+            histograms['wall_ms'].observe(call.wall_ms)
+            histograms['sql_ms'].observe(call.sql_ms)
+            histograms['statements'].observe(call.statements)
+            histograms['rows_hydrated'].observe(call.rows_hydrated)
+            if call.rows_returned is not None:
+                histograms['rows_returned'].observe(call.rows_returned)
+            for session_ms in call.session_ms:
+                histograms['session_ms'].observe(session_ms)
+            if call.error:
+                self._errors[call.method] = self._errors.get(call.method, 0) + 1
+
+            if self.trace_path:
+                with open(self.trace_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(call.as_dict()) + '\n')
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Summaries of every histogram, keyed by method name"""
+        with self._lock:
+            return {
+                method: dict(
+                    {name: histogram.summary() for name, histogram in histograms.items()},
+                    calls=histograms['wall_ms'].count,
+                    errors=self._errors.get(method, 0),
+                )
+                for method, histograms in self._methods.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._methods.clear()
+            self._errors.clear()
+
+
+def instrumented(method):
+    """Record a BudgetAPI method call when the instance has metrics enabled.
+
+    Calls made from inside another instrumented call are attributed to the
+    outer call only.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if metrics is None or _current_call.get() is not None:
+            return method(self, *args, **kwargs)
+
+        call = CallRecord(method.__name__)
+        token = _current_call.set(call)
+        started = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+            if isinstance(result, (list, tuple)):
+                call.rows_returned = len(result)
+            return result
+        except Exception as e:
+            call.error = type(e).__name__
+            raise
+        finally:
+            call.wall_ms = (time.perf_counter() - started) * 1000
+            _current_call.reset(token)
+            metrics.record(call)
+    return wrapper
@@ -0,0 +1,159 @@
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from db.ledger_events import LedgerEvents
+
+# (start_date, end_date) half-open period a report reads; None bounds are open
+Period = Tuple[Optional[date], Optional[date]]
+
+
+class _Entry:
+    __slots__ = ('value', 'version', 'period', 'closed', 'stored_at', 'size')
+
+    def __init__(self, value, version: int, period: Period, closed: bool, size: int):
+        self.value = value
+        self.version = version
+        self.period = period
+        self.closed = closed
+        self.stored_at = time.monotonic()
+        self.size = size
+
+
+def estimate_size(value, _seen=None) -> int:
+    """Approximate deep size in bytes of a report built from dicts, lists and scalars"""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    return size
+
+
+class ReportCache:
+    """Memoized report results for one ledger, validated against its LedgerEvents.
+
+    Entries are keyed by method name plus arguments and remember the ledger
+    write version and the date period they were computed from. A lookup
+    drops the entry if a write since then touched that period (or any
+    category), so reports over closed months survive writes to other
+    months. Entries whose period reaches the current month also expire
+    after ttl seconds, and cached_report keys them by the current month so
+    they stop matching when it rolls over; all entries are evicted least
+    recently used beyond max_entries. Cached values are shared between
+    callers and must not be mutated.
+    """
+
+    def __init__(self, events: LedgerEvents, max_entries: int = 256, ttl: Optional[float] = 60.0):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.events = events
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, _Entry]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def get_or_compute(self, key: Hashable, period: Period, compute: Callable[[], object]):
+        """Return the cached value for key, computing and storing it when missing or stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.events.changed_since(entry.version, *period):
+                    self._drop(key)
+                    self.invalidations += 1
+                elif not entry.closed and self.ttl is not None and time.monotonic() - entry.stored_at > self.ttl:
+                    self._drop(key)
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+            self.misses += 1
+            # Read the version before computing, so a write that lands
+            # mid-computation leaves the stored entry stale rather than wrong
+            version = self.events.version
+
+        value = compute()
+        entry = _Entry(value, version, period, self._is_closed(period), estimate_size(value))
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def _drop(self, key: Hashable) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    @staticmethod
+    def _is_closed(period: Period) -> bool:
+        """True when the period ends before the current month starts"""
+        end_date = period[1]
+        return end_date is not None and end_date <= date.today().replace(day=1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'invalidations': self.invalidations,
+            'expirations': self.expirations,
+            'evictions': self.evictions,
+        }
+
+
+def cached_report(period: Callable[..., Period]):
+    """Serve a BudgetAPI report method from self.report_cache when it is enabled.
+
+    period(*args, **kwargs) receives the method's arguments and returns the
+    (start_date, end_date) range the report reads. Reports whose period
+    reaches the current month, including windows relative to today, are
+    keyed by the current month too, so they are not served across a month
+    rollover even without a ttl. Calls with unhashable arguments bypass the
+    cache.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.report_cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+            report_period = period(*args, **kwargs)
+            if not cache._is_closed(report_period):
+                key += (date.today().replace(day=1),)
+            return cache.get_or_compute(key, report_period,
+                                        lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
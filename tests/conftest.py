@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root rather than in an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budget_api import BudgetAPI  # noqa: E402
+from db.db import DB  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """A private in-memory ledger, dropped after the test"""
+    db = DB(profile='memory')
+    yield db
+    db.dispose()
+
+
+@pytest.fixture
+def api(db):
+    return BudgetAPI(db=db)
+
+
+def seed_ledger(api: BudgetAPI) -> None:
+    """A small category tree with a few months of income and expenses"""
+    api.create_category('Food', 500)
+    api.create_category('Groceries', 300, 'Food')
+    api.create_category('Dining Out', 150, 'Food')
+    api.create_category('Coffee', 0, 'Dining Out')
+    api.create_category('Transport', 100)
+    api.create_category('Salary')
+    api.add_transactions_bulk([
+        ('expense', 120.0, 'Groceries', 'Corner Market', None, '2025-01-05'),
+        ('expense', 80.5, 'Groceries', 'Corner Market', None, '2025-02-11'),
+        ('expense', 42.0, 'Dining Out', 'Blue Bistro', 'shared', '2025-02-14'),
+        ('expense', 4.5, 'Coffee', 'Sun Coffee', None, '2025-02-15'),
+        ('expense', 3.75, 'Coffee', 'Sun Coffee', None, '2025-03-01'),
+        ('expense', 60.0, 'Transport', 'Metro', None, '2025-03-02'),
+        ('expense', 15.0, 'Food', None, None, '2025-03-09'),
+        ('income', 3200.0, 'Salary', 'Employer', None, '2025-01-31'),
+        ('income', 3200.0, 'Salary', 'Employer', None, '2025-02-28'),
+        ('income', 3200.0, 'Salary', 'Employer', None, '2025-03-31'),
+    ])
+
+
+@pytest.fixture
+def ledger(api):
+    seed_ledger(api)
+    return api
@@ -0,0 +1,79 @@
+import pytest
+
+from budget_api import BudgetAPI
+
+
+@pytest.fixture
+def alerting(ledger):
+    received = []
+    api = BudgetAPI(db=ledger.db, alert_thresholds=(80, 100), on_alert=received.append)
+    api.received = received
+    return api
+
+
+def crossings(alerts):
+    return [(alert.category, alert.threshold, alert.direction) for alert in alerts]
+
+
+def test_crossing_a_threshold_alerts_category_and_ancestors(alerting):
+    # Dining Out has 42.0 of 150 in February; Food has 127.0 of 500
+    alerting.add_transaction('expense', 80.0, 'Coffee', transaction_date='2025-02-20')
+    assert crossings(alerting.get_budget_alerts()) == [('Dining Out', 80, 'over')]
+    assert crossings(alerting.received) == [('Dining Out', 80, 'over')]
+    assert alerting.get_budget_alerts() == []
+
+
+def test_each_threshold_alerts_once(alerting):
+    alerting.add_transaction('expense', 200.0, 'Groceries', transaction_date='2025-01-20')
+    alerting.add_transaction('expense', 5.0, 'Groceries', transaction_date='2025-01-21')
+    assert crossings(alerting.get_budget_alerts()) == [('Groceries', 80, 'over'), ('Groceries', 100, 'over')]
+
+
+def test_deleting_spend_alerts_under(alerting):
+    alerting.add_transaction('expense', 200.0, 'Groceries', transaction_date='2025-01-20')
+    alerting.get_budget_alerts()
+    alerting.delete_transactions_where({'category': 'Groceries', 'month': '2025-01'})
+    assert crossings(alerting.get_budget_alerts()) == [('Groceries', 80, 'under'), ('Groceries', 100, 'under')]
+
+
+def test_status_includes_subcategory_spend(alerting):
+    status = alerting.get_budget_status('2025-02')
+    assert status['Food']['spent'] == pytest.approx(127.0)
+    assert status['Dining Out']['spent'] == pytest.approx(46.5)
+    assert 'Coffee' not in status
+
+
+def test_status_follows_writes_after_load(alerting):
+    alerting.get_budget_status('2025-03')
+    alerting.update_transactions_where({'vendor': 'Metro'}, {'amount': 90.0})
+    assert alerting.get_budget_status('2025-03')['Transport']['spent'] == pytest.approx(90.0)
+
+
+def test_alerts_disabled_by_default(ledger):
+    with pytest.raises(ValueError):
+        ledger.get_budget_alerts()
+
+
+def test_failing_callback_does_not_fail_the_write(ledger, caplog):
+    def explode(alert):
+        raise RuntimeError('alert sink down')
+
+    api = BudgetAPI(db=ledger.db, alert_thresholds=(80,), on_alert=explode)
+    api.add_transaction('expense', 300.0, 'Groceries', vendor='Big Shop', transaction_date='2025-01-20')
+    assert len(ledger.get_transactions(vendor='Big Shop')) == 1
+    assert crossings(api.get_budget_alerts()) == [('Groceries', 80, 'over'), ('Food', 80, 'over')]
+    assert 'alert sink down' in caplog.text
+
+
+@pytest.mark.parametrize('order', [1, -1])
+def test_writes_committed_before_the_month_loads_count_once(alerting, monkeypatch, order):
+    # Both writes commit before either notification reaches the alerts
+    events = alerting.db.ledger_events
+    queued = []
+    monkeypatch.setattr(events, '_notify', lambda *call: queued.append(call))
+    alerting.add_transaction('expense', 10.0, 'Groceries', transaction_date='2025-01-20')
+    alerting.add_transaction('expense', 20.0, 'Groceries', transaction_date='2025-01-21')
+    monkeypatch.undo()
+    for call in queued[::order]:
+        events._notify(*call)
+    assert alerting.get_budget_status('2025-01')['Groceries']['spent'] == pytest.approx(150.0)
@@ -0,0 +1,18 @@
+import asyncio
+
+from async_budget_api import AsyncBudgetAPI
+from db.async_db import AsyncDB
+
+
+def test_snapshot_loaded_during_a_category_write_is_not_cached(tmp_path):
+    async def run():
+        async with AsyncBudgetAPI(AsyncDB(tmp_path / 'ledger.db')) as api:
+            manager = api.category_manager
+            for i in range(20):
+                manager.cache.invalidate()
+                await asyncio.gather(manager.snapshot(), manager.add_category(f'C{i}'))
+                assert (await manager.snapshot()).get_id(f'C{i}') is not None
+            await api.add_transaction('expense', 1.0, 'C19')
+            return len(await api.get_transactions(category='C19'))
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,56 @@
+import pytest
+
+from budget_api import BudgetAPI
+from db.managers.category_cache import CategorySnapshot
+
+
+def test_hierarchy_and_path(ledger):
+    hierarchy = ledger.get_category_hierarchy()
+    assert set(hierarchy) == {'Food', 'Transport', 'Salary'}
+    assert set(ledger.get_category_hierarchy('Dining Out')) == {'Coffee'}
+    assert ledger.get_category_path('Coffee') == ['Food', 'Dining Out', 'Coffee']
+
+
+def test_unknown_category_is_rejected(ledger):
+    with pytest.raises(ValueError):
+        ledger.get_category_path('Nope')
+    with pytest.raises(ValueError):
+        ledger.get_subtree_totals('Nope')
+
+
+def test_transactions_include_subcategories(ledger):
+    assert len(ledger.get_transactions(category='Food')) == 1
+    assert len(ledger.get_transactions(category='Food', include_subcategories=True)) == 6
+    assert len(ledger.get_transactions(category='Dining Out', month='2025-02', include_subcategories=True)) == 2
+
+
+def test_subtree_totals(ledger):
+    totals = ledger.get_subtree_totals('Food', '2025-02')
+    assert totals['categories'] == 4
+    assert totals['expense'] == pytest.approx(127.0)
+    assert totals['transaction_count'] == 3
+    assert ledger.get_subtree_totals('Food')['expense'] == pytest.approx(265.75)
+
+
+def test_subtree_follows_new_subcategories(ledger):
+    ledger.create_category('Snacks', 0, 'Dining Out')
+    ledger.add_transaction('expense', 6.0, 'Snacks', transaction_date='2025-03-03')
+    assert ledger.get_category_path('Snacks') == ['Food', 'Dining Out', 'Snacks']
+    assert ledger.get_subtree_totals('Dining Out', '2025-03')['expense'] == pytest.approx(9.75)
+
+
+def test_cached_subtree_totals_follow_writes(ledger):
+    cached = BudgetAPI(db=ledger.db, cache_reports=True)
+    first = cached.get_subtree_totals('Food', '2025-03')
+    assert cached.get_subtree_totals('Food', month='2025-03') == first
+    assert cached.get_subtree_totals(category='Food', month='2025-03') == first
+    ledger.add_transaction('expense', 5.0, 'Coffee', transaction_date='2025-03-04')
+    assert cached.get_subtree_totals('Food', '2025-03')['expense'] == pytest.approx(first['expense'] + 5.0)
+
+
+def test_hierarchy_keeps_orphans_and_cycles_at_top_level():
+    snapshot = CategorySnapshot([(1, 'A', 0, None), (2, 'B', 0, 99), (3, 'C', 0, 4), (4, 'D', 0, 3)])
+    hierarchy = snapshot.hierarchy()
+    assert set(hierarchy) == {'A', 'B', 'C'}
+    assert set(hierarchy['C']['subcategories']) == {'D'}
+    assert sorted(snapshot.paths().values()) == ['A', 'B', 'C', 'C > D']
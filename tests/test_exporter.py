@@ -0,0 +1,35 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+import exporter
+
+
+def test_csv_export_carries_category_path(ledger, tmp_path):
+    path = tmp_path / 'out.csv'
+    stats = ledger.export_transactions(str(path), category='Dining Out', include_subcategories=True)
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert stats['rows'] == len(rows) == 3
+    assert [row['category_path'] for row in rows] == ['Food > Dining Out', 'Food > Dining Out > Coffee',
+                                                      'Food > Dining Out > Coffee']
+
+
+def test_formats_agree(ledger, tmp_path):
+    ledger.export_transactions(str(tmp_path / 'out.jsonl.gz'), batch_size=3)
+    with gzip.open(tmp_path / 'out.jsonl.gz', 'rt') as f:
+        from_jsonl = [json.loads(line) for line in f]
+
+    ledger.export_transactions(str(tmp_path / 'out.bcol'), batch_size=3)
+    from_columnar = [dict(zip(exporter.EXPORT_COLUMNS, values))
+                     for batch in exporter.read_columnar(tmp_path / 'out.bcol')
+                     for values in zip(*(batch[column] for column in exporter.EXPORT_COLUMNS))]
+    assert from_jsonl == from_columnar
+    assert len(from_jsonl) == 10
+
+
+def test_unknown_format_is_rejected(ledger, tmp_path):
+    with pytest.raises(ValueError):
+        ledger.export_transactions(str(tmp_path / 'out.xlsx'))
@@ -0,0 +1,96 @@
+import pytest
+
+import importer
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_csv_rows_use_column_mapping(tmp_path):
+    path = write(tmp_path, 'bank.csv', 'Posted,Value,Payee\n2025-03-01,-12.50,Shop\n')
+    rows = list(importer.read_csv_rows(path, {'date': 'Posted', 'amount': 'Value', 'vendor': 'Payee'}))
+    assert rows == [{'date': '2025-03-01', 'amount': '-12.50', 'vendor': 'Shop'}]
+
+
+def test_csv_without_amount_column_is_rejected(tmp_path):
+    path = write(tmp_path, 'bank.csv', 'date,vendor\n2025-03-01,Shop\n')
+    with pytest.raises(ValueError):
+        list(importer.read_csv_rows(path))
+
+
+def test_qif_records(tmp_path):
+    path = write(tmp_path, 'bank.qif', '!Type:Bank\nD03/01/2025\nT-12.50\nPShop\nLFood\n^\nD03/02/2025\nT100\n^\n')
+    assert list(importer.read_qif_rows(path)) == [
+        {'date': '03/01/2025', 'amount': '-12.50', 'vendor': 'Shop', 'category': 'Food'},
+        {'date': '03/02/2025', 'amount': '100'},
+    ]
+
+
+def test_ofx_records_across_lines(tmp_path):
+    path = write(tmp_path, 'bank.ofx', (
+        '<OFX><BANKTRANLIST>\n'
+        '<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20250301120000\n<TRNAMT>-12.50\n<NAME>Shop\n</STMTTRN>\n'
+        '<STMTTRN>\n<DTPOSTED>20250302\n<TRNAMT>100.00\n<MEMO>Refund\n</STMTTRN>\n'
+        '</BANKTRANLIST></OFX>\n'
+    ))
+    assert list(importer.read_ofx_rows(path)) == [
+        {'date': '20250301', 'amount': '-12.50', 'vendor': 'Shop'},
+        {'date': '20250302', 'amount': '100.00', 'note': 'Refund'},
+    ]
+
+
+def test_ofx_records_on_one_line(tmp_path):
+    path = write(tmp_path, 'bank.ofx', (
+        '<OFX><BANKTRANLIST>'
+        '<STMTTRN><DTPOSTED>20250301</DTPOSTED><TRNAMT>-12.50</TRNAMT><NAME>Shop</NAME></STMTTRN>'
+        '<STMTTRN><DTPOSTED>20250302</DTPOSTED><TRNAMT>-3.00</TRNAMT><NAME>Cafe</NAME></STMTTRN>'
+        '<STMTTRN><DTPOSTED>20250303</DTPOSTED><TRNAMT>100.00</TRNAMT></STMTTRN>'
+        '</BANKTRANLIST></OFX>\n'
+    ))
+    assert list(importer.read_ofx_rows(path)) == [
+        {'date': '20250301', 'amount': '-12.50', 'vendor': 'Shop'},
+        {'date': '20250302', 'amount': '-3.00', 'vendor': 'Cafe'},
+        {'date': '20250303', 'amount': '100.00'},
+    ]
+
+
+def test_parse_chunk_infers_type_and_reports_bad_rows():
+    parsed, errors = importer.parse_chunk([
+        {'date': '2025-03-01', 'amount': '(12.00)'},
+        {'date': '03/01/2025', 'amount': '5'},
+        {'date': '2025-03-02', 'amount': '$1,200.50', 'category': 'Salary'},
+    ], default_category='Misc')
+    assert [(row['type'].value, row['amount'], row['category']) for row in parsed] == [
+        ('expense', 12.0, 'Misc'), ('income', 1200.5, 'Salary'),
+    ]
+    assert [index for index, _ in errors] == [1]
+
+
+def test_import_file_reports_rejected_rows(api, tmp_path):
+    api.create_category('Food')
+    path = write(tmp_path, 'bank.csv', (
+        'date,amount,category,vendor\n'
+        '2025-03-01,-10,Food,Shop\n'
+        'not a date,-5,Food,Shop\n'
+        '2025-03-03,-7,Unknown,Shop\n'
+        '2025-03-04,-3,Food,Shop\n'
+    ))
+    progress = []
+    stats = api.import_transactions(str(path), chunk_size=2, on_progress=progress.append)
+    assert (stats['rows'], stats['inserted'], stats['rejected']) == (4, 2, 2)
+    assert [index for index, _ in stats['errors']] == [1, 2]
+    assert [len(update['errors']) for update in progress] == [1, 1]
+    assert len(api.get_transactions(category='Food')) == 2
+
+
+def test_stored_errors_are_capped(api, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, 'MAX_STORED_ERRORS', 3)
+    path = write(tmp_path, 'bank.csv', 'date,amount\n' + 'bad,1\n' * 5)
+    progress = []
+    stats = api.import_transactions(str(path), chunk_size=2, on_progress=progress.append)
+    assert [index for index, _ in stats['errors']] == [0, 1, 2]
+    assert (stats['rejected'], stats['errors_dropped']) == (5, 2)
+    assert [[index for index, _ in update['errors']] for update in progress] == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+
+import budget_api
+import report_cache
+from budget_api import BudgetAPI
+
+REPORTS = [
+    ('get_budget_summary', ()),
+    ('get_budget_summary', ('2025-02',)),
+    ('get_spending_trends', (24,)),
+    ('get_spending_trends', (24, True)),
+]
+
+
+@pytest.mark.parametrize('method, args', REPORTS)
+def test_numpy_engine_matches_sql(ledger, method, args):
+    numpy_api = BudgetAPI(db=ledger.db, report_engine='numpy')
+    assert getattr(numpy_api, method)(*args) == getattr(ledger, method)(*args)
+
+
+def test_unknown_report_engine_is_rejected(db):
+    with pytest.raises(ValueError):
+        BudgetAPI(db=db, report_engine='spark')
+
+
+@pytest.fixture
+def cached(ledger):
+    return BudgetAPI(db=ledger.db, cache_reports=True)
+
+
+def test_cached_report_is_reused(cached):
+    first = cached.get_budget_summary('2025-02')
+    assert cached.get_budget_summary('2025-02') is first
+    assert cached.get_report_cache_stats()['hits'] == 1
+
+
+def test_write_invalidates_only_its_month(cached):
+    february = cached.get_budget_summary('2025-02')
+    march = cached.get_budget_summary('2025-03')
+    cached.add_transaction('expense', 10.0, 'Groceries', transaction_date='2025-03-20')
+    assert cached.get_budget_summary('2025-02') is february
+    assert cached.get_budget_summary('2025-03')['total_expenses'] == march['total_expenses'] + 10.0
+    assert cached.get_report_cache_stats()['invalidations'] == 1
+
+
+def test_category_change_invalidates_everything(cached):
+    february = cached.get_budget_summary('2025-02')
+    cached.create_category('Health', 50)
+    assert cached.get_budget_summary('2025-02') is not february
+
+
+def test_writes_through_another_api_invalidate(cached, ledger):
+    total = cached.get_budget_summary()['total_expenses']
+    ledger.delete_transactions_where({'vendor': 'Metro'})
+    assert cached.get_budget_summary()['total_expenses'] == total - 60.0
+
+
+def freeze_today(monkeypatch, day):
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return day
+
+    for module in (budget_api, report_cache):
+        monkeypatch.setattr(module, 'date', FrozenDate)
+
+
+def test_relative_reports_roll_over_with_the_month(ledger, monkeypatch):
+    cached = BudgetAPI(db=ledger.db, cache_reports=True, cache_ttl=None)
+    freeze_today(monkeypatch, date(2025, 3, 15))
+    assert list(cached.get_spending_trends(2)) == ['2025-03', '2025-02']
+    assert cached.get_quick_stats()['recent_transaction_count'] == 4
+
+    freeze_today(monkeypatch, date(2025, 4, 1))
+    assert list(cached.get_spending_trends(2)) == ['2025-04', '2025-03']
+    assert cached.get_quick_stats()['recent_transaction_count'] == 0
+    assert cached.get_report_cache_stats()['hits'] == 0
+
+
+def test_trends_as_of_a_past_month(ledger):
+    trends = ledger.get_spending_trends(3, as_of='2025-03')
+    assert list(trends) == ['2025-03', '2025-02', '2025-01']
+    assert trends['2025-02']['expenses'] == pytest.approx(127.0)
+    cached = BudgetAPI(db=ledger.db, cache_reports=True)
+    assert cached.get_spending_trends(3, as_of='2025-03') == trends
@@ -0,0 +1,50 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from db.models.monthly_category_total import MonthlyCategoryTotal
+
+
+def rollup_rows(api):
+    """Non-empty rollup buckets; deletes leave count-0 buckets behind"""
+    session = api.db.Session()
+    try:
+        rows = session.execute(
+            select(MonthlyCategoryTotal.year, MonthlyCategoryTotal.month, MonthlyCategoryTotal.category_id,
+                   MonthlyCategoryTotal.type, MonthlyCategoryTotal.total, MonthlyCategoryTotal.count)
+            .where(MonthlyCategoryTotal.count != 0)
+        ).all()
+    finally:
+        session.close()
+    return sorted((year, month, category_id, kind.name, round(total, 6), count)
+                  for year, month, category_id, kind, total, count in rows)
+
+
+def assert_matches_rebuild(api):
+    maintained = rollup_rows(api)
+    api.rebuild_rollups()
+    assert maintained == rollup_rows(api)
+
+
+def test_single_writes_keep_rollups_consistent(ledger):
+    first = ledger.get_transactions(category='Groceries', month='2025-01')[0]
+    ledger.update_transaction(first.id, amount=99.0, date=date(2025, 2, 1))
+    ledger.delete_transaction(ledger.get_transactions(category='Transport')[0].id)
+    ledger.add_transaction('expense', 7.0, 'Coffee', transaction_date='2025-04-02')
+    assert_matches_rebuild(ledger)
+
+
+def test_update_where_keeps_rollups_consistent(ledger):
+    assert ledger.update_transactions_where({'vendor': 'Sun Coffee'}, {'category': 'Groceries'}) == 2
+    assert ledger.update_transactions_where({'month': '2025-02', 'transaction_type': 'expense'},
+                                            {'date': '2025-04-15'}) == 3
+    assert ledger.update_transactions_where({'category': 'Salary'}, {'amount': 3300.0}) == 3
+    assert_matches_rebuild(ledger)
+
+
+def test_delete_where_keeps_rollups_consistent(ledger):
+    assert ledger.delete_transactions_where({'category': 'Groceries'}, dry_run=True) == 2
+    assert ledger.delete_transactions_where({'category': 'Groceries'}) == 2
+    assert ledger.delete_transactions_where({'start_date': '2025-03-01', 'end_date': '2025-03-05'}) == 2
+    assert len(ledger.get_transactions()) == 6
+    assert_matches_rebuild(ledger)
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import update
+
+from db.models.enums import TransactionType
+from db.models.rows import TransactionColumns
+from db.models.transaction import Transaction
+
+
+def test_row_modes_agree(ledger):
+    rows = ledger.get_transactions(row_mode='row')
+    columns = ledger.get_transactions(row_mode='columns')
+    assert [columns.row(i) for i in range(len(columns))] == rows
+    assert [t.id for t in ledger.get_transactions()] == [row.id for row in rows]
+
+
+def paged_ids(api, page_size):
+    """Ids from following next_cursor through every page"""
+    seen, cursor = [], None
+    while True:
+        page = api.get_transactions_page(page_size=page_size, cursor=cursor, row_mode='row')
+        seen += [row.id for row in page['transactions']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            return seen
+
+
+def test_pages_cover_every_transaction_once(ledger):
+    assert paged_ids(ledger, 3) == [row.id for row in ledger.get_transactions(row_mode='row')]
+
+
+def test_invalid_cursor_is_rejected(ledger):
+    with pytest.raises(ValueError):
+        ledger.get_transactions_page(cursor='not-a-cursor')
+
+
+def test_undated_rows_are_left_out_of_keyset_reads(ledger):
+    session = ledger.db.Session()
+    session.execute(update(Transaction).where(Transaction.vendor == 'Metro').values(date=None))
+    session.commit()
+    session.close()
+
+    dated = [row.id for row in ledger.get_transactions(row_mode='row')]
+    assert len(dated) == 9
+    assert [row.id for batch in ledger.iter_transactions(batch_size=4, row_mode='columns')
+            for row in map(batch.row, range(len(batch)))] == dated
+    assert paged_ids(ledger, 1) == dated
+
+
+def test_columns_store_a_missing_date_as_zero():
+    columns = TransactionColumns.from_rows([(1, TransactionType.EXPENSE, 5.0, None, None, None, None)])
+    assert list(columns.date) == [0]
+    assert columns.row(0).date is None